@@ -0,0 +1,283 @@
+"""
+Measures the latency from a key press to the redrawn prompt as felt in a
+terminal: every built-in prompt runs in its own process on a
+pseudo-terminal, keys are written to the terminal and the time until its
+output settles is recorded for each key.
+
+Keys are written at three rates:
+
+typing
+    One key at a time, waiting for the output to settle.
+
+held
+    Keys repeated every 33 ms as when a key is held down.
+
+paste
+    Bursts of keys written at once. The latency of a burst is reported.
+
+Usage::
+
+    python benchmarks/latency.py
+    python benchmarks/latency.py --prompts choice table --keys 200
+    python benchmarks/latency.py --json after.json --baseline before.json
+
+With ``--baseline``, the exit status is 1 if the p50 latency of any
+prompt and rate grew by more than ``--tolerance``.
+"""
+
+from __future__ import annotations
+
+import argparse
+from dataclasses import asdict, dataclass
+import fcntl
+import json
+import os
+from pathlib import Path
+import selectors
+import statistics
+import struct
+import subprocess
+import sys
+import tempfile
+import termios
+import time
+from typing import Optional
+
+from readchar import key as k
+
+SRC = Path(__file__).resolve().parent.parent / "src"
+
+CHILD = """
+import sys
+from aprompt import prompt
+from aprompt.prompts import *
+
+options = [f"option {i}" for i in range(20)]
+engines = {
+    "confirm": lambda: confirm(),
+    "text": lambda: text(),
+    "number": lambda: number(),
+    "choice": lambda: choice(*options, multiple=True),
+    "sort": lambda: sort(*options),
+    "rank": lambda: rank(*options),
+    "pin": lambda: pin(8),
+    "path": lambda: path(sys.argv[2]),
+    "tree": lambda: tree(
+        "root",
+        children=lambda n: [f"{n}/{i}" for i in range(5)] if n.count("/") < 3 else [],
+    ),
+    "table": lambda: table(
+        {"id": range(100_000), "name": [f"row {i}" for i in range(100_000)]}
+    ),
+}
+prompt("Question?", engines[sys.argv[1]]())
+"""
+
+KEYS = {
+    "confirm": ["x"],  # rejected, rings the bell
+    "text": ["a"],
+    "number": [k.UP],
+    "choice": [k.DOWN, k.SPACE],
+    "sort": [k.DOWN],
+    "rank": [k.DOWN],
+    "pin": ["1", k.BACKSPACE],
+    "path": [k.DOWN],
+    "tree": [k.RIGHT, k.DOWN],
+    "table": [k.DOWN],
+}
+"""Keys pressed in turn that do not finish the prompt."""
+
+QUIET = 0.02
+"""Seconds without output after which the output counts as settled."""
+
+HELD = 1 / 30
+"""Seconds between repeated keys of a held key."""
+
+PASTE = 15
+"""
+Keys in a pasted burst. It is odd so bursts of keys toggling or wrapping
+around do not end where they began, which would draw nothing.
+"""
+
+
+@dataclass
+class Stats:
+    p50: float
+    p99: float
+    bytes_per_key: float
+    samples: int
+
+
+class Terminal:
+    """A prompt running on a pseudo-terminal."""
+
+    def __init__(self, name: str, directory: str, columns: int = 80, rows: int = 24):
+        self.master, slave = os.openpty()
+        fcntl.ioctl(slave, termios.TIOCSWINSZ, struct.pack("HHHH", rows, columns, 0, 0))
+        env = {**os.environ, "PYTHONPATH": str(SRC)}
+        self.process = subprocess.Popen(
+            [sys.executable, "-c", CHILD, name, directory],
+            stdin=slave,
+            stdout=slave,
+            stderr=slave,
+            env=env,
+            start_new_session=True,
+        )
+        os.close(slave)
+        self.selector = selectors.DefaultSelector()
+        self.selector.register(self.master, selectors.EVENT_READ)
+
+    def start(self, timeout: float = 10.0) -> None:
+        """Waits until the first frame is displayed."""
+        output = b""
+        deadline = time.perf_counter() + timeout
+        while b"Question?" not in output:
+            if time.perf_counter() > deadline:
+                raise TimeoutError(output.decode(errors="replace"))
+            if self.selector.select(0.1):
+                output += os.read(self.master, 65536)
+        self.settle()
+
+    def settle(self, timeout: float = 0.25) -> tuple[Optional[float], int]:
+        """
+        Reads output until it settles or until ``timeout`` passes without
+        any. Returns the time of the last output and the amount of bytes
+        read.
+        """
+        last: Optional[float] = None
+        size = 0
+        deadline = time.perf_counter() + timeout
+        while time.perf_counter() < deadline:
+            if not self.selector.select(QUIET):
+                if last is not None or size:
+                    break
+                continue
+            try:
+                data = os.read(self.master, 65536)
+            except OSError:
+                break
+            last = time.perf_counter()
+            size += len(data)
+        return last, size
+
+    def write(self, data: str) -> float:
+        """Writes keys and returns the time they were written at."""
+        # taken before writing as the prompt may run before write returns
+        sent = time.perf_counter()
+        os.write(self.master, data.encode())
+        return sent
+
+    def close(self) -> None:
+        self.process.kill()
+        self.process.wait()
+        self.selector.close()
+        os.close(self.master)
+
+
+def _stats(latencies: list[float], sizes: list[int], keys: int) -> Stats:
+    ordered = sorted(latencies) or [0.0]
+    return Stats(
+        p50=statistics.median(ordered) * 1000,
+        p99=ordered[min(len(ordered) - 1, round(len(ordered) * 0.99))] * 1000,
+        bytes_per_key=sum(sizes) / max(keys, 1),
+        samples=len(latencies),
+    )
+
+
+def measure(name: str, count: int, directory: str) -> dict[str, Stats]:
+    """Measures a prompt at all rates with ``count`` keys each."""
+    keys = KEYS[name]
+    results = {}
+    term = Terminal(name, directory)
+    try:
+        term.start()
+
+        latencies: list[float] = []
+        sizes: list[int] = []
+        for i in range(count):
+            sent = term.write(keys[i % len(keys)])
+            last, size = term.settle()
+            if last is not None:
+                latencies.append(last - sent)
+            sizes.append(size)
+        results["typing"] = _stats(latencies, sizes, count)
+
+        latencies, sizes = [], []
+        next_at = time.perf_counter()
+        for i in range(count):
+            sent = term.write(keys[i % len(keys)])
+            next_at += HELD
+            last = None
+            size = 0
+            # read until the next key is due
+            while (wait := next_at - time.perf_counter()) > 0:
+                if not term.selector.select(wait):
+                    break
+                size += len(os.read(term.master, 65536))
+                last = time.perf_counter()
+            if last is not None:
+                latencies.append(last - sent)
+            sizes.append(size)
+        term.settle()
+        results["held"] = _stats(latencies, sizes, count)
+
+        latencies, sizes = [], []
+        for i in range(0, count, PASTE):
+            burst = "".join(keys[j % len(keys)] for j in range(i, i + PASTE))
+            sent = term.write(burst)
+            last, size = term.settle()
+            if last is not None:
+                latencies.append(last - sent)
+            sizes.append(size)
+        results["paste"] = _stats(latencies, sizes, count)
+    finally:
+        term.close()
+    return results
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--prompts", nargs="+", choices=list(KEYS), default=list(KEYS))
+    parser.add_argument("--keys", type=int, default=100, help="keys per rate")
+    parser.add_argument("--json", help="write the results to this file")
+    parser.add_argument("--baseline", help="compare with results written by --json")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    results: dict[str, dict[str, Stats]] = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for i in range(200):
+            Path(directory, f"file {i:03}").touch()
+        print(f"{'prompt':<10}{'rate':<8}{'p50 ms':>9}{'p99 ms':>9}{'bytes/key':>11}")
+        for name in args.prompts:
+            results[name] = measure(name, args.keys, directory)
+            for rate, s in results[name].items():
+                if s.samples:
+                    times = f"{s.p50:>9.2f}{s.p99:>9.2f}"
+                else:
+                    times = f"{'-':>9}{'-':>9}"  # no key drew anything
+                print(f"{name:<10}{rate:<8}{times}{s.bytes_per_key:>11.1f}")
+
+    data = {n: {r: asdict(s) for r, s in rates.items()} for n, rates in results.items()}
+    if args.json:
+        Path(args.json).write_text(json.dumps(data, indent=2))
+
+    status = 0
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text())
+        for name, rates in data.items():
+            for rate, after in rates.items():
+                before = baseline.get(name, {}).get(rate)
+                if not before or not before["samples"]:
+                    continue
+                if after["p50"] > before["p50"] * (1 + args.tolerance):
+                    print(
+                        f"regression: {name} {rate} p50 "
+                        f"{before['p50']:.2f} ms -> {after['p50']:.2f} ms"
+                    )
+                    status = 1
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,20 +1,30 @@
 from __future__ import annotations
 
-from collections.abc import Callable, Generator, Iterator
+from collections.abc import Callable, Generator, Iterator, Mapping
+from contextlib import ExitStack
 from functools import partial
+import math
 import os
 import signal
 import sys
-from typing import Any, Optional, TextIO, TypeVar
+import time
+from typing import Any, Literal, Optional, TextIO, TYPE_CHECKING, TypeVar
 
 import readchar
-from readchar import key as k, readkey
+from readchar import key as k
 
 from aprompt import exceptions
 from aprompt import formatters
+from aprompt import keys
 from aprompt import widgets as w
+from aprompt.events import Callback, Tracker
 from aprompt.result import Result
-from aprompt._utils import clear_lines
+from aprompt._session import Session
+from aprompt.log import OUTLET, StdoutProxy
+from aprompt._terminal import KeyReader, Screen
+
+if TYPE_CHECKING:
+    from aprompt.history import History
 
 T = TypeVar("T")
 
@@ -23,6 +33,17 @@ PromptEngine = Generator[list[Optional[w.Widget]] | Result[T], Key, None]
 
 readchar.config.INTERRUPT_KEYS = []  # manually handle `CTRL` + `C`
 
+def animated(widgets: list[Optional[w.Widget]]) -> bool:
+    """
+    Whether ``widgets`` change without a key being pressed, causing
+    :func:`prompt` to redraw periodically: spinners and progress bars whose
+    progress is a callable.
+    """
+    return any(
+        isinstance(x, w.Spinner) or isinstance(x, w.Progress) and callable(x.content)
+        for x in widgets
+    )
+
 
 def prompt(
     ask: str,
@@ -31,8 +52,17 @@ def prompt(
     validate: None | Callable[[T], bool] | Callable[[T], BaseException | None] = None,
     formatter: Optional[formatters.Formatter] = None,
     file: Optional[TextIO] = None,
+    stdin: Optional[TextIO] = None,
     cancelable: bool = False,
     test_with: Optional[Iterator[str]] = None,
+    fps: float = 10,
+    timeout: Optional[float] = None,
+    idle_timeout: Optional[float] = None,
+    output: Literal["auto", "live", "plain"] = "auto",
+    history: Optional[History] = None,
+    name: Optional[str] = None,
+    answers: Optional[Mapping[str, Any]] = None,
+    on_event: Optional[Callback] = None,
 ) -> T:
     """
     Displays and formats the prompt, reads keys and handles validation.
@@ -75,6 +105,12 @@ def prompt(
     file
         The file to write to. Defaults to standard output.
 
+    stdin
+        The file to read keys from. Defaults to standard input. Output
+        collected by :mod:`aprompt.log` is only printed above prompts
+        reading from the standard input, which is the terminal of this
+        process.
+
     cancelable
         If this is set to ``True``,
         :class:`aprompt.exceptions.PromptExit` is raised when
@@ -106,6 +142,63 @@ def prompt(
             The :doc:`Test API <../testing>` section describes how to
             use this parameter for tests in detail.
 
+    fps
+        The maximum amount of frames per second drawn while animated
+        widgets such as :class:`aprompt.widgets.Spinner` or a
+        :class:`aprompt.widgets.Progress` with a callable progress are
+        displayed. Otherwise the prompt is only redrawn after a key has
+        been pressed.
+
+        This is also the maximum rate at which output collected by
+        :mod:`aprompt.log` is printed above the prompt.
+
+    timeout
+        The amount of seconds the user has to answer the prompt. A
+        countdown is displayed. When the time is up,
+        :data:`aprompt.keys.TIMEOUT` is sent to the prompt engine: prompts
+        with a default such as :func:`aprompt.prompts.confirm` return it,
+        others raise :class:`aprompt.exceptions.PromptTimeoutError`.
+
+        .. tip::
+
+            Add :data:`aprompt.keys.TIMEOUT` to ``test_with`` to test the
+            behaviour when the time is up.
+
+    idle_timeout
+        The same as ``timeout`` but the time starts again whenever a key
+        is pressed.
+
+    output
+        ``"live"``
+            Every frame is drawn over the previous one.
+
+        ``"plain"``
+            Only the question and the answer are written once the prompt
+            has finished, without any escape sequences. This is useful
+            when the output is collected in logs.
+
+        ``"auto"``
+            ``"live"`` if ``file`` is a terminal, ``"plain"`` otherwise.
+
+    history
+        Records the answer in a :class:`aprompt.history.History`. Prompts
+        such as :func:`aprompt.prompts.text` take the same history to
+        recall previous answers.
+
+    name
+        The name of the prompt in ``answers``.
+
+    answers
+        Answers by the names of prompts (see :mod:`aprompt.answers`).
+        If this is given or answers are provided with
+        :func:`aprompt.answers.provide`, the prompt is answered from them
+        without displaying anything.
+
+    on_event
+        Called with an :class:`aprompt.events.Event` whenever an option is
+        hovered, selected or deselected or the entered text changes while
+        the prompt is running.
+
     Raises
     ------
     ``SystemExit``
@@ -121,80 +214,196 @@ def prompt(
     :class:`aprompt.exceptions.PromptFinishedTooEarlyError`
         Not all keys from ``test_with`` were consumed from.
 
+    :class:`aprompt.exceptions.PromptTimeoutError`
+        The time is up and the prompt engine has no default or the
+        default did not pass the validation.
+
+    :class:`aprompt.exceptions.MissingAnswerError`
+        There is no answer for the prompt and it has no default.
+
+    :class:`aprompt.exceptions.InvalidAnswerError`
+        The answer is not possible or did not pass the validation.
+
     Returns
     -------
     The (unwrapped) result of ``prompt_fn``.
     """
-    validate = validate or (lambda _: True)
+    if answers is None:
+        # imported here to keep importing aprompt fast
+        from aprompt import answers as _answers
+
+        answers = _answers.current()
+    if answers is not None:
+        value = _answer(ask, prompt_fn, name, answers, validate)
+        if history is not None:
+            history.append(value)
+        return value
+
     file = file or sys.stdout
+    if isinstance(file, StdoutProxy):
+        file = file.file
 
-    fmt = partial(
-        formatter or formatters.simple,
+    tsize = (
         os.get_terminal_size(file.fileno())
         if file.isatty() and test_with is None
         else os.terminal_size(
             (80, 24)
-        ),  # prevent unnecessary possible `OSError`s when testing
+        )  # prevent unnecessary possible `OSError`s when testing
     )
+    if not tsize.columns:  # pseudo-terminals may not have a size yet
+        tsize = os.terminal_size((80, 24))
+    fmt = partial(formatter or formatters.simple, tsize)
+
+    if output == "auto":
+        output = "live" if file.isatty() else "plain"
+
+    session = Session(ask, prompt_fn, validate=validate)
+    tracker = Tracker(on_event) if on_event is not None else None
+    if tracker is not None:
+        tracker.update(session.widgets)
+    screen = Screen(
+        file, columns=tsize.columns, enabled=test_with is None, live=output == "live"
+    )
+    reader = KeyReader(stdin)
 
-    def write(*args: Any, **kwargs: Any) -> None:
-        if test_with is None:
-            print(*args, **kwargs, file=file, end="")
-
-    res = next(prompt_fn)
-    assert not isinstance(res, Result)  # prompts must not initially yield a Result
-    widgets: list[Optional[w.Widget]] = [w.Question(ask), *res]
-
-    clear = 0
-    while True:
-        write(clear_lines(clear))
-        display = "\n".join(fmt(widgets))
-        write(display)
-        clear = display.count("\n")
-
+    with ExitStack() as stack:
         if test_with is None:
-            key = readkey()
-        else:
-            try:
-                key = next(test_with)
-            except StopIteration as exc:
-                prompt_fn.close()
-                raise exceptions.PromptNeverFinishedError(
-                    f"prompt has never finished / ran out of keys"
-                ) from exc
-
-        if key == k.CTRL_C:
-            prompt_fn.close()
-            sys.exit(signal.Signals.SIGINT)
-        elif key == k.CTRL_D and cancelable:
-            prompt_fn.close()
-            raise exceptions.PromptExit
-
-        res = prompt_fn.send(key)
-        if isinstance(res, Result):
-            result = res.value
-            match validate(result):
-                case True | None:
-                    write(clear_lines(clear))
-                    write("\n".join(fmt([w.Question(ask), w.Answer(res.display)])))
-                    write("\n")
-                    prompt_fn.close()
-                    if test_with is not None:
-                        left = list(test_with)
-                        if left:
-                            raise exceptions.PromptFinishedTooEarlyError(
-                                f"prompt has never finished; left keys: {left}",
-                                left_keys=left,
-                            )
-                    return result
-                # TODO: `case isinstance(e, BaseException)` might work as well
-                case e:
-                    if isinstance(e, BaseException):
-                        widgets.append(w.Error(e))
+            stack.enter_context(reader)
+            if screen.live and stdin is None:
+                stack.enter_context(OUTLET.attach(reader.wake, file))
+
+        widgets = session.widgets
+        frame_at = above_at = 0.0
+        started_at = pressed_at = time.monotonic()
+        while True:
+            now = time.monotonic()
+
+            expires_at = math.inf
+            if timeout is not None:
+                expires_at = started_at + timeout
+            if idle_timeout is not None:
+                expires_at = min(expires_at, pressed_at + idle_timeout)
+            remaining = expires_at - now
+
+            if screen.live and not reader.pending and remaining > 0:
+                above = ""
+                if now - above_at >= 1 / fps and OUTLET.pending:
+                    # print collected output in batches
+                    above = OUTLET.take()
+                    above_at = now
+                frame_at = now
+                frame = widgets
+                if remaining < math.inf:
+                    frame = [*widgets, w.Countdown(math.ceil(remaining))]
+                screen.draw("\n".join(fmt(frame)), above=above)
+                # redraws must not ring the bell again
+                widgets = [x for x in widgets if not isinstance(x, w.Alert)]
+
+            if test_with is None:
+                # wake up for the next frame, batch of output or timeout
+                wake_at = [expires_at]
+                if screen.live and remaining < math.inf:
+                    # the countdown changes
+                    wake_at.append(now + (remaining % 1 or 1))
+                if screen.live and animated(widgets):
+                    wake_at.append(frame_at + 1 / fps)
+                if OUTLET.pending:
+                    wake_at.append(max(above_at + 1 / fps, now))
+                wake = min(wake_at)
+
+                if remaining <= 0:
+                    key = keys.TIMEOUT
+                else:
+                    pressed = reader.read(
+                        None if wake == math.inf else max(wake - now, 0)
+                    )
+                    if pressed is not None:
+                        key = pressed
+                        pressed_at = time.monotonic()
+                    elif any(isinstance(x, w.Spinner) for x in widgets):
+                        # let the engine check on its background work
+                        key = keys.REFRESH
                     else:
-                        widgets.append(w.Alert())
-                    next(
-                        prompt_fn
-                    )  # resume prompt because `yield Result` must not receive a key
-        else:
-            widgets = [w.Question(ask), *res]
+                        continue
+            else:
+                try:
+                    key = next(test_with)
+                except StopIteration as exc:
+                    session.close()
+                    raise exceptions.PromptNeverFinishedError(
+                        f"prompt has never finished / ran out of keys"
+                    ) from exc
+
+            if key == k.CTRL_C:
+                session.close()
+                sys.exit(signal.Signals.SIGINT)
+            elif key == k.CTRL_D and cancelable:
+                session.close()
+                raise exceptions.PromptExit
+
+            if session.send(key):
+                screen.finish("\n".join(fmt(session.widgets)))
+                if test_with is not None:
+                    left = list(test_with)
+                    if left:
+                        raise exceptions.PromptFinishedTooEarlyError(
+                            f"prompt has never finished; left keys: {left}",
+                            left_keys=left,
+                        )
+                assert session.result is not None
+                if history is not None:
+                    history.append(session.result.value)
+                return session.result.value
+            if key == keys.TIMEOUT:
+                session.close()
+                raise exceptions.PromptTimeoutError(
+                    "prompt has not been answered in time"
+                )
+            widgets = session.widgets
+            if tracker is not None:
+                tracker.update(widgets)
+
+
+def _answer(
+    ask: str,
+    prompt_fn: PromptEngine[T],
+    name: Optional[str],
+    answers: Mapping[str, Any],
+    validate: None | Callable[[T], bool] | Callable[[T], BaseException | None],
+) -> T:
+    # answers a prompt without reading keys or displaying anything
+    from aprompt.machines import Engine
+
+    if isinstance(prompt_fn, Engine):
+        prompt_fn.state = prompt_fn.state.settle()
+
+    if name is None or name not in answers:
+        session = Session(ask, prompt_fn, validate=validate)
+        if not session.send(keys.TIMEOUT):
+            session.close()
+            raise exceptions.MissingAnswerError(
+                f"no answer for {name or ask!r}", name=name
+            )
+        assert session.result is not None
+        return session.result.value
+
+    try:
+        if not isinstance(prompt_fn, Engine):
+            raise exceptions.InvalidAnswerError(
+                f"{name!r} cannot be answered with a value", name=name
+            )
+        try:
+            result = prompt_fn.state.answer(answers[name])
+        except ValueError as exc:
+            raise exceptions.InvalidAnswerError(
+                f"invalid answer for {name!r}: {exc}", name=name
+            ) from exc
+        match (validate or (lambda _: True))(result.value):
+            case True | None:
+                return result.value
+            case e:
+                raise exceptions.InvalidAnswerError(
+                    f"answer for {name!r} did not pass the validation", name=name
+                ) from (e if isinstance(e, BaseException) else None)
+    finally:
+        prompt_fn.close()
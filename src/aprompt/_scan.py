@@ -0,0 +1,95 @@
+"""
+Listing directories in the background.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+import os
+import threading
+import time
+from typing import Optional
+
+from attrs import define
+
+REVALIDATE = 1.0
+"""Seconds a listing is used before its directory is checked for changes."""
+
+
+@define
+class Listing:
+    entries: list[tuple[str, bool]]
+    """Names and whether they are directories, directories first."""
+
+    mtime: int = 0
+    checked: float = 0.0
+    error: Optional[OSError] = None
+
+
+class Scanner:
+    """
+    Lists directories on a thread pool and caches the listings. A cached
+    listing is only scanned again once the modification time of its
+    directory has changed.
+    """
+
+    def __init__(self, *, cache_size: int = 64, max_workers: int = 4) -> None:
+        self.cache_size = cache_size
+        self._lock = threading.Lock()
+        self._cache: OrderedDict[str, Listing] = OrderedDict()
+        self._pending: dict[str, Future[None]] = {}
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="aprompt-scan"
+        )
+
+    def get(self, path: str) -> Optional[Listing]:
+        """
+        Returns the listing of ``path`` or ``None`` if it has not been
+        scanned yet. A scan is started in the background if necessary.
+        """
+        with self._lock:
+            listing = self._cache.get(path)
+            if listing is not None:
+                self._cache.move_to_end(path)
+            if path not in self._pending and (
+                listing is None or time.monotonic() - listing.checked >= REVALIDATE
+            ):
+                self._pending[path] = self._executor.submit(self._scan, path, listing)
+            return listing
+
+    prefetch = get
+
+    def _scan(self, path: str, listing: Optional[Listing]) -> None:
+        try:
+            mtime = os.stat(path).st_mtime_ns
+            if listing is None or listing.mtime != mtime or listing.error:
+                with os.scandir(path) as it:
+                    entries = []
+                    for entry in it:
+                        try:
+                            entries.append((entry.name, entry.is_dir()))
+                        except OSError:
+                            entries.append((entry.name, False))
+                entries.sort(key=lambda e: (not e[1], e[0].casefold()))
+                listing = Listing(entries, mtime)
+        except OSError as exc:
+            listing = Listing([], error=exc)
+        listing.checked = time.monotonic()
+        with self._lock:
+            self._cache[path] = listing
+            self._cache.move_to_end(path)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+            del self._pending[path]
+
+
+_scanner: Optional[Scanner] = None
+
+
+def scanner() -> Scanner:
+    """Returns the scanner shared by all prompts."""
+    global _scanner
+    if _scanner is None:
+        _scanner = Scanner()
+    return _scanner
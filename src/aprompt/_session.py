@@ -0,0 +1,75 @@
+"""
+Driving prompt engines independently from any input and output.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from typing import Generic, Optional, TYPE_CHECKING, TypeVar
+
+from aprompt import widgets as w
+from aprompt.result import Result
+
+if TYPE_CHECKING:
+    from aprompt import PromptEngine
+
+T = TypeVar("T")
+
+
+class Session(Generic[T]):
+    """
+    Sends keys to a prompt engine and keeps track of the widgets to
+    display. Validation is handled the same way as in
+    :func:`aprompt.prompt`.
+
+    The engine is closed once the session is done.
+    """
+
+    def __init__(
+        self,
+        ask: str,
+        engine: PromptEngine[T],
+        *,
+        validate: None
+        | Callable[[T], bool]
+        | Callable[[T], BaseException | None] = None,
+    ) -> None:
+        self.ask = ask
+        self.engine = engine
+        self.validate = validate or (lambda _: True)
+        self.result: Optional[Result[T]] = None
+
+        res = next(engine)
+        assert not isinstance(res, Result)  # prompts must not initially yield a Result
+        self.widgets: list[Optional[w.Widget]] = [w.Question(ask), *res]
+
+    @property
+    def done(self) -> bool:
+        return self.result is not None
+
+    def send(self, key: str) -> bool:
+        """
+        Sends a key to the engine and returns whether the session is done.
+        """
+        res = self.engine.send(key)
+        if isinstance(res, Result):
+            match self.validate(res.value):
+                case True | None:
+                    self.result = res
+                    self.widgets = [w.Question(self.ask), w.Answer(res.display)]
+                    self.engine.close()
+                    return True
+                case e:
+                    if isinstance(e, BaseException):
+                        self.widgets.append(w.Error(e))
+                    else:
+                        self.widgets.append(w.Alert())
+                    next(
+                        self.engine
+                    )  # resume prompt because `yield Result` must not receive a key
+        else:
+            self.widgets = [w.Question(self.ask), *res]
+        return False
+
+    def close(self) -> None:
+        self.engine.close()
@@ -0,0 +1,205 @@
+"""
+Reading keys from and drawing frames to a terminal.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+import codecs
+import os
+import selectors
+import sys
+import time
+from types import TracebackType
+from typing import Any, Optional, TextIO
+
+from readchar import readkey
+
+from aprompt._utils import KeyDecoder, clear_lines
+from aprompt._width import rows
+
+try:
+    import termios
+except ImportError:  # Windows
+    termios = None  # type: ignore
+
+ESCAPE_TIMEOUT = 0.05
+"""Seconds to wait for the rest of an escape sequence."""
+
+
+class KeyReader:
+    """
+    Reads keys from a terminal and optionally gives up after a timeout.
+
+    The terminal is kept in non-canonical mode while the reader is entered
+    so keys can be awaited with :external+python:py:mod:`selectors`
+    instead of blocking reads. If the file is no terminal it is read as
+    is. Without :external+python:py:mod:`termios` (Windows) keys are read
+    with :external:py:func:`readchar.readkey` and timeouts are ignored.
+    """
+
+    def __init__(self, file: Optional[TextIO] = None) -> None:
+        self.file = file or sys.stdin
+        self._keys: deque[str] = deque()
+        self._decoder = KeyDecoder()
+        self._decode = codecs.getincrementaldecoder("utf-8")(errors="replace").decode
+        self._selector: Optional[selectors.BaseSelector] = None
+        self._fd = -1
+        self._attrs: Optional[list[Any]] = None
+        self._wakeup: Optional[tuple[int, int]] = None
+
+    @property
+    def pending(self) -> bool:
+        """Whether keys have been received that have not been read yet."""
+        return bool(self._keys)
+
+    def __enter__(self) -> KeyReader:
+        if termios is None:
+            return self
+        self._fd = self.file.fileno()
+        try:
+            self._attrs = termios.tcgetattr(self._fd)
+        except termios.error:
+            self._attrs = None  # not a terminal
+        else:
+            mode = termios.tcgetattr(self._fd)
+            # `CTRL+C` is handled by `aprompt.prompt` as a key
+            mode[3] &= ~(termios.ICANON | termios.ECHO | termios.ISIG)
+            mode[6][termios.VMIN] = 1
+            mode[6][termios.VTIME] = 0
+            termios.tcsetattr(self._fd, termios.TCSAFLUSH, mode)
+        self._selector = selectors.DefaultSelector()
+        try:
+            self._selector.register(self._fd, selectors.EVENT_READ)
+        except PermissionError:  # regular files cannot be polled
+            self._selector.close()
+            self._selector = selectors.SelectSelector()
+            self._selector.register(self._fd, selectors.EVENT_READ)
+        self._wakeup = os.pipe()
+        os.set_blocking(self._wakeup[1], False)
+        self._selector.register(self._wakeup[0], selectors.EVENT_READ)
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        if self._selector is not None:
+            self._selector.close()
+            self._selector = None
+        if self._wakeup is not None:
+            for fd in self._wakeup:
+                os.close(fd)
+            self._wakeup = None
+        if self._attrs is not None:
+            termios.tcsetattr(self._fd, termios.TCSADRAIN, self._attrs)
+            self._attrs = None
+
+    def wake(self) -> None:
+        """
+        Makes a waiting :meth:`read` return ``None``. This may be called
+        from any thread.
+        """
+        if self._wakeup is not None:
+            try:
+                os.write(self._wakeup[1], b"\0")
+            except (BlockingIOError, OSError):
+                pass  # already woken up or closed
+
+    def read(self, timeout: Optional[float] = None) -> Optional[str]:
+        """
+        Returns the next key or ``None`` if no key has been pressed within
+        ``timeout`` seconds or :meth:`wake` has been called.
+
+        Raises
+        ------
+        ``EOFError``
+            The input has been closed.
+        """
+        if self._selector is None:
+            return readkey()
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not self._keys:
+            wait = None if deadline is None else max(0, deadline - time.monotonic())
+            if self._decoder.pending:
+                wait = ESCAPE_TIMEOUT if wait is None else min(wait, ESCAPE_TIMEOUT)
+            events = self._selector.select(wait)
+            if not events:
+                if self._decoder.pending:
+                    self._keys.extend(self._decoder.flush())
+                    continue
+                if deadline is not None and time.monotonic() >= deadline:
+                    return None
+                continue
+            if self._wakeup is not None and any(
+                key.fd == self._wakeup[0] for key, _ in events
+            ):
+                os.read(self._wakeup[0], 4096)
+                return None
+            data = os.read(self._fd, 4096)
+            if not data:
+                raise EOFError("input has been closed")
+            self._keys.extend(self._decoder.feed(self._decode(data)))
+        return self._keys.popleft()
+
+
+class Screen:
+    """
+    Draws frames to a file. A frame is only written if it differs from the
+    frame currently displayed, but a frame ringing the bell always rings it.
+    Lines wider than ``columns`` are taken into account when clearing the
+    previous frame.
+
+    If ``live`` is ``False``, frames are not drawn at all and only the final
+    frame is written.
+    """
+
+    def __init__(
+        self,
+        file: TextIO,
+        *,
+        columns: int = 80,
+        enabled: bool = True,
+        live: bool = True,
+    ) -> None:
+        self.file = file
+        self.columns = columns
+        self.enabled = enabled
+        self.live = live
+        self._display: Optional[str] = None
+        self._clear = 0
+
+    def draw(self, display: str, *, above: str = "") -> None:
+        """
+        Draws a frame. ``above`` is printed above the frame and scrolls
+        with the rest of the terminal.
+        """
+        if not self.live:
+            return
+        if display == self._display and not above:
+            if "\a" in display:
+                # the same key may be rejected several times in a row
+                self._write("\a")
+            return
+        if above and not above.endswith("\n"):
+            above += "\n"
+        self._write(clear_lines(self._clear) + above + display)
+        self._display = display
+        self._clear = rows(display, self.columns)
+
+    def finish(self, display: str) -> None:
+        """
+        Replaces the current frame with a final one that is left on the
+        terminal.
+        """
+        self._write(clear_lines(self._clear) + display + "\n")
+        self._display = None
+        self._clear = 0
+
+    def _write(self, string: str) -> None:
+        if self.enabled:
+            self.file.write(string)
+            self.file.flush()
@@ -4,10 +4,19 @@ Internal utilities for aprompt.
 
 from __future__ import annotations
 
-from collections.abc import Iterator
-from typing import Any, Generic, TypeVar
+from bisect import bisect_left
+from collections import OrderedDict
+from collections.abc import Callable, Iterable, Iterator
+import inspect
+import threading
+import time
+from typing import Any, Generic, Optional, TYPE_CHECKING, TypeVar
 from attrs import define
 
+if TYPE_CHECKING:
+    import asyncio
+    from concurrent.futures import Future, ThreadPoolExecutor
+
 T = TypeVar("T")
 
 
@@ -59,3 +68,294 @@ class Cursor(Generic[T]):
     def prev(self) -> None:
         self._index -= 1
         self._index %= len(self._list)
+
+
+class KeyDecoder:
+    """
+    Splits a stream of characters into keys the same way
+    :external:py:func:`readchar.readkey` does. Carriage returns are
+    translated into :kbd:`ENTER`.
+    """
+
+    def __init__(self) -> None:
+        self._pending = ""
+        self._cr = False
+
+    @property
+    def pending(self) -> str:
+        """Characters of an incomplete escape sequence."""
+        return self._pending
+
+    def feed(self, chars: str) -> list[str]:
+        keys: list[str] = []
+        for char in chars:
+            if self._cr and char == "\n":
+                # `\r\n` sent by some clients is a single ENTER
+                self._cr = False
+                continue
+            self._cr = char == "\r"
+            if char == "\r":
+                char = "\n"
+
+            seq = self._pending + char
+            if not seq.startswith("\x1b") or _escape_complete(seq):
+                keys.append(seq)
+                self._pending = ""
+            else:
+                self._pending = seq
+        return keys
+
+    def flush(self) -> list[str]:
+        """
+        Returns the pending characters as a key, e.g. a lonely
+        :kbd:`ESC`.
+        """
+        keys = [self._pending] if self._pending else []
+        self._pending = ""
+        return keys
+
+
+def _escape_complete(seq: str) -> bool:
+    # mirrors the decisions made by `readchar.readkey` on POSIX
+    match len(seq):
+        case 1:
+            return False
+        case 2:
+            return seq[1] not in "\x4f\x5b"
+        case 3:
+            return seq[2] not in "\x31\x32\x33\x35\x36"
+        case 4:
+            return seq[3] not in "\x30\x31\x33\x34\x35\x37\x38\x39"
+        case _:
+            return True
+
+
+class PrefixIndex:
+    """
+    A sorted array of strings looking up strings by their prefix in
+    ``O(log n + k)``.
+    """
+
+    def __init__(self, strings: Iterable[str]) -> None:
+        self._items = sorted(set(strings))
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def add(self, string: str) -> None:
+        i = bisect_left(self._items, string)
+        if i == len(self._items) or self._items[i] != string:
+            self._items.insert(i, string)
+
+    def search(self, prefix: str, limit: Optional[int] = None) -> list[str]:
+        """
+        Returns the strings starting with ``prefix`` in sorted order.
+        """
+        result: list[str] = []
+        for i in range(bisect_left(self._items, prefix), len(self._items)):
+            item = self._items[i]
+            if not item.startswith(prefix) or len(result) == limit:
+                break
+            result.append(item)
+        return result
+
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_lock = threading.Lock()
+
+
+def background_loop() -> asyncio.AbstractEventLoop:
+    """
+    Returns an event loop running in a daemon thread to run coroutines
+    from synchronous code.
+    """
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            import asyncio
+
+            _loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=_loop.run_forever, name="aprompt-loop", daemon=True
+            ).start()
+        return _loop
+
+
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def run_in_background(function: Callable[..., Any], *args: Any) -> Future[Any]:
+    """
+    Calls ``function`` in a thread or, if it is a coroutine function, on
+    the :func:`background_loop` and returns the future of its result.
+    """
+    global _executor
+    if inspect.iscoroutinefunction(function):
+        import asyncio
+
+        return asyncio.run_coroutine_threadsafe(function(*args), background_loop())
+    with _loop_lock:
+        if _executor is None:
+            from concurrent.futures import ThreadPoolExecutor
+
+            _executor = ThreadPoolExecutor(thread_name_prefix="aprompt")
+    return _executor.submit(function, *args)
+
+
+class BackgroundCache(Generic[T]):
+    """
+    Calls a function with changing keys in the background. Calls are
+    debounced while the key changes, cancelled once it changed and their
+    results cached.
+
+    ``result`` turns the future of a call for a key into the value cached
+    for it.
+    """
+
+    def __init__(
+        self,
+        function: Callable[[str], Any],
+        result: Callable[[str, Future[Any]], T],
+        *,
+        debounce: float,
+        size: int,
+    ) -> None:
+        self.function = function
+        self.debounce = debounce
+        self.size = size
+        self._result = result
+        self._cache: OrderedDict[str, T] = OrderedDict()
+        self._key: Optional[str] = None
+        self._changed_at = 0.0
+        self._future: Optional[Future[Any]] = None
+        self._prefetching: dict[str, Future[Any]] = {}
+
+    def get(self, key: str) -> Optional[T]:
+        """
+        Returns the cached value for ``key`` or ``None`` while it is looked
+        up. This is meant to be called whenever the key changes and
+        periodically while the result is ``None``.
+        """
+        self._harvest()
+        if key in self._cache:
+            self._cancel()
+            self._cache.move_to_end(key)
+            return self._cache[key]
+
+        now = time.monotonic()
+        if key != self._key:
+            self._cancel()
+            self._key = key
+            self._changed_at = now
+            self._future = self._prefetching.pop(key, None)
+
+        if self._future is None:
+            if now - self._changed_at >= self.debounce:
+                self._future = run_in_background(self.function, key)
+            return None
+        if not self._future.done():
+            return None
+
+        future, self._future = self._future, None
+        return self._store(key, future)
+
+    def prefetch(self, keys: Iterable[str]) -> None:
+        """
+        Looks up ``keys`` in advance without debouncing and cancels the
+        lookups of keys prefetched before.
+        """
+        wanted = [key for key in keys if key not in self._cache]
+        for key, future in list(self._prefetching.items()):
+            if key not in wanted:
+                future.cancel()
+                del self._prefetching[key]
+        for key in wanted:
+            if key not in self._prefetching:
+                self._prefetching[key] = run_in_background(self.function, key)
+
+    def close(self) -> None:
+        """Cancels pending lookups."""
+        self._cancel()
+        for future in self._prefetching.values():
+            future.cancel()
+        self._prefetching.clear()
+
+    def _store(self, key: str, future: Future[Any]) -> T:
+        value = self._cache[key] = self._result(key, future)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.size:
+            self._cache.popitem(last=False)
+        return value
+
+    def _harvest(self) -> None:
+        for key, future in list(self._prefetching.items()):
+            if future.done():
+                del self._prefetching[key]
+                if not future.cancelled():
+                    self._store(key, future)
+
+    def _cancel(self) -> None:
+        if self._future is not None:
+            self._future.cancel()
+            self._future = None
+        self._key = None
+
+
+class TypeAhead:
+    """
+    Finds the first string starting with the letters typed in a row, like
+    list boxes do. Typing the same letter repeatedly cycles through the
+    strings starting with it.
+    """
+
+    def __init__(self, strings: Iterable[str]) -> None:
+        folded = [s.casefold() for s in strings]
+        self._keys = sorted((s, i) for i, s in enumerate(folded))
+        # a segment tree of the smallest index of ranges of sorted strings
+        size = len(self._keys)
+        self._first = [0] * size + [i for _, i in self._keys]
+        for j in range(size - 1, 0, -1):
+            self._first[j] = min(self._first[2 * j], self._first[2 * j + 1])
+        # the indices of the strings starting with each letter in order
+        self._letters: dict[str, list[int]] = {}
+        for i, s in enumerate(folded):
+            self._letters.setdefault(s[:1], []).append(i)
+
+    def search(self, typed: str) -> Optional[int]:
+        """
+        Returns the index of the string matching the letters typed in a
+        row or ``None``.
+        """
+        typed = typed.casefold()
+        found = self._range(typed)
+        if found is not None:
+            return self._smallest(*found)
+        if typed and typed == typed[0] * len(typed):
+            indices = self._letters.get(typed[0])
+            if indices:
+                return indices[(len(typed) - 1) % len(indices)]
+        return None
+
+    def _smallest(self, start: int, stop: int) -> int:
+        # the smallest index of the sorted strings from start to stop
+        smallest = len(self._keys)
+        start += len(self._keys)
+        stop += len(self._keys)
+        while start < stop:
+            if start % 2:
+                smallest = min(smallest, self._first[start])
+                start += 1
+            if stop % 2:
+                stop -= 1
+                smallest = min(smallest, self._first[stop])
+            start //= 2
+            stop //= 2
+        return smallest
+
+    def _range(self, prefix: str) -> Optional[tuple[int, int]]:
+        start = bisect_left(self._keys, (prefix,))
+        if start == len(self._keys) or not self._keys[start][0].startswith(prefix):
+            return None
+        # every string starting with the prefix sorts before this
+        stop = bisect_left(self._keys, (prefix + "\U0010ffff",), start)
+        return start, stop
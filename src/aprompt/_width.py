@@ -0,0 +1,206 @@
+"""
+Measuring strings in terminal cells. Wide characters (e.g. CJK and most
+emoji) occupy two cells while combining and other zero-width characters
+occupy none, which :external+python:py:mod:`textwrap` does not know about.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_right
+from collections.abc import Callable
+from functools import lru_cache
+import re
+import textwrap
+
+from aprompt._width_table import WIDE, ZERO
+
+_ANSI = re.compile(r"\x1b\[[0-?]*[ -/]*[@-~]")
+_WIDE_STARTS = WIDE[::2]
+_ZERO_STARTS = ZERO[::2]
+
+
+def _within(table: tuple[int, ...], starts: tuple[int, ...], code: int) -> bool:
+    i = bisect_right(starts, code) - 1
+    return i >= 0 and code <= table[i * 2 + 1]
+
+
+def char_width(char: str) -> int:
+    """
+    Returns the amount of cells a single character occupies.
+    """
+    code = ord(char)
+    if 0x20 <= code < 0x7F:
+        return 1
+    if code < 0x20 or 0x7F <= code < 0xA0:
+        return 0  # control characters
+    if _within(ZERO, _ZERO_STARTS, code):
+        return 0
+    if _within(WIDE, _WIDE_STARTS, code):
+        return 2
+    return 1
+
+
+@lru_cache(maxsize=4096)
+def width(string: str) -> int:
+    """
+    Returns the amount of cells a string occupies. ANSI escape sequences
+    are ignored.
+    """
+    if "\x1b" in string:
+        string = _ANSI.sub("", string)
+    if string.isascii() and string.isprintable():
+        return len(string)
+    return sum(map(char_width, string))
+
+
+def rows(display: str, columns: int) -> int:
+    """
+    Returns the amount of terminal rows the lines of ``display`` occupy,
+    not counting the line after the last newline.
+    """
+    lines = display.split("\n")[:-1]
+    return sum(max(-(-width(line) // columns), 1) for line in lines)
+
+
+def truncate(string: str, columns: int, placeholder: str = "…") -> str:
+    """
+    Cuts a string so it occupies at most ``columns`` cells.
+    """
+    if width(string) <= columns:
+        return string
+    columns -= width(placeholder)
+    result = ""
+    for char in string:
+        columns -= char_width(char)
+        if columns < 0:
+            break
+        result += char
+    return result + placeholder
+
+
+def ljust(string: str, columns: int) -> str:
+    """
+    Cuts or pads a string so it occupies exactly ``columns`` cells.
+    """
+    string = truncate(string, columns)
+    return string + " " * (columns - width(string))
+
+
+def _split(word: str, first: int, columns: int) -> list[str]:
+    # splits a word that does not fit into a single line; the first part
+    # fills the rest of the current line
+    parts = [""]
+    free = first
+    for char in word:
+        size = char_width(char)
+        # the first part stays empty if not even a character fits, but a
+        # character wider than a whole line must not cause empty lines
+        if size > free and (parts[-1] or free < columns):
+            parts.append("")
+            free = columns
+        parts[-1] += char
+        free -= size
+    return parts
+
+
+def wrap(text: str, columns: int, *, initial_indent: str = "") -> list[str]:
+    """
+    Wraps text into lines occupying at most ``columns`` cells.
+
+    ASCII text is wrapped by :external+python:py:func:`textwrap.wrap`
+    (without replacing whitespace).
+    """
+    if text.isascii() and initial_indent.isascii():
+        return textwrap.wrap(
+            text, columns, initial_indent=initial_indent, replace_whitespace=False
+        )
+
+    lines: list[str] = []
+    line = initial_indent
+    used = width(initial_indent)
+    empty = True  # whether the line only consists of the indent
+    for word in re.split(r"(\s+)", text):
+        if not word:
+            continue
+        size = width(word)
+        if word.isspace():
+            if not empty and used + size <= columns:
+                line += word
+                used += size
+            continue
+        if used + size > columns and not empty and (size <= columns or used >= columns):
+            lines.append(line.rstrip())
+            line, used = "", 0
+        if used + size > columns:
+            *full, word = _split(word, columns - used, columns)
+            for part in full:
+                lines.append((line + part).rstrip())
+                line, used = "", 0
+            size = width(word)
+        line += word
+        used += size
+        empty = False
+    if not empty:
+        lines.append(line.rstrip())
+    return lines
+
+
+@lru_cache(maxsize=1024)
+def fill(text: str, columns: int, *, initial_indent: str = "") -> str:
+    """
+    The same as :func:`wrap` but joins the lines. Results are cached as
+    most lines are the same from one frame to the next.
+    """
+    return "\n".join(wrap(text, columns, initial_indent=initial_indent))
+
+
+def _generate() -> str:
+    import unicodedata
+
+    def ranges(predicate: Callable[[int], bool]) -> list[int]:
+        flat: list[int] = []
+        for code in range(0x110000):
+            if predicate(code):
+                if flat and flat[-1] == code - 1:
+                    flat[-1] = code
+                else:
+                    flat.extend((code, code))
+        return flat
+
+    def zero(code: int) -> bool:
+        category = unicodedata.category(chr(code))
+        return (
+            category in ("Mn", "Me")
+            or (category == "Cf" and code != 0xAD)  # soft hyphen is visible
+            or 0x1160 <= code <= 0x11FF  # hangul jamo medial vowels and finals
+        )
+
+    def wide(code: int) -> bool:
+        if 0x20000 <= code <= 0x3FFFD:  # CJK planes, including reserved code points
+            return True
+        char = chr(code)
+        return (
+            unicodedata.category(char) != "Cn"
+            and unicodedata.east_asian_width(char) in ("W", "F")
+            and not zero(code)
+        )
+
+    def table(name: str, flat: list[int]) -> str:
+        pairs = [f"0x{a:05X}, 0x{b:05X}," for a, b in zip(flat[::2], flat[1::2])]
+        body = "\n".join(
+            "    " + " ".join(pairs[i : i + 3]) for i in range(0, len(pairs), 3)
+        )
+        return f"{name} = (\n{body}\n)\n"
+
+    return (
+        f'"""\nGenerated by ``python -m aprompt._width`` from Unicode'
+        f" {unicodedata.unidata_version}. Do not edit.\n\nEach table is a flat"
+        ' tuple of inclusive ``start, end`` code point ranges.\n"""\n\n# fmt: off\n'
+        + table("WIDE", ranges(wide))
+        + "\n"
+        + table("ZERO", ranges(zero))
+    )
+
+
+if __name__ == "__main__":
+    print(_generate(), end="")
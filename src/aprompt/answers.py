@@ -0,0 +1,125 @@
+"""
+Answering prompts without a terminal, e.g. for provisioning. Answers are
+given by the name of a prompt as values, such as the text of an option for
+:func:`aprompt.prompts.choice` or a list of them if ``multiple`` is
+``True``, instead of keys. Validation still runs but nothing is displayed.
+
+Example:
+
+.. code-block:: toml
+
+    # answers.toml
+    name = "Alice"
+    languages = ["Python", "Rust"]
+
+    [account]
+    create = true
+
+.. code-block:: python
+
+    from aprompt import answers, prompt
+    from aprompt.prompts import choice, confirm, text
+
+    with answers.provide(answers.load("answers.toml")):
+        name = prompt("Name?", text(), name="name")
+        languages = prompt(
+            "Languages?",
+            choice("Python", "Rust", "Go", multiple=True),
+            name="languages",
+        )
+        create = prompt("Create account?", confirm(), name="account.create")
+
+Nested tables are joined with dots. Answers can also be passed to
+:func:`aprompt.prompt` directly with ``answers``, or to
+:class:`aprompt.ext.argparse.Namespace` to answer missing arguments by
+their names.
+
+Prompts without an answer return their default as if the time to answer
+was up; prompts without a default raise
+:class:`aprompt.exceptions.MissingAnswerError`.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterator, Mapping
+from contextlib import contextmanager
+from contextvars import ContextVar
+import json
+import os
+from pathlib import Path
+import sys
+from typing import Any, Optional
+
+Answers = Mapping[str, Any]
+"""Answers by the names of the prompts."""
+
+_current: ContextVar[Optional[Answers]] = ContextVar("answers", default=None)
+
+
+def _flatten(obj: Mapping[str, Any], prefix: str = "") -> dict[str, Any]:
+    flat: dict[str, Any] = {}
+    for key, value in obj.items():
+        if isinstance(value, Mapping):
+            flat.update(_flatten(value, f"{prefix}{key}."))
+        else:
+            flat[prefix + key] = value
+    return flat
+
+
+def load(path: str | os.PathLike[str]) -> dict[str, Any]:
+    """
+    Reads answers from a JSON or TOML file depending on its suffix.
+    """
+    path = Path(path)
+    if path.suffix == ".toml":
+        if sys.version_info >= (3, 11):
+            import tomllib
+        else:
+            import tomli as tomllib
+        with path.open("rb") as f:
+            return _flatten(tomllib.load(f))
+    with path.open(encoding="utf-8") as f:
+        data = json.load(f)
+    if not isinstance(data, dict):
+        raise ValueError(f"{path} does not contain an object")
+    return _flatten(data)
+
+
+def from_env(
+    prefix: str = "APROMPT_ANSWER_", environ: Optional[Mapping[str, str]] = None
+) -> dict[str, Any]:
+    """
+    Reads answers from environment variables starting with ``prefix``.
+    ``APROMPT_ANSWER_ACCOUNT__CREATE=yes`` answers the prompt named
+    ``account.create``. Values are read as JSON if possible and as strings
+    otherwise.
+    """
+    environ = os.environ if environ is None else environ
+    answers: dict[str, Any] = {}
+    for var, value in environ.items():
+        if not var.startswith(prefix) or var == prefix:
+            continue
+        name = var[len(prefix) :].lower().replace("__", ".")
+        try:
+            answers[name] = json.loads(value)
+        except ValueError:
+            answers[name] = value
+    return answers
+
+
+@contextmanager
+def provide(answers: Answers) -> Iterator[None]:
+    """
+    Answers all prompts displayed by :func:`aprompt.prompt` within the
+    context from ``answers``.
+    """
+    token = _current.set(answers)
+    try:
+        yield
+    finally:
+        _current.reset(token)
+
+
+def current() -> Optional[Answers]:
+    """Returns the answers provided with :func:`provide` if any."""
+    return _current.get()
@@ -0,0 +1,183 @@
+"""
+The broker lets several threads ask the user something without garbling
+each other's output. Workers submit prompts to the broker and receive a
+:external+python:py:class:`concurrent.futures.Future` while the thread
+owning the terminal answers them one at a time.
+
+Example:
+
+.. code-block:: python
+
+    from concurrent.futures import ThreadPoolExecutor, wait
+    from aprompt.broker import PromptBroker
+    from aprompt.prompts import confirm
+
+    broker = PromptBroker()
+
+    def deploy(host: str) -> None:
+        answer = broker.submit(f"Deploy to {host}?", confirm(), default=False)
+        ...  # keep working while the question waits
+        if answer.result():
+            ...
+
+    with ThreadPoolExecutor() as pool:
+        futures = [pool.submit(deploy, host) for host in ["a", "b", "c"]]
+        pool.submit(lambda: (wait(futures), broker.close()))
+        broker.serve()
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import Future
+import itertools
+import queue
+import threading
+from typing import Any, Generic, Optional, TypeVar
+
+from attrs import define, field
+
+from aprompt import PromptEngine, prompt
+from aprompt.exceptions import PromptExit, PromptTimeoutError
+
+T = TypeVar("T")
+
+_MISSING: Any = object()
+_LAST = 2**63
+
+
+@define(order=False)
+class _Request(Generic[T]):
+    ask: str
+    engine: PromptEngine[T]
+    kwargs: dict[str, Any]
+    default: T
+    future: Future[T] = field(factory=Future)
+    timer: Optional[threading.Timer] = None
+    started: bool = False
+
+
+class PromptBroker:
+    """
+    Queues prompts submitted by any thread and runs them one at a time on
+    the thread calling :meth:`serve`.
+    """
+
+    def __init__(self) -> None:
+        self._queue: queue.PriorityQueue[tuple[int, int, Optional[_Request[Any]]]]
+        self._queue = queue.PriorityQueue()
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def submit(
+        self,
+        ask: str,
+        engine: PromptEngine[T],
+        *,
+        priority: int = 0,
+        timeout: Optional[float] = None,
+        default: T = _MISSING,
+        **kwargs: Any,
+    ) -> Future[T]:
+        """
+        Queues a prompt and returns a future resolving to its result.
+
+        Parameters
+        ----------
+        ask
+            The question to ask.
+
+        engine
+            The prompt engine.
+
+        priority
+            Prompts with a higher priority are served first. Prompts with
+            the same priority are served in the order they were submitted.
+
+        timeout
+            The amount of seconds the prompt may wait in the queue. When
+            the prompt has not been served in time, the future resolves to
+            ``default`` or fails with
+            :class:`aprompt.exceptions.PromptTimeoutError` if no default is
+            given. A prompt that is already displayed is not affected.
+
+        default
+            The result of the prompt if it is never served.
+
+        kwargs
+            Passed to :func:`aprompt.prompt`.
+
+        Raises
+        ------
+        ``RuntimeError``
+            The broker has been closed.
+        """
+        request = _Request(ask, engine, kwargs, default)
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("cannot submit prompts to a closed broker")
+            if timeout is not None:
+                request.timer = threading.Timer(timeout, self._expire, (request,))
+                request.timer.daemon = True
+                request.timer.start()
+            self._queue.put((-priority, next(self._counter), request))
+        return request.future
+
+    def _expire(self, request: _Request[Any]) -> None:
+        with self._lock:
+            if request.started or not request.future.set_running_or_notify_cancel():
+                return
+            request.started = True
+        request.engine.close()
+        if request.default is _MISSING:
+            request.future.set_exception(
+                PromptTimeoutError(f"prompt {request.ask!r} has not been served in time")
+            )
+        else:
+            request.future.set_result(request.default)
+
+    def serve(self) -> None:
+        """
+        Serves prompts until :meth:`close` is called and all queued prompts
+        have been served. This must be called from the thread owning the
+        terminal, usually the main thread.
+
+        A ``SystemExit`` raised by a prompt (the user hit :kbd:`CTRL+C`)
+        is set on the future of the prompt and then propagates.
+        """
+        while True:
+            _, _, request = self._queue.get()
+            if request is None:
+                return
+
+            with self._lock:
+                if request.started:
+                    continue
+                if request.timer is not None:
+                    request.timer.cancel()
+                request.started = True
+                if not request.future.set_running_or_notify_cancel():
+                    request.engine.close()
+                    continue
+
+            try:
+                result = prompt(request.ask, request.engine, **request.kwargs)
+            except (Exception, PromptExit) as exc:
+                request.future.set_exception(exc)
+            except BaseException as exc:
+                request.future.set_exception(exc)
+                raise
+            else:
+                request.future.set_result(result)
+
+    def close(self) -> None:
+        """
+        Stops :meth:`serve` once all prompts submitted so far have been
+        served. Further submissions raise ``RuntimeError``.
+        """
+        with self._lock:
+            if not self._closed:
+                self._closed = True
+                # sorts after every request because the counter keeps growing
+                self._queue.put((_LAST, next(self._counter), None))
+
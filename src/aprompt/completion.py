@@ -0,0 +1,101 @@
+"""
+Completions for :func:`aprompt.prompts.text`.
+
+A static corpus is indexed once and looked up by prefix without blocking.
+Providers are called in the background: lookups are debounced while the
+user types, cached per prefix and cancelled once the prefix changes.
+
+Example:
+
+.. code-block:: python
+
+    import asyncio
+    from aprompt import prompt
+    from aprompt.completion import Completer
+    from aprompt.prompts import text
+
+    prompt("Host?", text(complete=["db-1", "db-2", "web-1"]))
+
+    async def services(prefix: str) -> list[str]:
+        await asyncio.sleep(0.2)  # e.g. ask a service registry
+        return [name for name in ["api", "auth", "billing"] if name.startswith(prefix)]
+
+    prompt("Service?", text(complete=Completer(services, debounce=0.2)))
+"""
+
+from __future__ import annotations
+
+from collections.abc import Awaitable, Callable, Iterable
+from concurrent.futures import Future
+from typing import Any, Optional, Union
+
+from aprompt._utils import BackgroundCache, PrefixIndex
+
+Provider = Callable[[str], Union[Iterable[str], Awaitable[Iterable[str]]]]
+"""
+A callable taking a prefix and returning completions for it. Coroutine
+functions are run on a background event loop and cancelled when their
+results are no longer needed; other callables are run in a thread.
+"""
+
+
+
+class Completer:
+    """
+    Looks up completions for prefixes.
+
+    Parameters
+    ----------
+    source
+        A corpus of completions or a :data:`Provider`.
+
+    limit
+        The maximum amount of completions.
+
+    debounce
+        Seconds a prefix must stay unchanged before a provider is called.
+
+    cache_size
+        The amount of prefixes whose completions are cached.
+    """
+
+    def __init__(
+        self,
+        source: Iterable[str] | Provider,
+        *,
+        limit: int = 8,
+        debounce: float = 0.1,
+        cache_size: int = 256,
+    ) -> None:
+        self.limit = limit
+        self._index: Optional[PrefixIndex] = None
+        self._lookups: Optional[BackgroundCache[list[str]]] = None
+        if callable(source):
+            self._lookups = BackgroundCache(
+                source, self._found, debounce=debounce, size=cache_size
+            )
+        else:
+            self._index = PrefixIndex(source)
+
+    def complete(self, prefix: str) -> Optional[list[str]]:
+        """
+        Returns the completions for ``prefix`` or ``None`` while they are
+        looked up. This is meant to be called whenever the prefix changes
+        and periodically while the result is ``None``.
+        """
+        if self._index is not None:
+            return self._index.search(prefix, self.limit)
+        assert self._lookups is not None
+        return self._lookups.get(prefix)
+
+    def _found(self, prefix: str, future: Future[Any]) -> list[str]:
+        try:
+            found = [c for c in future.result() if c.startswith(prefix)]
+        except Exception:
+            found = []
+        return found[: self.limit]
+
+    def close(self) -> None:
+        """Cancels a pending lookup."""
+        if self._lookups is not None:
+            self._lookups.close()
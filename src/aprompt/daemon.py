@@ -0,0 +1,214 @@
+"""
+A long-lived process displaying prompts for short-lived programs. The
+daemon has aprompt imported already, so a program only pays for starting
+the small ``aprompt-client`` (see :mod:`aprompt_client`) instead of
+importing aprompt on every run.
+
+The client hands the file descriptors of its terminal over the Unix
+socket of the daemon, the daemon displays the prompt on that terminal and
+sends the answer back, which the client prints to standard output:
+
+.. code-block:: console
+
+    $ python -m aprompt.daemon &
+    $ name=$(aprompt-client text "What is your name?" --default=anonymous)
+
+The socket is only accessible by the user running the daemon. Its path is
+``APROMPT_SOCKET`` or ``aprompt-<uid>.sock`` in ``XDG_RUNTIME_DIR``.
+Clients only hand their terminal to a daemon of the same user.
+"""
+
+from __future__ import annotations
+
+import argparse
+from collections.abc import Callable
+from decimal import Decimal
+import json
+import os
+import socket
+import socketserver
+import stat
+from typing import Any, Optional, TextIO
+
+from aprompt import PromptEngine, prompt, prompts
+from aprompt.exceptions import PromptExit, PromptTimeoutError
+from aprompt_client import socket_path
+
+PROMPTS: dict[str, Callable[..., PromptEngine[Any]]] = {
+    "confirm": prompts.confirm,
+    "text": prompts.text,
+    "number": prompts.number,
+    "choice": prompts.choice,
+    "sort": prompts.sort,
+    "pin": prompts.pin,
+    "path": prompts.path,
+}
+"""The prompts clients can ask for by name."""
+
+_PROMPT_OPTIONS = ("timeout", "idle_timeout")
+_NUMBER_TYPES = {"int": int, "float": float, "Decimal": Decimal}
+
+
+def _decode(value: str) -> Any:
+    try:
+        return json.loads(value)
+    except ValueError:
+        return value
+
+
+def _parse(argv: list[str]) -> tuple[str, str, list[Any], dict[str, Any]]:
+    # PROMPT QUESTION [ARGUMENT ...] [--OPTION[=VALUE] ...]
+    if len(argv) < 2:
+        raise ValueError("a prompt and a question are required")
+    name, ask, *rest = argv
+    args: list[Any] = []
+    kwargs: dict[str, Any] = {}
+    for arg in rest:
+        if not arg.startswith("--"):
+            args.append(_decode(arg))
+            continue
+        option, has_value, value = arg[2:].partition("=")
+        option = option.replace("-", "_")
+        kwargs[option] = _decode(value) if has_value else True
+    return name, ask, args, kwargs
+
+
+def respond(
+    argv: list[str],
+    stdin: TextIO,
+    file: TextIO,
+    *,
+    cwd: Optional[str] = None,
+) -> dict[str, Any]:
+    """
+    Displays the prompt requested by the command line arguments of a
+    client and returns the response: ``{"answer": ...}`` or
+    ``{"error": ..., "status": ...}`` with the exit status of the client.
+    """
+    try:
+        name, ask, args, kwargs = _parse(argv)
+        if name not in PROMPTS:
+            raise ValueError(
+                f"unknown prompt {name!r}; choose from {', '.join(PROMPTS)}"
+            )
+        options = {o: kwargs.pop(o) for o in _PROMPT_OPTIONS if o in kwargs}
+        if name == "number" and "type" in kwargs:
+            kwargs["type"] = _NUMBER_TYPES[kwargs["type"]]
+        if name == "path" and cwd is not None:
+            # relative to the working directory of the client
+            args = [os.path.join(cwd, *map(str, args[:1]))]
+        engine = PROMPTS[name](*args, **kwargs)
+    except (ValueError, TypeError, KeyError, AttributeError) as exc:
+        return {"error": str(exc), "status": 2}
+
+    try:
+        answer = prompt(ask, engine, file=file, stdin=stdin, **options)
+    except SystemExit:
+        # CTRL+C
+        return {"error": "interrupted", "status": 130}
+    except PromptExit:
+        return {"error": "canceled", "status": 1}
+    except (PromptTimeoutError, EOFError, OSError) as exc:
+        return {"error": str(exc), "status": 1}
+    except (ValueError, TypeError, AttributeError) as exc:
+        # options the engine only uses while the prompt is displayed
+        return {"error": str(exc), "status": 2}
+    return {"answer": answer}
+
+
+class _Handler(socketserver.BaseRequestHandler):
+    request: socket.socket
+
+    def handle(self) -> None:
+        message, fds, _, _ = socket.recv_fds(self.request, 1 << 16, 2)
+        if len(fds) != 2:
+            for fd in fds:
+                os.close(fd)
+            return
+        with open(fds[0], "r") as stdin, open(fds[1], "w", encoding="utf-8") as file:
+            try:
+                req = json.loads(message)
+                argv = [str(a) for a in req["argv"]]
+            except (ValueError, KeyError, TypeError):
+                response: dict[str, Any] = {"error": "invalid request", "status": 2}
+            else:
+                response = respond(argv, stdin, file, cwd=req.get("cwd"))
+        try:
+            self.request.sendall(json.dumps(response, default=str).encode())
+        except OSError:
+            pass  # the client is gone
+
+
+class Daemon(socketserver.ThreadingUnixStreamServer):
+    """
+    A server displaying prompts for ``aprompt-client``. Every client is
+    handled in its own thread.
+
+    Example:
+
+    .. code-block:: python
+
+        from aprompt.daemon import Daemon
+
+        with Daemon() as daemon:
+            daemon.serve_forever()
+    """
+
+    daemon_threads = True
+
+    def __init__(self, path: Optional[str] = None) -> None:
+        path = path or socket_path()
+        if path is None:
+            raise ValueError("XDG_RUNTIME_DIR is not set; pass the path of the socket")
+        self.path = path
+        self._remove_stale()
+        umask = os.umask(0o177)
+        try:
+            super().__init__(self.path, _Handler)
+        finally:
+            os.umask(umask)
+
+    def _remove_stale(self) -> None:
+        # only a socket of this user nobody listens on is replaced
+        try:
+            info = os.lstat(self.path)
+        except FileNotFoundError:
+            return
+        if not stat.S_ISSOCK(info.st_mode) or info.st_uid != os.getuid():
+            raise FileExistsError(f"{self.path} exists and is no socket of this user")
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+            try:
+                probe.connect(self.path)
+            except ConnectionRefusedError:
+                os.unlink(self.path)
+            else:
+                raise FileExistsError(f"a daemon is already listening on {self.path}")
+
+    def server_close(self) -> None:
+        super().server_close()
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    """The entry point of ``python -m aprompt.daemon``."""
+    parser = argparse.ArgumentParser(
+        "python -m aprompt.daemon", description="Displays prompts for aprompt-client."
+    )
+    parser.add_argument("--socket", help="the path of the socket to listen on")
+    args = parser.parse_args(argv)
+    try:
+        daemon = Daemon(args.socket)
+    except (ValueError, OSError) as exc:
+        parser.error(str(exc))
+    with daemon:
+        try:
+            daemon.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
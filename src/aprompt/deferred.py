@@ -0,0 +1,63 @@
+"""
+Values that are not known yet when a prompt is created, such as a default
+read from a slow source. Prompts accept them for their ``default``,
+``placeholder`` or choices, start resolving them right away and fill them
+in when they are resolved. Until then a spinner is displayed and the
+prompt can already be used.
+
+Example:
+
+.. code-block:: python
+
+    import subprocess
+    from aprompt import prompt
+    from aprompt.prompts import text
+
+    def git_user() -> str:
+        return subprocess.run(
+            ["git", "config", "user.name"], capture_output=True, text=True
+        ).stdout.strip()
+
+    # both lookups run at the same time
+    name = text(default=git_user)
+    email = text(default=lambda: ...)
+
+    prompt("Name?", name)
+    prompt("E-mail?", email)
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from concurrent.futures import Future
+import inspect
+from typing import Any, TypeVar, Union
+
+from aprompt._utils import background_loop, run_in_background
+
+T = TypeVar("T")
+
+Deferred = Union[Callable[[], T], Future[T], Awaitable[T]]
+"""
+A value resolved in the background: a callable run in a thread, a
+:external+python:py:class:`concurrent.futures.Future` or an awaitable run
+on a background event loop.
+"""
+
+def is_deferred(value: Any) -> bool:
+    """Whether ``value`` is a :data:`Deferred` value."""
+    return callable(value) or isinstance(value, Future) or inspect.isawaitable(value)
+
+
+async def _wait(awaitable: Awaitable[T]) -> T:
+    return await awaitable
+
+
+def defer(value: Deferred[T]) -> Future[T]:
+    """Starts resolving a value and returns its future."""
+    if isinstance(value, Future):
+        return value
+    if inspect.isawaitable(value):
+        return asyncio.run_coroutine_threadsafe(_wait(value), background_loop())
+    return run_in_background(value)
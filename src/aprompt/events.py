@@ -0,0 +1,154 @@
+"""
+Following the user while a prompt is still running. Pass a callback as
+``on_event`` to :func:`aprompt.prompt` to receive an :class:`Event`
+whenever an option is hovered, selected or deselected or the entered
+text changes. This allows to start work for an option speculatively and
+to cancel it when the option is deselected.
+
+Example:
+
+.. code-block:: python
+
+    from concurrent.futures import ThreadPoolExecutor
+    from aprompt import prompt
+    from aprompt.events import Event
+    from aprompt.prompts import choice
+
+    pool = ThreadPoolExecutor()
+    downloads = {}
+
+    def on_event(event: Event) -> None:
+        if event.kind == "select":
+            downloads[event.value] = pool.submit(download, event.value)
+        elif event.kind == "deselect":
+            downloads.pop(event.value).cancel()
+
+    packages = prompt(
+        "Install?", choice("numpy", "scipy", multiple=True), on_event=on_event
+    )
+
+Events are derived from the widgets displayed, so they work with any
+prompt engine. The callback is called on the thread running the prompt;
+use :func:`to_queue` to receive events in an
+:external+python:py:mod:`asyncio` task instead.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable
+from typing import Any, Literal, Optional, TYPE_CHECKING
+
+from attrs import define, field
+
+from aprompt import widgets as w
+
+if TYPE_CHECKING:
+    import asyncio
+
+Kind = Literal["hover", "select", "deselect", "change"]
+
+
+@define(frozen=True)
+class Event:
+    """Something the user did while a prompt is running."""
+
+    kind: Kind
+    """
+    ``"hover"``
+        An option has been hovered.
+
+    ``"select"``, ``"deselect"``
+        An option has been selected or deselected.
+
+    ``"change"``
+        The entered text or number has changed.
+    """
+
+    value: Any
+    """The option or the entered text or number."""
+
+    index: Optional[int] = field(default=None, kw_only=True)
+    """The position of the option."""
+
+
+Callback = Callable[[Event], None]
+
+
+@define
+class _Snapshot:
+    hover: Optional[tuple[int, Any]] = None
+    selected: dict[Any, int] = field(factory=dict)
+    shown: set[Any] = field(factory=set)
+    value: Any = None
+
+
+def _snapshot(widgets: Iterable[Optional[w.Widget]]) -> _Snapshot:
+    snapshot = _Snapshot()
+    for widget in widgets:
+        if isinstance(widget, (w.Options, w.SortableOptions)):
+            for i, option in enumerate(widget.content):
+                snapshot.shown.add(option.content)
+                if option.hover:
+                    snapshot.hover = (i, option.content)
+                # a selected sortable option is only being moved
+                if option.select and isinstance(widget, w.Options):
+                    snapshot.selected[option.content] = i
+        elif isinstance(widget, (w.Text, w.Integer, w.Number)):
+            snapshot.value = widget.content
+    return snapshot
+
+
+class Tracker:
+    """
+    Compares the widgets of consecutive frames and calls ``callback`` with
+    the events that lead from one to the other.
+    """
+
+    def __init__(self, callback: Callback) -> None:
+        self.callback = callback
+        self._last = _Snapshot()
+
+    def update(self, widgets: Iterable[Optional[w.Widget]]) -> None:
+        """Reports the changes since the last frame."""
+        now = _snapshot(widgets)
+        last, self._last = self._last, now
+        for value, index in last.selected.items():
+            if value in now.selected:
+                continue
+            if value not in now.shown:
+                # scrolled out of view
+                now.selected[value] = index
+            else:
+                self.callback(Event("deselect", value, index=index))
+        for value, index in now.selected.items():
+            if value not in last.selected:
+                self.callback(Event("select", value, index=index))
+        if now.hover is not None and now.hover != last.hover:
+            self.callback(Event("hover", now.hover[1], index=now.hover[0]))
+        if now.value != last.value and now.value is not None:
+            self.callback(Event("change", now.value))
+
+
+def to_queue(queue: asyncio.Queue[Event]) -> Callback:
+    """
+    Returns a callback putting events into ``queue`` from any thread. This
+    must be called within the event loop of the queue.
+
+    .. code-block:: python
+
+        async def main() -> None:
+            events = asyncio.Queue()
+            task = asyncio.create_task(warm_up(events))
+            answer = await asyncio.to_thread(
+                prompt, "Which?", choice(...), on_event=to_queue(events)
+            )
+    """
+    # imported here as importing asyncio takes longer than aprompt
+    import asyncio
+
+    loop = asyncio.get_running_loop()
+
+    def put(event: Event) -> None:
+        loop.call_soon_threadsafe(queue.put_nowait, event)
+
+    return put
@@ -36,3 +36,56 @@ class PromptNeverFinishedError(Exception):
     """
 
     message: Optional[str] = None
+
+
+@define
+class MissingArgumentsError(Exception):
+    """
+    An exception raised when arguments would have to be prompted but no
+    interactive terminal is available.
+
+    .. seealso:: :meth:`aprompt.ext.argparse.Namespace.prompt`
+    """
+
+    message: Optional[str] = None
+    names: Optional[list[str]] = None
+    """The names of all arguments that have not been provided."""
+
+
+@define
+class PromptTimeoutError(Exception):
+    """
+    An exception raised when a prompt has not been answered in time.
+
+    .. seealso:: :func:`aprompt.prompt`, :class:`aprompt.broker.PromptBroker`
+    """
+
+    message: Optional[str] = None
+
+
+@define
+class MissingAnswerError(Exception):
+    """
+    An exception raised when answers are provided but there is no answer
+    for a prompt without a default.
+
+    .. seealso:: :mod:`aprompt.answers`
+    """
+
+    message: Optional[str] = None
+    name: Optional[str] = None
+    """The name of the prompt."""
+
+
+@define
+class InvalidAnswerError(Exception):
+    """
+    An exception raised when a provided answer is not a possible answer of
+    the prompt or does not pass the validation.
+
+    .. seealso:: :mod:`aprompt.answers`
+    """
+
+    message: Optional[str] = None
+    name: Optional[str] = None
+    """The name of the prompt."""
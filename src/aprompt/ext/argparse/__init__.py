@@ -24,15 +24,41 @@ Example:
 
     args = parser.parse_args(namespace=Namespace()).prompt()
     print(args)
+
+Arguments can also be prompted lazily, that is only when they are
+accessed for the first time. This is useful for subcommands that do not
+need every argument:
+
+.. code-block:: python
+
+    from aprompt.ext.argparse import LazyNamespace
+
+    args = parser.parse_args(namespace=LazyNamespace())
+    print(args.age)  # prompts now
+
+For non-interactive runs, missing arguments can be answered by their
+names instead (see :mod:`aprompt.answers`):
+
+.. code-block:: python
+
+    from aprompt import answers
+
+    args = parser.parse_args(
+        namespace=Namespace(answers=answers.load("answers.json"))
+    ).prompt()
 """
 
 from __future__ import annotations
 
 import argparse
+from collections.abc import Mapping
 from functools import partial
-from typing import Any
+import sys
+from typing import Any, Optional
 
 from aprompt import prompt
+from aprompt.answers import current
+from aprompt.exceptions import MissingArgumentsError
 
 
 # TODO: documentation of __init__ and the class object
@@ -59,13 +85,102 @@ class Namespace(argparse.Namespace):
 
     To invoke the prompts, call :meth:`prompt` on the object returned by
     :external+python:py:meth:`argparse.ArgumentParser.parse_args`.
+
+    Parameters
+    ----------
+    interactive
+        Whether prompting is possible. Defaults to whether the standard
+        input is a terminal. If this is ``False``, prompting raises
+        :class:`aprompt.exceptions.MissingArgumentsError` listing all
+        missing arguments instead of blocking.
+
+    answers
+        Answers to missing arguments by their names. Arguments are
+        answered from them without prompting, as are arguments of a
+        namespace created within :func:`aprompt.answers.provide`.
     """
 
+    __slots__ = ("_interactive", "_answers")
+
+    def __init__(
+        self,
+        *,
+        interactive: Optional[bool] = None,
+        answers: Optional[Mapping[str, Any]] = None,
+        **kwargs: Any,
+    ) -> None:
+        self._interactive = interactive
+        self._answers = answers if answers is not None else current()
+        super().__init__(**kwargs)
+
     def __setattr__(self, name: str, value: Any) -> None:
         return super().__setattr__(name, value)
 
-    def prompt(self) -> Namespace:
-        for name, value in self.__dict__.items():
-            if isinstance(value, PromptIfAbsent):
-                setattr(self, name, value())
+    def missing(self) -> list[str]:
+        """
+        Returns the names of all arguments that have not been provided in
+        the command-line and have not been prompted yet.
+        """
+        return [
+            name
+            for name, value in vars(self).items()
+            if isinstance(value, PromptIfAbsent)
+        ]
+
+    def prompt(self, *names: str) -> Namespace:
+        """
+        Prompts for all missing arguments one after another.
+
+        Parameters
+        ----------
+        names
+            Only prompt for these arguments. By default all missing
+            arguments are prompted.
+
+        Raises
+        ------
+        :class:`aprompt.exceptions.MissingArgumentsError`
+            Arguments to prompt for are missing but prompting is not
+            possible.
+        """
+        missing = [name for name in self.missing() if not names or name in names]
+        self._require_interactive(missing)
+        for name in missing:
+            setattr(self, name, self._ask(name, vars(self)[name]))
         return self
+
+    def _ask(self, name: str, prompt: PromptIfAbsent) -> Any:
+        if self._answers is not None:
+            return prompt(name=name, answers=self._answers)
+        return prompt()
+
+    def _require_interactive(self, missing: list[str]) -> None:
+        if self._answers is not None:
+            return
+        interactive = self._interactive
+        if interactive is None:
+            interactive = sys.stdin.isatty()
+        if missing and not interactive:
+            raise MissingArgumentsError(
+                f"missing arguments: {', '.join(missing)}", names=missing
+            )
+
+
+class LazyNamespace(Namespace):
+    """
+    A :class:`Namespace` that prompts for a missing argument when it is
+    accessed for the first time. The answer is cached afterwards.
+
+    :meth:`Namespace.prompt` may still be used to prompt for several
+    arguments at once.
+    """
+
+    __slots__ = ()
+
+    def __getattribute__(self, name: str) -> Any:
+        value = super().__getattribute__(name)
+        if isinstance(value, PromptIfAbsent):
+            self._require_interactive(self.missing())
+            value = self._ask(name, value)
+            setattr(self, name, value)
+        return value
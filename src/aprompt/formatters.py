@@ -8,19 +8,78 @@ from __future__ import annotations
 from collections.abc import Callable
 from functools import partial
 import os
-import textwrap
+import time
 from typing import Optional
 
 from aprompt import widgets as w
+from aprompt import _width
 
 Formatter = Callable[[os.terminal_size, list[Optional[w.Widget]]], list[str]]
 
+SPINNER = "|/-\\"
+"""The frames of :class:`aprompt.widgets.Spinner`, one per tenth of a second."""
+
+
+def _table(widget: w.Table, columns: int) -> tuple[str, list[str]]:
+    # returns the header and the rows of the columns fitting into the
+    # terminal, beginning at the scroll offset
+    columns -= 2  # hover indicator
+    shown: list[int] = []
+    used = 0
+    for i in range(widget.offset, len(widget.widths)):
+        if shown and used + widget.widths[i] > columns:
+            break
+        shown.append(i)
+        used += widget.widths[i] + 2
+    header = []
+    for i in shown:
+        name = widget.header[i]
+        if i == widget.sort:
+            name = f"{name} {'v' if widget.descending else '^'}"
+        header.append(name)
+
+    def line(cells: list[str]) -> str:
+        return "  ".join(
+            _width.ljust(cell, min(widget.widths[i], columns))
+            for cell, i in zip(cells, shown)
+        ).rstrip()
+
+    return line(header), [line([row[i] for i in shown]) for row in widget.content]
+
+
+def _preview(widget: w.Preview, columns: int) -> list[str]:
+    # the lines of a preview without escape sequences and control characters
+    if widget.content is None:
+        return ["..."]
+    lines = []
+    for line in widget.content.split("\n")[: widget.height]:
+        line = _width._ANSI.sub("", line).expandtabs(4)
+        line = "".join(c for c in line if c.isprintable())
+        lines.append(_width.truncate(line, columns))
+    return lines
+
+
+def _beside(left: list[str], right: list[str], columns: int) -> Optional[list[str]]:
+    # puts the lines of a preview beside other lines or returns `None` if
+    # the terminal is too narrow
+    left = "\n".join(left).split("\n")
+    size = max(map(_width.width, left), default=0)
+    if columns - size - 3 < 20:
+        return None
+    right = [_width.truncate(line, columns - size - 3) for line in right]
+    lines = []
+    for i in range(max(len(left), len(right))):
+        line = left[i] if i < len(left) else ""
+        line += " " * (size - _width.width(line))
+        lines.append((line + " | " + right[i] if i < len(right) else line).rstrip())
+    return lines
+
 
 def simple(
     tsize: os.terminal_size,
     widgets: list[Optional[w.Widget]],
 ) -> list[str]:
-    fill = partial(textwrap.fill, width=tsize.columns, replace_whitespace=False)
+    fill = partial(_width.fill, columns=tsize.columns)
 
     header: list[str] = []
     body: list[str] = []
@@ -43,6 +102,8 @@ def simple(
             for pair in widget.content.items():
                 lines.append("  " + ": ".join(pair))
             footer.append("NAVIGATION\n" + "\n".join(lines))
+        if isinstance(widget, w.Countdown):
+            footer.append(fill(f"({widget.content}s left)"))
 
         # other widgets
         if isinstance(widget, w.Text):
@@ -52,18 +113,50 @@ def simple(
                 body.append(
                     fill(("*" * len(widget.content)) if widget.hide else widget.content)
                 )
+        if isinstance(widget, w.Table):
+            names, rows = _table(widget, tsize.columns)
+            body.append("  " + names)
+            for i, row in enumerate(rows):
+                body.append(("> " if i == widget.hover else "  ") + row)
+        if isinstance(widget, w.Completion):
+            for i, completion in enumerate(widget.content):
+                body.append(
+                    fill(
+                        completion,
+                        initial_indent=("> " if i == widget.hover else "  ") + "  ",
+                    )
+                )
+        if isinstance(widget, w.Search):
+            body.append(
+                fill(
+                    f"search: {widget.content}" + ("" if widget.found else " (none)")
+                )
+            )
         if isinstance(widget, w.Confirm):
             body.append(fill(f"y/n [{'y' if widget.default else 'n'}]"))
-        if isinstance(widget, w.Integer):
-            body.append(fill(f"+/- {widget.content}"))
+        if isinstance(widget, (w.Integer, w.Number)):
+            body.append(
+                fill(
+                    f"+/- {widget.content}"
+                    if widget.edit is None
+                    else f"+/- {widget.edit}_"
+                )
+            )
         if isinstance(widget, w.Options):
+            tree = any(o.expand is not None for o in widget.content)
             for o in widget.content:
                 body.append(
                     fill(
                         o.content,
                         initial_indent=("x" if o.select else " ")
                         + (">" if o.hover else " ")
-                        + " ",
+                        + " "
+                        + "  " * o.depth
+                        + (
+                            {None: "  ", False: "+ ", True: "- "}[o.expand]
+                            if tree
+                            else ""
+                        ),
                     )
                 )
         if isinstance(widget, w.SortableOptions):
@@ -75,6 +168,26 @@ def simple(
                         + " ",
                     )
                 )
+        if isinstance(widget, w.Preview):
+            preview = _preview(widget, tsize.columns)
+            beside = _beside(body, preview, tsize.columns) if widget.side else None
+            if beside is not None:
+                body[:] = beside
+            else:
+                body.append("-" * min(tsize.columns, 40))
+                body.extend(preview)
+        if isinstance(widget, w.Spinner):
+            frame = SPINNER[int(time.monotonic() * 10) % len(SPINNER)]
+            body.append(fill(f"{frame} {widget.content}".rstrip()))
+        if isinstance(widget, w.Progress):
+            value = widget.content() if callable(widget.content) else widget.content
+            ratio = min(max(value / widget.total, 0), 1) if widget.total else 1
+            label = f"{widget.label} " if widget.label else ""
+            size = max(min(tsize.columns - _width.width(label) - 7, 40), 1)
+            done = round(ratio * size)
+            body.append(
+                f"{label}[{'#' * done}{'.' * (size - done)}] {round(ratio * 100):>3}%"
+            )
         if isinstance(widget, w.Code):
             body.append(
                 " ".join(
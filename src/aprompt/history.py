@@ -0,0 +1,204 @@
+"""
+Answers given to prompts, kept on disk between runs.
+
+A history is identified by a name, usually one per question. Answers are
+appended as JSON lines to a file in the user's data directory. The file
+is only read when the answers are needed, so creating a history does not
+slow down the first frame of a prompt.
+
+Example:
+
+.. code-block:: python
+
+    from aprompt import prompt
+    from aprompt.history import History
+    from aprompt.prompts import text
+
+    hosts = History("hosts")
+    host = prompt("Host?", text(history=hosts), history=hosts)
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from collections.abc import Iterator
+import json
+import mmap
+import os
+from pathlib import Path
+import threading
+from typing import Any, Optional
+from urllib.parse import quote
+
+from platformdirs import user_data_path
+
+from aprompt._utils import PrefixIndex
+
+
+class History:
+    """
+    Answers given to a prompt, most recent first. Duplicates are only
+    kept once, at the position of their most recent use.
+
+    The file is compacted once it holds twice as many lines as ``size``.
+
+    Parameters
+    ----------
+    name
+        The identity of the prompt.
+
+    directory
+        The directory to store the history in. Defaults to ``history`` in
+        the user's data directory.
+
+    size
+        The amount of answers to keep.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        directory: Optional[str | os.PathLike[str]] = None,
+        size: int = 1000,
+    ) -> None:
+        self.name = name
+        self.size = size
+        directory = (
+            Path(directory)
+            if directory is not None
+            else user_data_path("aprompt") / "history"
+        )
+        self.path = directory / f"{quote(name, safe='')}.jsonl"
+        self._lock = threading.RLock()
+        self._entries: Optional[OrderedDict[str, Any]] = None  # oldest first
+        self._lines: Optional[int] = None  # unknown until needed
+        self._index: Optional[PrefixIndex] = None
+        self._rank: dict[str, int] = {}  # text answer -> time of last use
+        self._clock = 0
+
+    def __iter__(self) -> Iterator[Any]:
+        return reversed(list(self._load().values()))
+
+    def __len__(self) -> int:
+        return len(self._load())
+
+    def append(self, value: Any) -> None:
+        """
+        Adds an answer. ``value`` must be serializable to JSON; other
+        values such as :external+python:py:class:`decimal.Decimal` are
+        stored as strings.
+        """
+        line = json.dumps(value, ensure_ascii=False, default=str)
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open("ab") as f:
+                f.write(line.encode() + b"\n")
+                end = f.tell()
+            if self._lines is not None:
+                self._lines += 1
+            elif end > 4 * self.size:
+                # lines take two bytes or more, so the lines of smaller
+                # files are not counted
+                with self.path.open("rb") as f:
+                    self._lines = f.read().count(b"\n")
+            if self._entries is not None:
+                self._add(self._entries, line, json.loads(line))
+            if self._lines is not None and self._lines > 2 * self.size:
+                if self._entries is None:
+                    self._load()  # compacts the file
+                else:
+                    self._compact(self._entries)
+
+    def last(self) -> Any:
+        """
+        Returns the most recent answer or ``None``. If the history has not
+        been loaded yet, only the end of the file is read.
+        """
+        with self._lock:
+            if self._entries is not None:
+                return next(reversed(self._entries.values()), None)
+        try:
+            with self.path.open("rb") as f, mmap.mmap(
+                f.fileno(), 0, access=mmap.ACCESS_READ
+            ) as m:
+                end = m.rfind(b"\n", 0, len(m) - 1) + 1
+                return json.loads(m[end:])
+        except (OSError, ValueError):  # missing, empty or torn
+            return None
+
+    def search(self, query: str) -> Iterator[str]:
+        """
+        Yields the text answers containing ``query``, most recent first.
+        """
+        for value in self:
+            if isinstance(value, str) and query in value:
+                yield value
+
+    def startswith(self, prefix: str) -> list[str]:
+        """
+        Returns the text answers starting with ``prefix``, most recent
+        first.
+        """
+        with self._lock:
+            self._load()
+            if self._index is None:
+                self._index = PrefixIndex(self._rank)
+            return sorted(
+                self._index.search(prefix), key=self._rank.__getitem__, reverse=True
+            )
+
+    def clear(self) -> None:
+        """Removes all answers."""
+        with self._lock:
+            self.path.unlink(missing_ok=True)
+            self._entries = OrderedDict()
+            self._lines = 0
+            self._index = None
+            self._rank = {}
+
+    def _load(self) -> OrderedDict[str, Any]:
+        with self._lock:
+            if self._entries is not None:
+                return self._entries
+            entries: OrderedDict[str, Any] = OrderedDict()
+            self._index = None  # built when first searched
+            self._rank = {}
+            self._lines = 0
+            try:
+                with self.path.open(encoding="utf-8") as f:
+                    for line in f:
+                        line = line.rstrip("\n")
+                        try:
+                            value = json.loads(line)
+                        except ValueError:
+                            continue  # torn by a concurrent write
+                        self._lines += 1
+                        self._add(entries, line, value)
+            except FileNotFoundError:
+                pass
+            self._entries = entries
+            if self._lines > 2 * self.size:
+                self._compact(entries)
+            return entries
+
+    def _add(self, entries: OrderedDict[str, Any], line: str, value: Any) -> None:
+        entries.pop(line, None)
+        entries[line] = value
+        if isinstance(value, str):
+            if self._index is not None:
+                self._index.add(value)
+            self._clock += 1
+            self._rank[value] = self._clock
+
+    def _compact(self, entries: OrderedDict[str, Any]) -> None:
+        while len(entries) > self.size:
+            entries.popitem(last=False)
+        tmp = self.path.with_suffix(".tmp")
+        with tmp.open("w", encoding="utf-8") as f:
+            f.writelines(line + "\n" for line in entries)
+        os.replace(tmp, self.path)
+        self._lines = len(entries)
+        kept = {v for v in entries.values() if isinstance(v, str)}
+        self._index = None
+        self._rank = {v: r for v, r in self._rank.items() if v in kept}
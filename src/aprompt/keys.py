@@ -0,0 +1,17 @@
+"""
+Pseudo keys sent to prompt engines by :func:`aprompt.prompt` in addition
+to the keys in :external:py:mod:`readchar.key`. They cannot be typed.
+"""
+
+TIMEOUT = "\x00timeout"
+"""
+Sent when the time to answer a prompt is up. Engines with a default value
+yield it as the result.
+"""
+
+REFRESH = "\x00refresh"
+"""
+Sent periodically while the engine displays a
+:class:`aprompt.widgets.Spinner` so it can pick up results of background
+work.
+"""
@@ -0,0 +1,151 @@
+"""
+Printing log records and other output while a prompt is displayed.
+Output written through this module while a prompt is displayed is
+collected and printed above the prompt in batches, at most ``fps`` times
+per second (see :func:`aprompt.prompt`). Otherwise it is written
+immediately.
+
+Example:
+
+.. code-block:: python
+
+    import logging
+    from aprompt.log import PromptHandler, capture_stdout
+
+    logging.basicConfig(handlers=[PromptHandler()], level=logging.INFO)
+
+    with capture_stdout():
+        ...  # prompts, logging and `print` from other threads
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+import io
+import logging
+import sys
+import threading
+from typing import Optional, TextIO
+
+
+class Outlet:
+    """
+    Collects output while a prompt is displayed. There is a single outlet
+    shared by all prompts: :data:`OUTLET`.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._chunks: list[str] = []
+        self._wake: Optional[Callable[[], None]] = None
+
+    def write(self, string: str, file: TextIO) -> None:
+        """
+        Writes a string to ``file`` or collects it if a prompt is
+        displayed.
+        """
+        with self._lock:
+            if self._wake is None:
+                file.write(string)
+                file.flush()
+                return
+            notify = not self._chunks
+            self._chunks.append(string)
+        if notify:
+            self._wake()
+
+    @property
+    def pending(self) -> bool:
+        """Whether there are complete lines to print."""
+        with self._lock:
+            return any("\n" in chunk for chunk in self._chunks)
+
+    def take(self) -> str:
+        """
+        Returns all complete lines collected so far. An incomplete last
+        line is kept until it is completed.
+        """
+        with self._lock:
+            text = "".join(self._chunks)
+            end = text.rfind("\n") + 1
+            self._chunks = [text[end:]] if text[end:] else []
+            return text[:end]
+
+    @contextmanager
+    def attach(self, wake: Callable[[], None], file: TextIO) -> Iterator[None]:
+        """
+        Collects output until the context is left. ``wake`` is called
+        (from any thread) when output is collected after the last
+        :meth:`take`. Remaining output is written to ``file`` at the end.
+        """
+        with self._lock:
+            previous = self._wake
+            self._wake = wake
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._wake = previous
+                rest = "".join(self._chunks)
+                self._chunks.clear()
+            if rest:
+                file.write(rest)
+                file.flush()
+
+
+OUTLET = Outlet()
+
+
+class PromptHandler(logging.StreamHandler):
+    """
+    A :external+python:py:class:`logging.StreamHandler` printing records
+    above a displayed prompt instead of corrupting it.
+    """
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            OUTLET.write(self.format(record) + self.terminator, self.stream)
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+
+class StdoutProxy(io.TextIOBase):
+    """
+    A file that prints text above a displayed prompt instead of
+    corrupting it. :func:`aprompt.prompt` writes to the wrapped file
+    directly if it is given a proxy.
+    """
+
+    def __init__(self, file: TextIO) -> None:
+        self.file = file
+
+    def write(self, string: str) -> int:
+        OUTLET.write(string, self.file)
+        return len(string)
+
+    def flush(self) -> None:
+        self.file.flush()
+
+    def fileno(self) -> int:
+        return self.file.fileno()
+
+    def isatty(self) -> bool:
+        return self.file.isatty()
+
+
+@contextmanager
+def capture_stdout() -> Iterator[StdoutProxy]:
+    """
+    Replaces ``sys.stdout`` with a :class:`StdoutProxy` until the context
+    is left.
+    """
+    original = sys.stdout
+    proxy = StdoutProxy(original)
+    sys.stdout = proxy
+    try:
+        yield proxy
+    finally:
+        sys.stdout = original
@@ -0,0 +1,1031 @@
+"""
+Prompt engines as state machines.
+
+A machine is an immutable state object. :meth:`Machine.step` takes a key
+and returns the next state together with the widgets to display or the
+:class:`aprompt.result.Result`. Since the state is plain data, a
+half-finished prompt can be saved with :func:`dumps` and continued with
+:func:`loads`, even in another process. :class:`Engine` runs a machine as
+an ordinary prompt engine; the built-in prompts in :mod:`aprompt.prompts`
+are machines run this way.
+
+Example:
+
+.. code-block:: python
+
+    from aprompt import prompt
+    from aprompt.machines import Engine, dumps, loads
+    from aprompt.prompts import choice
+
+    engine = choice("a", "b", "c", multiple=True)
+    next(engine)
+    engine.send(" ")
+    saved = dumps(engine.state)  # '{"machine":"choice","choices":["a","b","c"],...}'
+
+    result = prompt("Which?", Engine(loads(saved)))
+
+Some parameters such as callables cannot be saved. They are left out by
+:func:`dumps` and have to be passed to :func:`loads` again.
+
+Parameters still being resolved in the background (see
+:mod:`aprompt.deferred`) are passed as futures in ``deferred``. They are
+filled in by the first step after they are resolved; until then a spinner
+is displayed. Pending parameters are not saved.
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+from collections.abc import Callable, Generator, Iterable, Sequence
+from concurrent.futures import Future, wait
+from decimal import Decimal
+import json
+import time
+from types import TracebackType
+from typing import Any, ClassVar, Generic, Optional, TypeVar, Union
+
+import attrs
+from attrs import define, evolve, field
+from readchar import key as k
+
+from aprompt import keys, widgets as w
+from aprompt.completion import Completer
+from aprompt.history import History
+from aprompt.preview import Previewer
+from aprompt.result import Result
+from aprompt._utils import TypeAhead
+
+T = TypeVar("T")
+
+View = list[Optional[w.Widget]]
+
+_MACHINES: dict[str, type[Machine[Any]]] = {}
+
+
+def _transient(default: Any = None) -> Any:
+    # a parameter that is not saved by `dumps`
+    return field(
+        default=default, kw_only=True, eq=False, repr=False, metadata={"transient": True}
+    )
+
+
+def _tuple(value: Iterable[Any]) -> tuple[Any, ...]:
+    return tuple(value)
+
+
+def _optional_tuple(value: Optional[Iterable[Any]]) -> Optional[tuple[Any, ...]]:
+    return None if value is None else tuple(value)
+
+
+@define(frozen=True)
+class Machine(Generic[T]):
+    """
+    The state of a prompt. Subclasses define :meth:`view` and
+    :meth:`transition` and are registered under their ``name`` for
+    :func:`loads`.
+    """
+
+    name: ClassVar[str]
+
+    alert: bool = field(default=False, kw_only=True)
+    deferred: dict[str, Future[Any]] = field(
+        factory=dict, kw_only=True, eq=False, repr=False, metadata={"transient": True}
+    )
+    """Futures of parameters that are filled in once they are resolved."""
+
+    def __init_subclass__(cls) -> None:
+        super().__init_subclass__()
+        if "name" in cls.__dict__:
+            _MACHINES[cls.name] = cls
+
+    def view(self) -> View:
+        """Returns the widgets displaying the state."""
+        raise NotImplementedError
+
+    def transition(self, key: str) -> Machine[T] | Result[T]:
+        """Returns the next state or the result after ``key``."""
+        raise NotImplementedError
+
+    def display(self) -> View:
+        """
+        Returns :meth:`view` and a spinner while parameters are being
+        resolved.
+        """
+        view = self.view()
+        if self.deferred and not any(isinstance(x, w.Spinner) for x in view):
+            view.append(w.Spinner())
+        return view
+
+    def resolve(self, name: str, value: Any) -> dict[str, Any]:
+        """
+        Returns the changes to make once the deferred parameter ``name``
+        has been resolved to ``value``.
+        """
+        return {name: value}
+
+    def _resolved(self) -> Machine[T]:
+        done = {name: f for name, f in self.deferred.items() if f.done()}
+        if not done:
+            return self
+        changes: dict[str, Any] = {}
+        for name, future in done.items():
+            try:
+                value = future.result()
+            except BaseException:
+                # keep the value used in the meantime
+                continue
+            changes.update(self.resolve(name, value))
+        deferred = {n: f for n, f in self.deferred.items() if n not in done}
+        return evolve(self, deferred=deferred, **changes)
+
+    def settle(self, timeout: Optional[float] = None) -> Machine[T]:
+        """
+        Waits up to ``timeout`` seconds for the deferred parameters and
+        returns the state with them filled in.
+        """
+        if self.deferred:
+            wait(self.deferred.values(), timeout)
+        return self._resolved()
+
+    def answer(self, value: Any) -> Result[T]:
+        """
+        Returns the result of answering the prompt with ``value`` instead
+        of keys, e.g. with the text of an option.
+
+        Raises
+        ------
+        ``ValueError``
+            ``value`` is not a possible answer.
+        """
+        raise ValueError(f"{self.name} prompts cannot be answered with values")
+
+    def step(self, key: str) -> tuple[Machine[T], View | Result[T]]:
+        """
+        Returns the state after ``key`` and the widgets to display or the
+        result. The state is left unchanged when a result is returned so
+        the prompt can continue if the result is not valid.
+        """
+        state = evolve(self, alert=False) if self.alert else self
+        state = state._resolved()
+        if key == keys.REFRESH:
+            return state, state.display()
+        out = state.transition(key)
+        if isinstance(out, Result):
+            return state, out
+        return out, out.display()
+
+    def close(self) -> None:
+        """Releases resources held by transient parameters."""
+
+
+def dumps(state: Machine[Any]) -> str:
+    """
+    Serializes a state into compact JSON. Parameters with their default
+    value and transient parameters are left out.
+    """
+    data: dict[str, Any] = {"machine": state.name}
+    for a in attrs.fields(type(state)):
+        if a.metadata.get("transient"):
+            continue
+        value = getattr(state, a.name)
+        if a.default is not attrs.NOTHING and value == a.default:
+            continue
+        data[a.name] = value
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"), default=str)
+
+
+def loads(data: str | bytes, **transient: Any) -> Machine[Any]:
+    """
+    Restores a state serialized by :func:`dumps`. Transient parameters
+    such as callables have to be passed again as keyword arguments.
+    """
+    obj = json.loads(data)
+    cls = _MACHINES[obj.pop("machine")]
+    return cls(**obj, **transient)
+
+
+class Engine(Generator[Union[View, Result[T]], str, None]):
+    """
+    Runs a machine as a prompt engine for :func:`aprompt.prompt`. The
+    current state is available as :attr:`state` at any time, e.g. to save
+    it after every key.
+    """
+
+    def __init__(self, state: Machine[T]) -> None:
+        self.state = state
+        self._started = False
+        self._closed = False
+        self._result = False
+
+    def send(self, key: Optional[str]) -> View | Result[T]:
+        if self._closed:
+            raise StopIteration
+        if not self._started or self._result:
+            # started or resumed after an invalid result
+            self._started = True
+            self._result = False
+            return self.state.display()
+        if key is None:
+            raise TypeError("keys must be strings")
+        self.state, out = self.state.step(key)
+        self._result = isinstance(out, Result)
+        return out
+
+    def throw(  # type: ignore[override]
+        self,
+        typ: type[BaseException] | BaseException,
+        val: Optional[BaseException] = None,
+        tb: Optional[TracebackType] = None,
+    ) -> View | Result[T]:
+        self.close()
+        if isinstance(typ, BaseException):
+            raise typ
+        raise typ() if val is None else val
+
+    def close(self) -> None:
+        if not self._closed:
+            self._closed = True
+            self.state.close()
+
+
+_YES_NO = {"yes": True, "y": True, "true": True, "no": False, "n": False, "false": False}
+
+
+@define(frozen=True)
+class ConfirmState(Machine[bool]):
+    name = "confirm"
+
+    default: bool = True
+
+    @staticmethod
+    def _display(value: bool) -> str:
+        return "yes" if value else "no"
+
+    def view(self) -> View:
+        return [w.Alert() if self.alert else None, w.Confirm(default=self.default)]
+
+    def answer(self, value: Any) -> Result[bool]:
+        if isinstance(value, str):
+            value = _YES_NO.get(value.lower(), value)
+        if not isinstance(value, bool):
+            raise ValueError(f"expected yes or no, got {value!r}")
+        return Result(value, display=self._display(value))
+
+    def transition(self, key: str) -> Machine[bool] | Result[bool]:
+        match key:
+            case "y" | "Y":
+                return Result(True, display=self._display(True))
+            case "n" | "N":
+                return Result(False, display=self._display(False))
+            case k.ENTER | keys.TIMEOUT:
+                return Result(self.default, display=self._display(self.default))
+            case _:
+                return evolve(self, alert=True)
+
+
+@define(frozen=True)
+class TextState(Machine[str]):
+    name = "text"
+
+    hide: bool = False
+    default: str = ""
+    placeholder: Optional[str] = None
+    double_enter: bool = False
+    initial_hide: bool = False
+    result: str = ""
+    enter: bool = False
+    hover: int = 0
+    """The highlighted completion."""
+
+    recalled: Optional[tuple[str, ...]] = field(
+        default=None, converter=_optional_tuple
+    )
+    """Answers recalled with ``UP`` and ``DOWN``."""
+    recall: int = -1
+    typed: str = ""
+    """The text entered before answers were recalled."""
+
+    search: Optional[str] = None
+    skip: int = 0
+    """How many older answers matching ``search`` are skipped."""
+    found: bool = True
+
+    validate: Optional[Callable[[str], bool]] = _transient()
+    complete: Optional[Completer] = _transient()
+    history: Optional[History] = _transient()
+
+    def _completions(self) -> Optional[list[str]]:
+        if self.complete is None or not self.result:
+            return []
+        return self.complete.complete(self.result)
+
+    def _result(self, value: str) -> Result[str]:
+        return Result(value, display="*" * len(value) if self.initial_hide else value)
+
+    def answer(self, value: Any) -> Result[str]:
+        if isinstance(value, bool) or not isinstance(value, (str, int, float)):
+            raise ValueError(f"expected a text, got {value!r}")
+        value = str(value)
+        if self.validate is not None:
+            for char in value:
+                if not self.validate(char):
+                    raise ValueError(f"{char!r} is not allowed")
+        return self._result(value or self.default)
+
+    def view(self) -> View:
+        navigation = {}
+        if self.complete is not None:
+            navigation["TAB"] = "complete"
+        if self.history is not None:
+            navigation["\N{UPWARDS ARROW}/\N{DOWNWARDS ARROW}"] = "recall"
+            navigation["CTRL + R"] = "search"
+        if self.initial_hide:
+            navigation["CTRL + H"] = f"{'show' if self.hide else 'hide'} text"
+
+        completions = self._completions()
+        return [
+            w.Alert() if self.alert else None,
+            w.Text(self.result, placeholder=self.placeholder, hide=self.hide),
+            w.Search(self.search, found=self.found)
+            if self.search is not None
+            else None,
+            w.Completion(completions, hover=self.hover)
+            if completions and self.search is None
+            else None,
+            w.Spinner() if completions is None else None,
+            w.Navigation(navigation) if navigation else None,
+        ]
+
+    def _search(self, key: str) -> Optional[TextState]:
+        # handles a key while searching; `None` if the search is left
+        assert self.search is not None and self.history is not None
+        search, skip = self.search, self.skip
+        match key:
+            case k.ENTER | k.ESC | keys.TIMEOUT:
+                return None
+            case k.CTRL_R:
+                skip += 1
+            case k.BACKSPACE:
+                search = search[:-1]
+                skip = 0
+            case _ if len(key) == 1 and key.isprintable():
+                search += key
+                skip = 0
+            case _:
+                return evolve(self, alert=True)
+        answer = next(
+            (a for i, a in enumerate(self.history.search(search)) if i == skip), None
+        )
+        if answer is not None:
+            return evolve(self, search=search, skip=skip, found=True, result=answer)
+        if skip:
+            # no older answer matches; keep the current one
+            return evolve(self, search=search, skip=skip - 1, alert=True)
+        return evolve(self, search=search, skip=skip, found=False)
+
+    def transition(self, key: str) -> Machine[str] | Result[str]:
+        state = self
+        if self.search is not None and self.history is not None:
+            searched = self._search(key)
+            if searched is not None:
+                return searched
+            state = evolve(self, search=None)
+            if key != keys.TIMEOUT:
+                return state
+
+        if key not in (k.UP, k.DOWN) and state.recalled is not None:
+            state = evolve(state, recalled=None)
+
+        completions = state._completions()
+        match key:
+            case k.ENTER:
+                if state.double_enter and not state.enter:
+                    return evolve(state, enter=True)
+                return state._result(state.result or state.default)
+            case keys.TIMEOUT:
+                return state._result(state.default)
+            case k.TAB if state.complete is not None:
+                if completions:
+                    return evolve(state, result=completions[state.hover], hover=0)
+                return evolve(state, alert=True)
+            case k.BACKSPACE:
+                if state.result:
+                    return evolve(state, result=state.result[:-1], enter=False, hover=0)
+                return evolve(state, alert=True)
+            case k.CTRL_H:
+                if state.initial_hide:
+                    return evolve(state, hide=not state.hide)
+                return evolve(state, alert=True)
+            case k.CTRL_R if state.history is not None:
+                return evolve(state, search="", skip=0, found=True)
+            case k.UP | k.DOWN if completions:
+                step = 1 if key == k.DOWN else -1
+                return evolve(state, hover=(state.hover + step) % len(completions))
+            case k.UP | k.DOWN if state.history is not None:
+                if state.recalled is None:
+                    state = evolve(
+                        state,
+                        recalled=state.history.startswith(state.result),
+                        recall=-1,
+                        typed=state.result,
+                    )
+                assert state.recalled is not None
+                recall = state.recall + (1 if key == k.UP else -1)
+                if not -1 <= recall < len(state.recalled):
+                    return evolve(state, alert=True)
+                return evolve(
+                    state,
+                    recall=recall,
+                    result=state.typed if recall == -1 else state.recalled[recall],
+                    enter=False,
+                )
+            case k.UP | k.DOWN | k.PAGE_DOWN | k.PAGE_UP:
+                # TODO: add cursor support
+                return evolve(state, alert=True)
+            case _:
+                if state.validate is None or state.validate(key):
+                    return evolve(state, result=state.result + key, enter=False, hover=0)
+                return evolve(state, alert=True)
+
+    def close(self) -> None:
+        if self.complete is not None:
+            self.complete.close()
+
+
+def _number_type(name: str) -> type[Any]:
+    return {"int": int, "float": float, "Decimal": Decimal}[name]
+
+
+REPEAT = 0.15
+"""
+Seconds between presses of the same key for :class:`NumberState` to count
+them as a held down key.
+"""
+
+
+@define(frozen=True)
+class NumberState(Machine[Any]):
+    name = "number"
+
+    type: str = "int"
+    """``"int"``, ``"float"`` or ``"Decimal"``."""
+    result: Any = 0
+    default: Any = 0
+    minimum: Any = None
+    maximum: Any = None
+    increment: Any = 1
+    """The amount of a step."""
+    page: Any = 10
+    accelerate: bool = False
+    edit: Optional[str] = None
+    """The number being typed."""
+
+    held: Optional[str] = None
+    """The last key changing the number in steps."""
+    held_at: float = 0.0
+    repeats: int = 0
+
+    def __attrs_post_init__(self) -> None:
+        # numbers are restored from JSON as strings or floats
+        kind = _number_type(self.type)
+        for name in ("result", "default", "minimum", "maximum", "increment", "page"):
+            value = getattr(self, name)
+            if value is not None and not isinstance(value, kind):
+                object.__setattr__(self, name, kind(str(value)))
+
+    def _within(self, value: Any) -> bool:
+        return (self.minimum is None or value >= self.minimum) and (
+            self.maximum is None or value <= self.maximum
+        )
+
+    def resolve(self, name: str, value: Any) -> dict[str, Any]:
+        if name != "default":
+            return super().resolve(name, value)
+        try:
+            value = _number_type(self.type)(str(value))
+        except (ValueError, ArithmeticError):
+            return {}
+        if not self._within(value):
+            return {}
+        if self.result == self.default and self.edit is None:
+            # the number has not been changed yet
+            return {"default": value, "result": value}
+        return {"default": value}
+
+    def answer(self, value: Any) -> Result[Any]:
+        number = (
+            None
+            if isinstance(value, bool) or not isinstance(value, (str, int, float, Decimal))
+            else self._parse(str(value))
+        )
+        if number is None:
+            raise ValueError(f"expected a number, got {value!r}")
+        if not self._within(number):
+            raise ValueError(
+                f"{number} is not within {self.minimum} and {self.maximum}"
+            )
+        return Result(number)
+
+    def _parse(self, text: str) -> Any:
+        # `None` for incomplete numbers such as "-" or "."
+        try:
+            return _number_type(self.type)(text)
+        except (ValueError, ArithmeticError):
+            return None
+
+    def _editing(self) -> str:
+        # the number being typed; only negative numbers can be typed if no
+        # positive number is allowed
+        if self.edit is not None:
+            return self.edit
+        return "-" if self.maximum is not None and self.maximum < 0 else ""
+
+    def _too_far(self, value: Any) -> bool:
+        if self.minimum is not None and self.maximum is not None:
+            # the sign may still be toggled
+            return bool(abs(value) > max(abs(self.minimum), abs(self.maximum)))
+        return bool(
+            self.maximum is not None and value > self.maximum and value > 0
+            or self.minimum is not None and value < self.minimum and value < 0
+        )
+
+    def view(self) -> View:
+        return [
+            w.Alert() if self.alert else None,
+            (w.Integer if self.type == "int" else w.Number)(
+                self.result, edit=self.edit
+            ),
+            w.Navigation(
+                {
+                    "ENTER": "done",
+                    "0-9": "type",
+                    "+ OR \N{UPWARDS ARROW}": "increase",
+                    "- OR \N{DOWNWARDS ARROW}": "decrease",
+                }
+            ),
+        ]
+
+    def _change(self, key: str) -> Machine[Any]:
+        state = self
+        if state.edit is not None:
+            # finish typing before stepping
+            value = state._parse(state.edit)
+            if value is None or not state._within(value):
+                return evolve(state, alert=True)
+            state = evolve(state, result=value, edit=None)
+
+        now = time.time()
+        repeats = (
+            state.repeats + 1
+            if key == state.held and now - state.held_at < REPEAT
+            else 0
+        )
+
+        delta = state.page if key in (k.PAGE_UP, k.PAGE_DOWN) else state.increment
+        if state.accelerate:
+            delta *= 10 ** (repeats // 10)
+        if key in (k.DOWN, k.PAGE_DOWN, "-"):
+            delta = -delta
+        value = state.result + delta
+        if state.type == "float":
+            # prevent errors such as 0.1 + 0.2 = 0.30000000000000004
+            exponent = Decimal(str(state.increment)).as_tuple().exponent
+            value = round(value, -exponent if isinstance(exponent, int) else 0)
+        if state.minimum is not None and value < state.minimum:
+            value = state.minimum
+        if state.maximum is not None and value > state.maximum:
+            value = state.maximum
+        return evolve(
+            state,
+            result=value,
+            held=key,
+            held_at=now,
+            repeats=repeats,
+            alert=value == state.result,
+        )
+
+    def transition(self, key: str) -> Machine[Any] | Result[Any]:
+        if key in (k.UP, k.DOWN, k.PAGE_UP, k.PAGE_DOWN) or (
+            key in ("+", "-") and self.edit is None
+        ):
+            return self._change(key)
+        state = evolve(self, held=None) if self.held is not None else self
+
+        match key:
+            case k.ENTER:
+                if state.edit is None:
+                    return Result(state.result)
+                value = state._parse(state.edit)
+                if value is None or not state._within(value):
+                    return evolve(state, alert=True)
+                return Result(value)
+            case keys.TIMEOUT:
+                return Result(state.default)
+            case k.BACKSPACE if state.edit is not None:
+                return evolve(state, edit=state.edit[:-1] or None)
+            case "-":
+                assert state.edit is not None
+                edit = state.edit
+                if edit.startswith("-"):
+                    if state.maximum is not None and state.maximum < 0:
+                        return evolve(state, alert=True)
+                    return evolve(state, edit=edit[1:])
+                if state.minimum is not None and state.minimum >= 0:
+                    return evolve(state, alert=True)
+                return evolve(state, edit="-" + edit)
+            case "." if state.type != "int" and "." not in (state.edit or ""):
+                return evolve(state, edit=state._editing() + ".")
+            case _ if key.isdecimal() and len(key) == 1:
+                typed = state._editing() + key
+                value = state._parse(typed)
+                # more digits only move a number further away from zero
+                if value is not None and state._too_far(value):
+                    return evolve(state, alert=True)
+                return evolve(state, edit=typed)
+            case _:
+                return evolve(state, alert=True)
+
+
+TYPE_AHEAD = 1.0
+"""Seconds between letters typed to jump to an option to belong together."""
+
+
+@define(frozen=True)
+class _TypeAheadState(Machine[T]):
+    choices: tuple[str, ...] = field(default=(), converter=_tuple)
+    typed: str = ""
+    typed_at: float = 0.0
+    index: Optional[TypeAhead] = _transient()
+    preview: Optional[Previewer] = _transient()
+
+    def resolve(self, name: str, value: Any) -> dict[str, Any]:
+        if name == "choices":
+            return {"choices": tuple(value), "index": None}
+        return super().resolve(name, value)
+
+    def _preview(self, order: Sequence[int], hover: int) -> View:
+        # previews the option at `hover` in `order`
+        if self.preview is None or not order:
+            return []
+        prefetch = self.preview.prefetch
+        adjacent = [
+            self.choices[order[i]]
+            for d in range(1, prefetch + 1)
+            for i in (hover + d, hover - d)
+            if 0 <= i < len(order)
+        ]
+        text = self.preview.preview(self.choices[order[hover]], adjacent)
+        return [
+            w.Preview(text, side=self.preview.side, height=self.preview.height),
+            w.Spinner() if text is None else None,
+        ]
+
+    def close(self) -> None:
+        if self.preview is not None:
+            self.preview.close()
+
+    def _displayed(self) -> Iterable[str]:
+        # the options in the order they are displayed in
+        return self.choices
+
+    def _jump(self, char: str) -> tuple[Optional[int], dict[str, Any]]:
+        # returns the position of the displayed option the letters typed so
+        # far lead to and the changes to the state
+        now = time.time()
+        typed = (self.typed if now - self.typed_at <= TYPE_AHEAD else "") + char
+        index = self.index or TypeAhead(self._displayed())
+        return index.search(typed), {"typed": typed, "typed_at": now, "index": index}
+
+
+@define(frozen=True)
+class ChoiceState(_TypeAheadState[Any]):
+    name = "choice"
+
+    multiple: bool = False
+    hover: int = 0
+    selected: tuple[int, ...] = field(default=(), converter=_tuple)
+    require: Optional[Callable[[int], bool]] = _transient()
+    history: Optional[History] = _transient()
+
+    def resolve(self, name: str, value: Any) -> dict[str, Any]:
+        changes = super().resolve(name, value)
+        if name == "choices":
+            choices = changes["choices"]
+            changes.update(hover=0, selected=())
+            last = self.history.last() if self.history is not None else None
+            if self.multiple and isinstance(last, list):
+                changes["selected"] = [i for i, c in enumerate(choices) if c in last]
+            elif not self.multiple and last in choices:
+                changes["hover"] = choices.index(last)
+        return changes
+
+    def view(self) -> View:
+        selected = set(self.selected)
+        return [
+            w.Alert() if self.alert else None,
+            w.Options(
+                [
+                    w.Option(
+                        choice,
+                        hover=i == self.hover,
+                        select=i in selected if self.multiple else None,
+                    )
+                    for i, choice in enumerate(self.choices)
+                ]
+            ),
+            *self._preview(range(len(self.choices)), self.hover),
+        ]
+
+    def answer(self, value: Any) -> Result[Any]:
+        if not self.multiple:
+            if value not in self.choices:
+                raise ValueError(f"{value!r} is not an option")
+            return Result(value)
+        if isinstance(value, str):
+            value = [value]
+        if not isinstance(value, list) or not all(c in self.choices for c in value):
+            raise ValueError(f"{value!r} are not options")
+        result = [c for c in self.choices if c in value]
+        if self.require is not None and not self.require(len(result)):
+            raise ValueError(f"selecting {len(result)} options is not allowed")
+        return Result(result, display=", ".join(result))
+
+    def transition(self, key: str) -> Machine[Any] | Result[Any]:
+        if not self.choices:
+            # still being resolved
+            return evolve(self, alert=True)
+        match key:
+            case k.ENTER:
+                if not self.multiple:
+                    return Result(self.choices[self.hover])
+                selected = set(self.selected)
+                result = [c for i, c in enumerate(self.choices) if i in selected]
+                if self.require is None or self.require(len(result)):
+                    return Result(result, display=", ".join(result))
+                return evolve(self, alert=True)
+            case k.DOWN:
+                return evolve(self, hover=(self.hover + 1) % len(self.choices))
+            case k.UP:
+                return evolve(self, hover=(self.hover - 1) % len(self.choices))
+            case k.SPACE:
+                if not self.multiple:
+                    return evolve(self, alert=True)
+                return evolve(
+                    self,
+                    selected=sorted(set(self.selected) ^ {self.hover}),
+                )
+            case _ if len(key) == 1 and key.isprintable():
+                found, changes = self._jump(key)
+                if found is None:
+                    return evolve(self, alert=True, **changes)
+                return evolve(self, hover=found, **changes)
+            case _:
+                return evolve(self, alert=True)
+
+
+@define(frozen=True)
+class SortState(_TypeAheadState[list[str]]):
+    name = "sort"
+
+    order: tuple[int, ...] = field(default=(), converter=_tuple)
+    """The indices of the choices in their current order."""
+    hover: int = 0
+    grab: bool = False
+
+    def __attrs_post_init__(self) -> None:
+        if not self.order:
+            object.__setattr__(self, "order", tuple(range(len(self.choices))))
+
+    def resolve(self, name: str, value: Any) -> dict[str, Any]:
+        changes = super().resolve(name, value)
+        if name == "choices":
+            changes.update(order=range(len(changes["choices"])), hover=0, grab=False)
+        return changes
+
+    def view(self) -> View:
+        return [
+            w.Alert() if self.alert else None,
+            w.SortableOptions(
+                [
+                    w.Option(
+                        self.choices[choice],
+                        hover=i == self.hover,
+                        select=self.grab and i == self.hover,
+                    )
+                    for i, choice in enumerate(self.order)
+                ]
+            ),
+            *self._preview(self.order, self.hover),
+        ]
+
+    def answer(self, value: Any) -> Result[list[str]]:
+        if (
+            not isinstance(value, list)
+            or any(v not in self.choices for v in value)
+            or Counter(value) != Counter(self.choices)
+        ):
+            raise ValueError(f"{value!r} is not an order of the options")
+        return Result(value, display=", ".join(value))
+
+    def _displayed(self) -> Iterable[str]:
+        return (self.choices[i] for i in self.order)
+
+    def transition(self, key: str) -> Machine[list[str]] | Result[list[str]]:
+        if not self.order:
+            # still being resolved
+            return evolve(self, alert=True)
+        match key:
+            case k.ENTER:
+                result = [self.choices[i] for i in self.order]
+                return Result(result, display=", ".join(result))
+            case k.SPACE:
+                return evolve(self, grab=not self.grab)
+            case k.UP | k.DOWN:
+                other = (self.hover + (1 if key == k.DOWN else -1)) % len(self.order)
+                if not self.grab:
+                    return evolve(self, hover=other)
+                order = list(self.order)
+                order[self.hover], order[other] = order[other], order[self.hover]
+                return evolve(self, order=order, hover=other, index=None)
+            case _ if len(key) == 1 and key.isprintable() and not self.grab:
+                found, changes = self._jump(key)
+                if found is None:
+                    return evolve(self, alert=True, **changes)
+                return evolve(self, hover=found, **changes)
+            case _:
+                return evolve(self, alert=True)
+
+
+@define(frozen=True)
+class PinState(Machine[list[int]]):
+    name = "pin"
+
+    length: int = 4
+    require_enter: bool = False
+    result: tuple[int, ...] = field(default=(), converter=_tuple)
+
+    def view(self) -> View:
+        return [
+            w.Alert() if self.alert else None,
+            w.Code([*self.result, *[None] * (self.length - len(self.result))]),
+        ]
+
+    def _result(self, digits: tuple[int, ...]) -> Result[list[int]]:
+        return Result(list(digits), display="".join(map(str, digits)))
+
+    def answer(self, value: Any) -> Result[list[int]]:
+        if isinstance(value, int) and not isinstance(value, bool):
+            value = str(value).zfill(self.length)
+        if isinstance(value, str) and value.isdecimal():
+            value = [int(d) for d in value]
+        if (
+            not isinstance(value, list)
+            or len(value) != self.length
+            or not all(isinstance(d, int) and 0 <= d <= 9 for d in value)
+        ):
+            raise ValueError(f"expected {self.length} digits, got {value!r}")
+        return self._result(tuple(value))
+
+    def transition(self, key: str) -> Machine[list[int]] | Result[list[int]]:
+        if key == k.BACKSPACE:
+            if self.result:
+                return evolve(self, result=self.result[:-1])
+            return evolve(self, alert=True)
+        if key == k.ENTER and self.require_enter and len(self.result) == self.length:
+            return self._result(self.result)
+        try:
+            digit = int(key)
+        except ValueError:
+            return evolve(self, alert=True)
+        if len(self.result) == self.length:
+            return evolve(self, alert=True)
+        result = (*self.result, digit)
+        if not self.require_enter and len(result) == self.length:
+            return self._result(result)
+        return evolve(self, result=result)
+
+
+def _pairs(value: Iterable[Iterable[int]]) -> tuple[tuple[int, ...], ...]:
+    return tuple(tuple(v) for v in value)
+
+
+@define(frozen=True)
+class RankState(Machine[list[str]]):
+    name = "rank"
+
+    choices: tuple[str, ...] = field(default=(), converter=_tuple)
+    top: Optional[int] = None
+    known: tuple[tuple[int, ...], ...] = field(default=(), converter=_pairs)
+    """Chains of indices of choices, the better ones first."""
+    answers: tuple[tuple[int, ...], ...] = field(default=(), converter=_pairs)
+    """The questions answered so far as pairs of the better and worse index."""
+    hover: int = 0
+
+    def _compare(
+        self, a: int, b: int, answered: set[tuple[int, ...]]
+    ) -> Optional[bool]:
+        # whether `a` is better than `b` or `None` if that is not known yet
+        if (a, b) in answered:
+            return True
+        if (b, a) in answered:
+            return False
+        for chain in self.known:
+            if a in chain and b in chain:
+                return chain.index(a) < chain.index(b)
+        return None
+
+    def _rank(self) -> tuple[list[int], Optional[tuple[int, int]], int]:
+        """
+        Replays the answers with binary insertion. Returns the ranked
+        indices, the next question and an estimate of the amount of
+        questions left.
+        """
+        answered = set(self.answers)
+        limit = len(self.choices) if self.top is None else self.top
+        ranked: list[int] = []
+        for item in range(len(self.choices)):
+            low, high = 0, min(len(ranked), limit)
+            while low < high:
+                mid = (low + high) // 2
+                better = self._compare(item, ranked[mid], answered)
+                if better is None:
+                    # inserting into m items takes up to ceil(log2(m + 1))
+                    # questions
+                    left = (high - low).bit_length() + sum(
+                        min(size, limit).bit_length()
+                        for size in range(
+                            len(ranked) + 1, len(ranked) + len(self.choices) - item
+                        )
+                    )
+                    return ranked, (item, ranked[mid]), left
+                if better:
+                    high = mid
+                else:
+                    low = mid + 1
+            if low < limit:
+                ranked.insert(low, item)
+                del ranked[limit:]
+        return ranked, None, 0
+
+    def _result(self, ranked: list[int]) -> Result[list[str]]:
+        result = [self.choices[i] for i in ranked]
+        return Result(result, display=", ".join(result))
+
+    def answer(self, value: Any) -> Result[list[str]]:
+        size = len(self.choices) if self.top is None else min(self.top, len(self.choices))
+        if (
+            not isinstance(value, list)
+            or len(value) != size
+            or len(set(value)) != size
+            or not all(c in self.choices for c in value)
+        ):
+            raise ValueError(f"expected {size} distinct options, got {value!r}")
+        return Result(value, display=", ".join(value))
+
+    def view(self) -> View:
+        _, question, left = self._rank()
+        asked = len(self.answers)
+        return [
+            w.Alert() if self.alert else None,
+            w.Options(
+                [
+                    w.Option(self.choices[item], hover=i == self.hover)
+                    for i, item in enumerate(question or ())
+                ]
+            ),
+            w.Progress(
+                asked / (asked + left) if asked + left else 1.0,
+                label=f"{asked} answered",
+            ),
+            w.Navigation(
+                {
+                    "ENTER OR 1/2": "pick the better one",
+                    "BACKSPACE": "undo",
+                }
+            ),
+        ]
+
+    def transition(self, key: str) -> Machine[list[str]] | Result[list[str]]:
+        ranked, question, _ = self._rank()
+        if question is None:
+            if key in (k.ENTER, keys.TIMEOUT):
+                return self._result(ranked)
+            return evolve(self, alert=True)
+
+        match key:
+            case k.UP | k.DOWN | k.LEFT | k.RIGHT:
+                return evolve(self, hover=1 - self.hover)
+            case k.BACKSPACE:
+                if not self.answers:
+                    return evolve(self, alert=True)
+                return evolve(self, answers=self.answers[:-1], hover=0)
+            case k.ENTER | "1" | "2":
+                pick = self.hover if key == k.ENTER else int(key) - 1
+                better, worse = question if pick == 0 else question[::-1]
+                state = evolve(self, answers=(*self.answers, (better, worse)), hover=0)
+                ranked, question, _ = state._rank()
+                if question is None:
+                    return state._result(ranked)
+                return state
+            case _:
+                return evolve(self, alert=True)
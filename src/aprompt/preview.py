@@ -0,0 +1,110 @@
+"""
+Previews of the hovered option of :func:`aprompt.prompts.choice` and
+:func:`aprompt.prompts.sort`, like ``fzf --preview``.
+
+Providers are called in the background so slow previews do not block the
+prompt: calls are debounced while the user scrolls, cancelled once
+another option is hovered and cached. The options next to the hovered
+one are previewed in advance.
+
+Example:
+
+.. code-block:: python
+
+    from pathlib import Path
+    from aprompt import prompt
+    from aprompt.preview import Previewer
+    from aprompt.prompts import choice
+
+    def head(name: str) -> str:
+        with open(name) as f:
+            return "".join(f.readline() for _ in range(20))
+
+    files = sorted(str(p) for p in Path().glob("*.py"))
+    prompt("Open?", choice(*files, preview=head))
+    prompt("Open?", choice(*files, preview=Previewer(head, side=True)))
+"""
+
+from __future__ import annotations
+
+from collections.abc import Awaitable, Callable, Iterable
+from concurrent.futures import Future
+from typing import Any, Optional, Union
+
+from aprompt._utils import BackgroundCache
+
+Provider = Callable[[str], Union[str, Awaitable[str]]]
+"""
+A callable taking an option and returning its preview. Coroutine
+functions are run on a background event loop; other callables are run in
+a thread.
+"""
+
+
+def _text(option: str, future: Future[Any]) -> str:
+    try:
+        return str(future.result())
+    except Exception as exc:
+        return f"! {exc or type(exc).__name__}"
+
+
+class Previewer:
+    """
+    Renders previews of options.
+
+    Parameters
+    ----------
+    provider
+        A :data:`Provider`.
+
+    side
+        Displays the preview beside the options instead of below them if
+        the terminal is wide enough.
+
+    height
+        The maximum amount of lines of a preview.
+
+    debounce
+        Seconds an option must stay hovered before the provider is called.
+
+    cache_size
+        The amount of options whose previews are cached.
+
+    prefetch
+        The amount of options before and after the hovered one previewed
+        in advance.
+    """
+
+    def __init__(
+        self,
+        provider: Provider,
+        *,
+        side: bool = False,
+        height: int = 10,
+        debounce: float = 0.05,
+        cache_size: int = 128,
+        prefetch: int = 1,
+    ) -> None:
+        self.provider = provider
+        self.side = side
+        self.height = height
+        self.prefetch = prefetch
+        self._previews = BackgroundCache(
+            provider, _text, debounce=debounce, size=cache_size
+        )
+
+    def preview(self, option: str, adjacent: Iterable[str] = ()) -> Optional[str]:
+        """
+        Returns the preview of ``option`` or ``None`` while it is rendered.
+        This is meant to be called whenever another option is hovered and
+        periodically while the result is ``None``. ``adjacent`` are the
+        options to preview in advance.
+        """
+        text = self._previews.get(option)
+        if text is not None:
+            self._previews.prefetch(adjacent)
+        return text
+
+    def close(self) -> None:
+        """Cancels pending previews."""
+        self._previews.close()
@@ -9,18 +9,52 @@ While the prompts are documented to return something they internally
 
 from __future__ import annotations
 
-from collections.abc import Callable, Container
-from itertools import cycle, repeat
-from typing import Any, Literal, Optional, overload
-
+from array import array
+from collections.abc import Callable, Container, Iterable, Iterator, Mapping, Sequence
+from concurrent.futures import Future, ThreadPoolExecutor
+import heapq
+from decimal import Decimal
+from itertools import islice
+import os
+from pathlib import Path
+import time
+from typing import Any, Generic, Literal, Optional, TypeVar, cast, overload
+
+from attrs import evolve
 from readchar import key as k
 
-from aprompt import PromptEngine, widgets as w
+from aprompt import PromptEngine, keys, widgets as w, _scan, _width
+from aprompt.completion import Completer, Provider
+from aprompt.deferred import Deferred, defer, is_deferred
+from aprompt.history import History
+from aprompt.preview import Previewer, Provider as PreviewProvider
+from aprompt.machines import (
+    ChoiceState,
+    ConfirmState,
+    Engine,
+    NumberState,
+    PinState,
+    RankState,
+    SortState,
+    TextState,
+)
 from aprompt.result import Result
-from aprompt._utils import Cursor, swap
 
+T = TypeVar("T")
+
+
+def _defer(deferred: dict[str, Future[Any]], name: str, value: Any, fallback: Any) -> Any:
+    # starts resolving `value` if it is deferred and returns the value used
+    # in the meantime
+    if is_deferred(value):
+        deferred[name] = defer(value)
+        return fallback
+    return value
 
-def confirm(*, default: bool = True) -> PromptEngine[bool]:
+
+def confirm(
+    *, default: bool | Deferred[bool] = True, history: Optional[History] = None
+) -> PromptEngine[bool]:
     """Prompts for a boolean value.
 
     .. image:: media/prompt-confirm.gif
@@ -28,37 +62,31 @@ def confirm(*, default: bool = True) -> PromptEngine[bool]:
     Parameters
     ----------
     default
-        The default is used when neither yes or no are typed.
-    """
+        The default is used when neither yes or no are typed or the time
+        to answer is up. This may be :data:`aprompt.deferred.Deferred`;
+        ``True`` is used until it is resolved.
 
-    def as_str(value: bool) -> str:
-        if value:
-            return "yes"
-        return "no"
-
-    alert = False
-    while True:
-        key = yield [w.Alert() if alert else None, w.Confirm(default=default)]
-        alert = False
-
-        match key:
-            case "y" | "Y":
-                yield Result(True, display=as_str(True))
-            case "n" | "N":
-                yield Result(False, display=as_str(False))
-            case k.ENTER:
-                yield Result(default, display=as_str(default))
-            case _:
-                alert = True
+    history
+        Previous answers. The most recent one replaces ``default``.
+    """
+    deferred: dict[str, Future[Any]] = {}
+    initial: bool = _defer(deferred, "default", default, True)
+    last = history.last() if history is not None else None
+    if isinstance(last, bool):
+        initial = last
+        deferred.clear()
+    return Engine(ConfirmState(initial, deferred=deferred))
 
 
 def text(
     *,
     hide: bool = False,
-    default: str = "",
-    placeholder: Optional[str] = None,
+    default: str | Deferred[str] = "",
+    placeholder: Optional[str] | Deferred[Optional[str]] = None,
     validate: Optional[Callable[[str], bool]] = None,
     double_enter: bool = False,
+    complete: Iterable[str] | Provider | Completer | None = None,
+    history: Optional[History] = None,
 ) -> PromptEngine[str]:
     """Prompts a text input.
 
@@ -68,11 +96,18 @@ def text(
         Hides the entered text from the terminal.
 
     default
-        A string that is returned when no text has been entered.
+        A string that is returned when no text has been entered or the
+        time to answer is up.
 
     placeholder
         A string giving the user an idea of what is expected.
 
+    .. tip::
+
+        ``default`` and ``placeholder`` may be
+        :data:`aprompt.deferred.Deferred`. They are resolved in the
+        background while the prompt is already displayed.
+
     validate
         A callable taking the entered character as input and returning a
         boolean deciding whether to add it to the result. By default any
@@ -81,69 +116,98 @@ def text(
     double_enter
         Requires hitting the enter key twice to indicate that the text is
         done. This is useful for texts that contains newlines.
-    """
-    # TODO: key to hide/show text (only when hide is initially set to true)
 
-    validate = validate or (lambda _: True)
-    result = ""
-    enter = False
-    initial_hide = hide
-
-    alert = False
-    while True:
-        key = yield [
-            w.Alert() if alert else None,
-            w.Text(result, placeholder=placeholder, hide=hide),
-            w.Navigation({"CTRL + H": f"{'show' if hide else 'hide'} text"})
-            if initial_hide
-            else None,
-        ]
-        alert = False
-
-        match key:
-            case k.ENTER:
-                if double_enter:
-                    if enter:
-                        yield Result(
-                            result or default,
-                            display="*" * len(result) if initial_hide else result,
-                        )
-                    else:
-                        enter = True
-                else:
-                    yield Result(
-                        result or default,
-                        display="*" * len(result) if initial_hide else result,
-                    )
-            case k.BACKSPACE:
-                if result:
-                    result = result[:-1]
-                    enter = False
-                else:
-                    alert = True
-            case k.CTRL_H:
-                if initial_hide:
-                    hide = not hide
-                else:
-                    alert = True
-            case k.UP | k.DOWN | k.PAGE_DOWN | k.PAGE_UP:
-                # TODO: add cursor support
-                alert = True
-            case _:
-                if validate(key):
-                    result += key
-                    enter = False
-                else:
-                    alert = True
+    complete
+        Completions suggested for the entered text: a corpus of strings, a
+        :data:`aprompt.completion.Provider` or a
+        :class:`aprompt.completion.Completer`. :kbd:`TAB` inserts the
+        highlighted completion.
+
+    history
+        Previous answers to recall. :kbd:`UP` and :kbd:`DOWN` go through
+        the answers starting with the entered text, :kbd:`CTRL+R` searches
+        them. Pass the same history to :func:`aprompt.prompt` to record
+        the answer.
+    """
+    deferred: dict[str, Future[Any]] = {}
+    completer: Optional[Completer] = None
+    if complete is not None:
+        completer = complete if isinstance(complete, Completer) else Completer(complete)
+    return Engine(
+        TextState(
+            hide=hide,
+            default=_defer(deferred, "default", default, ""),
+            placeholder=_defer(deferred, "placeholder", placeholder, None),
+            double_enter=double_enter,
+            initial_hide=hide,
+            validate=validate,
+            complete=completer,
+            history=history,
+            deferred=deferred,
+        )
+    )
 
 
+@overload
 def number(
     *,
     minimum: Optional[int] = None,
     maximum: Optional[int] = None,
-    default: Optional[int] = None,
+    default: Optional[int] | Deferred[int] = None,
+    step: int = 1,
+    page: Optional[int] = None,
+    accelerate: bool = False,
+    type: type[int] = int,
+    history: Optional[History] = None,
 ) -> PromptEngine[int]:
-    """Prompts for an integer.
+    ...
+
+
+@overload
+def number(
+    *,
+    minimum: Optional[float] = None,
+    maximum: Optional[float] = None,
+    default: Optional[float] | Deferred[float] = None,
+    step: float = 1,
+    page: Optional[float] = None,
+    accelerate: bool = False,
+    type: type[float],
+    history: Optional[History] = None,
+) -> PromptEngine[float]:
+    ...
+
+
+@overload
+def number(
+    *,
+    minimum: Optional[Decimal] = None,
+    maximum: Optional[Decimal] = None,
+    default: Optional[Decimal] | Deferred[Decimal] = None,
+    step: Decimal = Decimal(1),
+    page: Optional[Decimal] = None,
+    accelerate: bool = False,
+    type: type[Decimal],
+    history: Optional[History] = None,
+) -> PromptEngine[Decimal]:
+    ...
+
+
+def number(
+    *,
+    minimum: Any = None,
+    maximum: Any = None,
+    default: Any = None,
+    step: Any = 1,
+    page: Any = None,
+    accelerate: bool = False,
+    type: type[int] | type[float] | type[Decimal] = int,
+    history: Optional[History] = None,
+) -> PromptEngine[int] | PromptEngine[float] | PromptEngine[Decimal]:
+    """Prompts for a number.
+
+    The number can be typed or changed in steps. While typing, :kbd:`-`
+    toggles the sign. Typed numbers are negative if ``maximum`` is.
 
     Parameters
     ----------
@@ -158,13 +222,39 @@ def number(
     default
         The number to begin from. Defaults to ``minimum`` if specified,
         otherwise ``0`` or ``maximum`` if ``maximmum`` is greater than or
-        equal to ``0``.
+        equal to ``0``. This is also the result when the time to answer is
+        up.
+
+        This may be :data:`aprompt.deferred.Deferred`. It replaces the
+        number once it is resolved unless the number has been changed or
+        the resolved value is not within ``minimum`` and ``maximum``.
+
+    step
+        The amount added or subtracted with :kbd:`UP` and :kbd:`DOWN`.
+
+    page
+        The amount added or subtracted with :kbd:`PAGE_UP` and
+        :kbd:`PAGE_DOWN`. Defaults to ten steps.
+
+    accelerate
+        Multiplies the step by ten for every ten presses of the same key
+        in a row, as when the key is held down.
+
+    type
+        ``int``, ``float`` or :external+python:py:class:`decimal.Decimal`.
+        Floats are rounded to the decimal places of ``step``.
+
+    history
+        Previous answers. The most recent one replaces ``default`` if it
+        is within ``minimum`` and ``maximum``.
     """
+    if minimum is not None and maximum is not None and minimum > maximum:
+        raise ValueError(
+            f"minimum ({minimum}) cannot be greater than maximum ({maximum})"
+        )
+    deferred: dict[str, Future[Any]] = {}
+    default = _defer(deferred, "default", default, None)
     if default is None:
-        if minimum is not None and maximum is not None and minimum > maximum:
-            raise ValueError(
-                f"minimum ({minimum}) cannot be greater than maximum ({maximum})"
-            )
         default = (
             minimum
             if minimum is not None
@@ -181,61 +271,77 @@ def number(
             raise ValueError(
                 f"default ({default}) cannot be greater than maximum ({maximum})"
             )
+    for name, value in [
+        ("minimum", minimum),
+        ("maximum", maximum),
+        ("default", default),
+        ("step", step),
+        ("page", page),
+    ]:
+        try:
+            if value is not None:
+                type(str(value))  # how the state converts numbers
+        except (ValueError, ArithmeticError):
+            hint = "; use type=float or type=Decimal" if type is int else ""
+            raise ValueError(
+                f"{name} ({value}) is not a valid {type.__name__}{hint}"
+            ) from None
+
+    state = NumberState(
+        type.__name__,
+        result=default,
+        default=default,
+        minimum=minimum,
+        maximum=maximum,
+        increment=step,
+        page=page if page is not None else type(step) * 10,
+        accelerate=accelerate,
+        deferred=deferred,
+    )
+
+    last = history.last() if history is not None else None
+    if isinstance(last, (int, float, str)) and not isinstance(last, bool):
+        try:
+            last = type(str(last))
+        except (ValueError, ArithmeticError):
+            pass
+        else:
+            if (minimum is None or last >= minimum) and (
+                maximum is None or last <= maximum
+            ):
+                state = evolve(state, result=last, default=last, deferred={})
 
-    result = default
-
-    alert = False
-    while True:
-        key = yield [
-            w.Alert() if alert else None,
-            w.Integer(result),
-            w.Navigation(
-                {
-                    "ENTER": "done",
-                    "+ OR \N{UPWARDS ARROW}": "increase",
-                    "- OR \N{DOWNWARDS ARROW}": "decrease",
-                }
-            ),
-        ]
-        alert = False
-
-        match key:
-            case k.ENTER:
-                yield Result(result)
-            case k.UP | "+":
-                result += 1
-                if maximum is not None and result > maximum:
-                    result -= 1
-                    alert = True
-            case k.DOWN | "-":
-                result -= 1
-                if minimum is not None and result < minimum:
-                    result += 1
-                    alert = True
-            case _:
-                alert = True
+    return Engine(state)
 
 
 @overload
 def choice(
-    *choices: str,
+    *choices: str | Deferred[Iterable[str]],
     multiple: Literal[True],
     require: Callable[[int], bool] | int | Container[int] | None = None,
+    history: Optional[History] = None,
+    preview: PreviewProvider | Previewer | None = None,
 ) -> PromptEngine[list[str]]:
     ...
 
 
 @overload
 def choice(
-    *choices: str, multiple: Literal[False] = False, require: None = None
+    *choices: str | Deferred[Iterable[str]],
+    multiple: Literal[False] = False,
+    require: None = None,
+    history: Optional[History] = None,
+    preview: PreviewProvider | Previewer | None = None,
 ) -> PromptEngine[str]:
     ...
 
 
 def choice(
-    *choices: str,
+    *choices: str | Deferred[Iterable[str]],
     multiple: bool = False,
     require: Callable[[int], bool] | int | Container[int] | None = None,
+    history: Optional[History] = None,
+    preview: PreviewProvider | Previewer | None = None,
 ) -> PromptEngine[list[str]] | PromptEngine[str]:
     """Prompts for options.
 
@@ -247,7 +353,9 @@ def choice(
     Parameters
     ----------
     choices
-        Options to choose from.
+        Options to choose from. Instead of the options, a single
+        :data:`aprompt.deferred.Deferred` resolving to them may be passed.
+        The prompt is displayed while they are being resolved.
 
     multiple
         Makes selecting multiple options possible.
@@ -283,108 +391,126 @@ def choice(
 
             prompt("¿Que?", choice(..., multiple=True, require=5))
 
+    history
+        Previous answers. The options of the most recent one are
+        initially hovered or, if ``multiple`` is ``True``, selected.
+
+    preview
+        Previews the hovered option in the background: a
+        :data:`aprompt.preview.Provider` or a
+        :class:`aprompt.preview.Previewer`.
+
     Returns
     -------
     A list of the options chosen if ``multiple`` is ``True``.
     The selected option if ``multiple`` is ``False``.
     """
-    options: list[w.Option] = [
-        w.Option(o, hover=not bool(i)) for i, o in enumerate(choices)
-    ]
-
+    require_fn: Callable[[int], bool]
     if require is None:
-        require = lambda _: True
+        require_fn = lambda _: True
     elif isinstance(require, int):
-        require = lambda n: n == require
+        require_fn = lambda n: n == require
     elif not callable(require):
         # Container
-        require = lambda n: n in require  # type: ignore
+        require_fn = lambda n: n in require
+    else:
+        require_fn = require
 
-    alert = False
-    while True:
-        key = yield [w.Alert() if alert else None, w.Options(options)]
-        alert = False
+    deferred: dict[str, Future[Any]] = {}
+    options: tuple[str, ...] = ()
+    if len(choices) == 1 and is_deferred(choices[0]):
+        deferred["choices"] = defer(cast(Deferred[Iterable[str]], choices[0]))
+    else:
+        options = cast(tuple[str, ...], choices)
+
+    hover = 0
+    selected: list[int] = []
+    last = history.last() if history is not None else None
+    if multiple and isinstance(last, list):
+        selected = [i for i, c in enumerate(options) if c in last]
+    elif not multiple and last in options:
+        hover = options.index(last)
+
+    return Engine(
+        ChoiceState(
+            options,
+            multiple=multiple,
+            hover=hover,
+            selected=selected,
+            require=require_fn,
+            history=history,
+            deferred=deferred,
+            preview=_previewer(preview),
+        )
+    )
 
-        match key:
-            case k.ENTER:
-                if multiple:
-                    result = [o.content for o in options if o.select]
-                    if require(len(result)):
-                        yield Result(result, display=", ".join(result))
-                    else:
-                        alert = True
-                else:
-                    for o in options:
-                        if o.hover:
-                            yield Result(o.content)
-                            break
-                    else:
-                        raise RuntimeError  # unreachable
-            case k.DOWN:
-                c = cycle(options)
-                for i in c:
-                    if i.hover:
-                        i.hover = False
-                        break
-                next(c).hover = True
-            case k.UP:
-                c = cycle(reversed(options))
-                for i in c:
-                    if i.hover:
-                        i.hover = False
-                        break
-                next(c).hover = True
-            case k.SPACE:
-                if multiple:
-                    for o in options:
-                        if o.hover:
-                            o.select = not o.select
-                else:
-                    alert = True
-            case _:
-                alert = True
 
+def _previewer(preview: PreviewProvider | Previewer | None) -> Optional[Previewer]:
+    if preview is None or isinstance(preview, Previewer):
+        return preview
+    return Previewer(preview)
 
-def sort(*choices: str) -> PromptEngine[list[str]]:
-    options: list[w.Option] = [
-        w.Option(o, hover=not bool(i)) for i, o in enumerate(choices)
-    ]
 
-    alert = False
-    while True:
-        key = yield [w.Alert() if alert else None, w.SortableOptions(options)]
-        alert = False
+def sort(
+    *choices: str | Deferred[Iterable[str]],
+    preview: PreviewProvider | Previewer | None = None,
+) -> PromptEngine[list[str]]:
+    """Prompts for sorting options.
 
-        match key:
-            case k.ENTER:
-                result = [o.content for o in options]
-                yield Result(result, display=", ".join(result))
-            case k.SPACE:
-                for o in options:
-                    if o.hover:
-                        o.select = not o.select
-            case k.UP:
-                cur = Cursor(options, [i for i, o in enumerate(options) if o.hover][0])
-                hovered, i = cur.item, cur.index
-                cur.prev()
-                other, j = cur.item, cur.index
-                if hovered.select:
-                    swap(options, i, j)
-                else:
-                    hovered.hover = False
-                    other.hover = True
-            case k.DOWN:
-                cur = Cursor(options, [i for i, o in enumerate(options) if o.hover][0])
-                hovered, i = cur.item, cur.index
-                cur.next()
-                other, j = cur.item, cur.index
-                if hovered.select:
-                    swap(options, i, j)
-                else:
-                    hovered.hover = False
-                    other.hover = True
-            case _:
-                alert = True
+    Parameters
+    ----------
+    choices
+        Options to sort. Instead of the options, a single
+        :data:`aprompt.deferred.Deferred` resolving to them may be passed.
+
+    preview
+        Previews the hovered option in the background (see
+        :func:`choice`).
+    """
+    deferred: dict[str, Future[Any]] = {}
+    options: tuple[str, ...] = ()
+    if len(choices) == 1 and is_deferred(choices[0]):
+        deferred["choices"] = defer(cast(Deferred[Iterable[str]], choices[0]))
+    else:
+        options = cast(tuple[str, ...], choices)
+    return Engine(
+        SortState(options, deferred=deferred, preview=_previewer(preview))
+    )
+
+
+def rank(
+    *choices: str,
+    top: Optional[int] = None,
+    known: Iterable[Sequence[str]] = (),
+) -> PromptEngine[list[str]]:
+    """Prompts for the order of options by asking which of two is better.
+
+    The options are ranked by binary insertion, so a full order takes
+    about ``log2(n!)`` questions instead of reordering them by hand as
+    with :func:`sort`. The progress shows an estimate of the questions
+    left; :kbd:`BACKSPACE` takes back the last answer.
+
+    Parameters
+    ----------
+    choices
+        Options to rank.
+
+    top
+        Only rank the best options, which takes fewer questions.
+
+    known
+        Options in an already known order, the better ones first, e.g. a
+        previous ranking. Questions answered by them are not asked.
+
+    Returns
+    -------
+    The options (or only the ``top`` ones), the best one first.
+    """
+    if top is not None and top < 1:
+        raise ValueError(f"top must be 1 or greater; got {top}")
+    index = {c: i for i, c in enumerate(choices)}
+    chains = [[index[c] for c in chain if c in index] for chain in known]
+    return Engine(RankState(choices, top=top, known=chains))
 
 
 def pin(length: int, *, require_enter: bool = False) -> PromptEngine[list[int]]:
@@ -403,32 +529,595 @@ def pin(length: int, *, require_enter: bool = False) -> PromptEngine[list[int]]:
     -------
     Each digit of the entered PIN code.
     """
-    result: list[int] = []
-
     if length < 1:
         raise ValueError(f"length must be 1 or greater; got {length}")
+    return Engine(PinState(length, require_enter=require_enter))
+
+
+def path(
+    start: Optional[str | os.PathLike[str]] = None,
+    *,
+    select: Literal["file", "directory", "any"] = "any",
+    hidden: bool = False,
+    height: int = 10,
+) -> PromptEngine[Path]:
+    """Prompts for a path by browsing directories.
+
+    Directories are listed in the background and the listings are cached
+    until the directory is modified, so large directories and slow mounts
+    do not block the prompt. Typing filters the entries of the current
+    directory.
+
+    Parameters
+    ----------
+    start
+        The directory to begin in. Defaults to the current working
+        directory.
+
+    select
+        Whether a file, a directory or either has to be selected. The
+        current directory is offered as ``.`` if directories can be
+        selected.
+
+    hidden
+        Lists entries starting with a dot.
+
+    height
+        The maximum amount of entries displayed at once.
+
+    Returns
+    -------
+    The absolute path of the selected entry.
+    """
+    scanner = _scan.scanner()
+    cwd = os.path.abspath(start if start is not None else os.curdir)
+    query = ""
+    hover = 0
+    offset = 0
+
+    # entries of `cwd` matching `query`; only filtered again if either changes
+    matched: list[tuple[str, bool]] = []
+    matched_for: tuple[Optional[_scan.Listing], str] = (None, "")
+    filtered: list[tuple[str, bool]] = []
 
     alert = False
     while True:
+        listing = scanner.get(cwd)
+        if listing is not None and (
+            matched_for[0] is not listing or matched_for[1] != query
+        ):
+            needle = query.casefold()
+            if matched_for[0] is listing and query.startswith(matched_for[1]):
+                # typing only narrows down the previous matches
+                candidates = matched
+            else:
+                candidates = [
+                    (name, is_dir)
+                    for name, is_dir in listing.entries
+                    if (hidden or not name.startswith("."))
+                    and (select != "directory" or is_dir)
+                ]
+            matched = [e for e in candidates if needle in e[0].casefold()]
+            matched_for = (listing, query)
+
+            filtered = matched
+            if not query:
+                filtered = [
+                    *([(os.curdir, True)] if select != "file" else []),
+                    *([(os.pardir, True)] if os.path.dirname(cwd) != cwd else []),
+                    *matched,
+                ]
+            hover = min(hover, max(len(filtered) - 1, 0))
+
+        if hover < offset:
+            offset = hover
+        elif hover >= offset + height:
+            offset = hover - height + 1
+
+        hovered = filtered[hover] if listing is not None and filtered else None
+        if hovered is not None and hovered[1] and hovered[0] != os.curdir:
+            # the user is likely to enter the hovered directory next
+            scanner.prefetch(os.path.normpath(os.path.join(cwd, hovered[0])))
+
         key = yield [
             w.Alert() if alert else None,
-            w.Code([*result, *repeat(None, length - len(result))]),
+            w.Text(os.path.join(cwd, query), placeholder=None, hide=False),
+            w.Spinner(f"listing {cwd}") if listing is None else None,
+            w.Error(listing.error) if listing is not None and listing.error else None,
+            w.Options(
+                [
+                    w.Option(
+                        name + os.sep
+                        if is_dir and name not in (os.curdir, os.pardir)
+                        else name,
+                        hover=offset + i == hover,
+                    )
+                    for i, (name, is_dir) in enumerate(
+                        filtered[offset : offset + height]
+                    )
+                ]
+            )
+            if listing is not None and filtered
+            else None,
+            w.Navigation(
+                {
+                    "ENTER": "select",
+                    "\N{RIGHTWARDS ARROW}": "open directory",
+                    "\N{LEFTWARDS ARROW}": "parent directory",
+                }
+            ),
         ]
         alert = False
 
-        if key == k.BACKSPACE:
-            if result:
-                result.pop()
-            else:
-                alert = True
-        elif key == k.ENTER and require_enter and len(result) == length:
-            yield Result(result, display="".join(map(str, result)))
-        else:
-            try:
-                num = int(key)
-            except ValueError:
+        match key:
+            case keys.REFRESH:
+                pass
+            case k.UP | k.DOWN | k.PAGE_UP | k.PAGE_DOWN if filtered:
+                step = {k.UP: -1, k.DOWN: 1, k.PAGE_UP: -height, k.PAGE_DOWN: height}
+                hover = min(max(hover + step[key], 0), len(filtered) - 1)
+            case k.ENTER | k.RIGHT | k.TAB if hovered is not None:
+                name, is_dir = hovered
+                target = os.path.normpath(os.path.join(cwd, name))
+                if key == k.ENTER and name != os.pardir and (
+                    not is_dir or select != "file"
+                ):
+                    yield Result(Path(target), display=target)
+                elif is_dir and name != os.curdir:
+                    cwd, query, hover, offset = target, "", 0, 0
+                else:
+                    alert = True
+            case k.LEFT:
+                parent = os.path.dirname(cwd)
+                if parent != cwd:
+                    query, hover, offset = "", 0, 0
+                    cwd = parent
+                else:
+                    alert = True
+            case k.BACKSPACE:
+                if query:
+                    query = query[:-1]
+                else:
+                    alert = True
+            case _ if len(key) == 1 and key.isprintable():
+                query += key
+                hover = 0
+            case _:
                 alert = True
-            else:
-                result.append(num)
-                if not require_enter and len(result) == length:
-                    yield Result(result, display="".join(map(str, result)))
+
+
+class _Node(Generic[T]):
+    __slots__ = ("value", "depth", "parent", "children", "loading", "error", "expand")
+
+    def __init__(self, value: T, depth: int, parent: Optional[_Node[T]]) -> None:
+        self.value = value
+        self.depth = depth
+        self.parent = parent
+        self.children: Optional[list[_Node[T]]] = None  # not fetched yet
+        self.loading: Optional[Future[list[T]]] = None
+        self.error: Optional[BaseException] = None
+        self.expand = False
+
+
+@overload
+def tree(
+    *roots: T,
+    children: Callable[[T], Iterable[T]],
+    label: Callable[[T], str] = str,
+    leaf: Optional[Callable[[T], bool]] = None,
+    multiple: Literal[True],
+    height: int = 10,
+    max_workers: int = 4,
+) -> PromptEngine[list[T]]:
+    ...
+
+
+@overload
+def tree(
+    *roots: T,
+    children: Callable[[T], Iterable[T]],
+    label: Callable[[T], str] = str,
+    leaf: Optional[Callable[[T], bool]] = None,
+    multiple: Literal[False] = False,
+    height: int = 10,
+    max_workers: int = 4,
+) -> PromptEngine[T]:
+    ...
+
+
+def tree(
+    *roots: T,
+    children: Callable[[T], Iterable[T]],
+    label: Callable[[T], str] = str,
+    leaf: Optional[Callable[[T], bool]] = None,
+    multiple: bool = False,
+    height: int = 10,
+    max_workers: int = 4,
+) -> PromptEngine[list[T]] | PromptEngine[T]:
+    """Prompts for nodes of a tree whose children are fetched on demand.
+
+    The children of a node are only fetched when it is expanded for the
+    first time. Fetches run concurrently in the background and their
+    results are kept until the prompt finishes.
+
+    Example
+    -------
+    .. code-block:: python
+
+        pod = prompt(
+            "Which pod?",
+            tree(*namespaces(), children=lambda node: node.children()),
+        )
+
+    Parameters
+    ----------
+    roots
+        The top level nodes.
+
+    children
+        A callable returning the children of a node. This is called in a
+        worker thread.
+
+    label
+        A callable returning the text displayed for a node.
+
+    leaf
+        A callable telling whether a node has no children without fetching
+        them. By default every node is assumed to have children until they
+        have been fetched.
+
+    multiple
+        Makes selecting multiple nodes possible, across all branches.
+
+    height
+        The maximum amount of rows displayed at once.
+
+    max_workers
+        The maximum amount of children fetched at the same time.
+
+    Returns
+    -------
+    The selected nodes in tree order if ``multiple`` is ``True``.
+    The hovered node if ``multiple`` is ``False``.
+    """
+    if not roots:
+        raise ValueError("at least one root is required")
+
+    pool = ThreadPoolExecutor(
+        max_workers=max_workers, thread_name_prefix="aprompt-tree"
+    )
+    top = [_Node(value, 0, None) for value in roots]
+    selected: set[_Node[T]] = set()
+    labels: dict[_Node[T], str] = {}
+
+    def is_leaf(node: _Node[T]) -> bool:
+        if node.children is not None:
+            return not node.children
+        return leaf is not None and leaf(node.value)
+
+    def text_of(node: _Node[T]) -> str:
+        if node not in labels:
+            labels[node] = label(node.value)
+        return labels[node]
+
+    def flatten(nodes: list[_Node[T]], collapsed: bool = False) -> Iterator[_Node[T]]:
+        for node in nodes:
+            yield node
+            if (node.expand or collapsed) and node.children:
+                yield from flatten(node.children, collapsed)
+
+    def expand(node: _Node[T]) -> None:
+        node.expand = True
+        node.error = None
+        if node.children is None and node.loading is None:
+            node.loading = pool.submit(lambda: list(children(node.value)))
+
+    rows = top  # visible rows; flattened again whenever the tree changes
+    hover = 0
+    offset = 0
+    loading: list[_Node[T]] = []
+
+    alert = False
+    try:
+        while True:
+            done = [n for n in loading if n.loading is not None and n.loading.done()]
+            for node in done:
+                assert node.loading is not None
+                try:
+                    node.children = [
+                        _Node(value, node.depth + 1, node)
+                        for value in node.loading.result()
+                    ]
+                except Exception as exc:
+                    node.error = exc
+                    node.expand = False
+                node.loading = None
+            if done:
+                # keep the hovered node in place while rows are inserted above
+                current = rows[hover]
+                rows = list(flatten(top))
+                hover = rows.index(current)
+            loading = [n for n in loading if n.loading is not None]
+
+            if hover < offset:
+                offset = hover
+            elif hover >= offset + height:
+                offset = hover - height + 1
+            hovered = rows[hover]
+
+            options = []
+            for i, node in enumerate(rows[offset : offset + height]):
+                options.append(
+                    w.Option(
+                        text_of(node),
+                        hover=offset + i == hover,
+                        select=node in selected,
+                        depth=node.depth,
+                        expand=None if is_leaf(node) else node.expand,
+                    )
+                )
+
+            key = yield [
+                w.Alert() if alert else None,
+                w.Options(options),
+                w.Spinner("loading") if loading else None,
+                w.Error(hovered.error) if hovered.error is not None else None,
+                w.Navigation(
+                    {
+                        "\N{RIGHTWARDS ARROW}": "expand",
+                        "\N{LEFTWARDS ARROW}": "collapse",
+                        **({"SPACE": "select"} if multiple else {}),
+                        "ENTER": "done",
+                    }
+                ),
+            ]
+            alert = False
+
+            match key:
+                case keys.REFRESH:
+                    pass
+                case k.ENTER:
+                    if multiple:
+                        result = [n for n in flatten(top, True) if n in selected]
+                        yield Result(
+                            [n.value for n in result],
+                            display=", ".join(map(text_of, result)),
+                        )
+                    else:
+                        yield Result(hovered.value, display=text_of(hovered))
+                case k.UP | k.DOWN | k.PAGE_UP | k.PAGE_DOWN:
+                    step = {k.UP: -1, k.DOWN: 1, k.PAGE_UP: -height, k.PAGE_DOWN: height}
+                    hover = min(max(hover + step[key], 0), len(rows) - 1)
+                case k.RIGHT:
+                    if is_leaf(hovered):
+                        alert = True
+                    elif hovered.expand and hovered.children:
+                        hover += 1  # first child
+                    elif hovered.loading is None:
+                        expand(hovered)
+                        loading.append(hovered)
+                        rows = list(flatten(top))
+                case k.LEFT:
+                    if hovered.expand:
+                        hovered.expand = False
+                        rows = list(flatten(top))
+                    elif hovered.parent is not None:
+                        hover = rows.index(hovered.parent)
+                    else:
+                        alert = True
+                case k.SPACE if multiple:
+                    selected ^= {hovered}
+                case _:
+                    alert = True
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+_SORT_CHUNK = 1 << 16
+"""
+Rows sorted at once by :func:`table`. Sorting holds the interpreter lock,
+so large tables are sorted in chunks that are merged afterwards to keep
+the prompt responsive.
+"""
+
+
+def _permutation(column: Sequence[Any]) -> tuple[array[int], array[int]]:
+    # returns the row indices in sorted order and the inverse, the sorted
+    # position of every row
+    n = len(column)
+
+    def merged(key: Callable[[int], Any]) -> array[int]:
+        chunks = [
+            sorted(range(i, min(i + _SORT_CHUNK, n)), key=key)
+            for i in range(0, n, _SORT_CHUNK)
+        ]
+        return array("q", heapq.merge(*chunks, key=key))
+
+    try:
+        order = merged(column.__getitem__)
+    except TypeError:  # values cannot be compared with each other
+        order = merged(lambda i: str(column[i]))
+    inverse = array("q", bytes(8 * n))
+    for position, row in enumerate(order):
+        inverse[row] = position
+    return order, inverse
+
+
+def table(
+    columns: Mapping[str, Sequence[Any]],
+    *,
+    height: int = 10,
+    sample: int = 1000,
+    max_width: int = 30,
+) -> PromptEngine[int]:
+    """Prompts for a row of a table.
+
+    Only the rows and columns that are displayed are formatted, so tables
+    with millions of rows can be passed as they are. Columns that do not
+    fit into the terminal can be scrolled to horizontally.
+
+    Example
+    -------
+    .. code-block:: python
+
+        row = prompt(
+            "Which host?",
+            table({
+                "host": ["db-1", "db-2", "web-1"],
+                "region": ["eu-west", "us-east", "eu-west"],
+                "load": [0.4, 0.9, 0.1],
+            }),
+        )
+
+    Parameters
+    ----------
+    columns
+        The values of each column by its name. All columns must have the
+        same length.
+
+    height
+        The maximum amount of rows displayed at once.
+
+    sample
+        The amount of rows the widths of the columns are initially
+        computed from. Columns grow when wider values are displayed.
+
+    max_width
+        The maximum width of a column. Longer values are truncated.
+
+    Returns
+    -------
+    The index of the selected row.
+    """
+    names = list(columns)
+    data = list(columns.values())
+    if not data:
+        raise ValueError("at least one column is required")
+    n = len(data[0])
+    if any(len(column) != n for column in data):
+        raise ValueError("all columns must have the same length")
+    if not n:
+        raise ValueError("at least one row is required")
+
+    widths = [
+        min(
+            max(
+                _width.width(name),
+                *(_width.width(str(value)) for value in islice(column, sample)),
+            ),
+            max_width,
+        )
+        for name, column in zip(names, data)
+    ]
+
+    pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="aprompt-table")
+    # sort permutations and their inverses by column
+    permutations: dict[int, tuple[array[int], array[int]]] = {}
+    sorting: Optional[tuple[int, bool, Future[tuple[array[int], array[int]]]]] = None
+    sort: Optional[int] = None
+    descending = False
+
+    def row_at(position: int) -> int:
+        if sort is None:
+            return position
+        order = permutations[sort][0]
+        return order[n - 1 - position] if descending else order[position]
+
+    def position_of(row: int) -> int:
+        if sort is None:
+            return row
+        position = permutations[sort][1][row]
+        return n - 1 - position if descending else position
+
+    hover = 0
+    offset = 0
+    column = 0
+
+    alert = False
+    try:
+        while True:
+            if sorting is not None and sorting[2].done():
+                row = row_at(hover)
+                sort, descending, future = sorting
+                permutations[sort] = future.result()
+                sorting = None
+                hover = position_of(row)
+
+            if hover < offset:
+                offset = hover
+            elif hover >= offset + height:
+                offset = hover - height + 1
+
+            rows = []
+            for position in range(offset, min(offset + height, n)):
+                cells = [str(c[row_at(position)]) for c in data]
+                for i, cell in enumerate(cells):
+                    if widths[i] < max_width:
+                        widths[i] = min(max(widths[i], _width.width(cell)), max_width)
+                rows.append(cells)
+
+            key = yield [
+                w.Alert() if alert else None,
+                w.Table(
+                    rows,
+                    header=names,
+                    widths=widths,
+                    hover=hover - offset,
+                    offset=column,
+                    sort=sort,
+                    descending=descending,
+                ),
+                w.Spinner(f"sorting by {names[sorting[0]]}")
+                if sorting is not None
+                else None,
+                w.Navigation(
+                    {
+                        "ENTER": "done",
+                        "\N{LEFTWARDS ARROW}/\N{RIGHTWARDS ARROW}": "scroll",
+                        "S": f"sort by {names[column]}",
+                    }
+                ),
+            ]
+            alert = False
+
+            match key:
+                case keys.REFRESH:
+                    pass
+                case k.ENTER:
+                    row = row_at(hover)
+                    yield Result(row, display=str(data[0][row]))
+                case k.UP | k.DOWN | k.PAGE_UP | k.PAGE_DOWN | k.HOME | k.END:
+                    step = {
+                        k.UP: -1,
+                        k.DOWN: 1,
+                        k.PAGE_UP: -height,
+                        k.PAGE_DOWN: height,
+                        k.HOME: -n,
+                        k.END: n,
+                    }
+                    hover = min(max(hover + step[key], 0), n - 1)
+                case k.LEFT if column > 0:
+                    column -= 1
+                case k.RIGHT if column < len(data) - 1:
+                    column += 1
+                case "s" | "S" if sorting is None:
+                    # ascending, descending, unsorted
+                    if sort != column:
+                        target: tuple[Optional[int], bool] = (column, False)
+                    elif not descending:
+                        target = (column, True)
+                    else:
+                        target = (None, False)
+                    if target[0] is None or target[0] in permutations:
+                        row = row_at(hover)
+                        sort, descending = target
+                        hover = position_of(row)
+                    else:
+                        sorting = (
+                            target[0],
+                            target[1],
+                            pool.submit(_permutation, data[target[0]]),
+                        )
+                case _:
+                    alert = True
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
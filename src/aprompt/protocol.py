@@ -0,0 +1,273 @@
+"""
+A JSON lines protocol to drive prompt engines from other processes, such
+as graphical front ends or tools written in other languages. No terminal
+is involved: keys are read as JSON objects, one per line, and widgets are
+written back the same way.
+
+Run ``python -m aprompt.protocol`` to serve the protocol on the standard
+streams. A single process may serve any amount of prompts, one after
+another.
+
+Messages received
+-----------------
+
+``{"type": "prompt", "prompt": "choice", "ask": "...", "args": [...], "kwargs": {...}}``
+    Starts a prompt using the engine of the same name in
+    :data:`PROMPTS`. ``args`` and ``kwargs`` are optional.
+
+``{"type": "key", "key": "\\n"}`` or ``{"type": "key", "name": "ENTER"}``
+    Sends a key to the current prompt. ``name`` is the name of a constant
+    in :external:py:mod:`readchar.key`.
+
+``{"type": "cancel"}``
+    Cancels the current prompt.
+
+Messages sent
+-------------
+
+``{"type": "frame", "widgets": [...]}``
+    The widgets to display. Each widget is an object with a ``"widget"``
+    field holding the class name of the widget and its attributes, or
+    ``null``.
+
+``{"type": "diff", "length": 3, "widgets": {"1": {...}}}``
+    Sent instead of a frame if diffs are enabled and a prompt is already
+    displayed. Only the widgets at the given indices changed; the list of
+    widgets is truncated or extended to ``length``.
+
+``{"type": "result", "value": ..., "display": "..."}``
+    The prompt has finished.
+
+``{"type": "cancelled"}``
+    The prompt has been cancelled.
+
+``{"type": "error", "message": "..."}``
+    A message could not be handled.
+
+Frames are only sent once all keys received so far have been handled and
+the output is flushed only before waiting for more input, so a burst of
+keys results in a single frame and a single write. While a spinner is
+displayed, the prompt is refreshed at most ``fps`` times per second and
+frames are sent if the widgets changed.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterator
+import json
+import selectors
+import sys
+from typing import Any, BinaryIO, Optional
+
+import attrs
+from readchar import key as k
+
+from aprompt import PromptEngine, keys, prompts, widgets as w
+from aprompt._session import Session
+
+PROMPTS: dict[str, Callable[..., PromptEngine[Any]]] = {
+    "confirm": prompts.confirm,
+    "text": prompts.text,
+    "number": prompts.number,
+    "choice": prompts.choice,
+    "sort": prompts.sort,
+    "rank": prompts.rank,
+    "pin": prompts.pin,
+    "path": prompts.path,
+    "table": prompts.table,
+}
+"""The prompts clients can start by name."""
+
+
+def serialize(widget: Optional[w.Widget]) -> Optional[dict[str, Any]]:
+    """
+    Converts a widget into a JSON serializable dictionary.
+    """
+    if widget is None:
+        return None
+    data = attrs.asdict(
+        widget,
+        value_serializer=lambda _, __, value: str(value)
+        if isinstance(value, BaseException)
+        else value,
+    )
+    return {"widget": type(widget).__name__, **data}
+
+
+def _dumps(data: dict[str, Any]) -> str:
+    return json.dumps(data, ensure_ascii=False, default=str) + "\n"
+
+
+class _Input:
+    """Reads lines and tells whether more input is available right now."""
+
+    def __init__(self, file: BinaryIO) -> None:
+        self.file = file
+        self._buffer = b""
+        self._selector: Optional[selectors.BaseSelector] = None
+        try:
+            fd = file.fileno()
+        except (AttributeError, OSError):
+            pass
+        else:
+            self._selector = selectors.DefaultSelector()
+            try:
+                self._selector.register(fd, selectors.EVENT_READ)
+            except PermissionError:  # regular files cannot be polled
+                self._selector.close()
+                self._selector = selectors.SelectSelector()
+                self._selector.register(fd, selectors.EVENT_READ)
+
+    def pending(self) -> bool:
+        if b"\n" in self._buffer:
+            return True
+        if self._selector is None:
+            return False
+        return bool(self._selector.select(0))
+
+    def wait(self, timeout: float) -> bool:
+        """Waits until input is available or ``timeout`` has passed."""
+        if b"\n" in self._buffer or self._selector is None:
+            return True
+        return bool(self._selector.select(timeout))
+
+    def __iter__(self) -> Iterator[bytes]:
+        read = getattr(self.file, "read1", self.file.read)
+        while True:
+            while b"\n" not in self._buffer:
+                data = read(65536)
+                if not data:
+                    if self._buffer:
+                        yield self._buffer
+                    return
+                self._buffer += data
+            line, self._buffer = self._buffer.split(b"\n", 1)
+            yield line
+
+
+def serve(
+    input: Optional[BinaryIO] = None,
+    output: Optional[BinaryIO] = None,
+    *,
+    diff: bool = False,
+    fps: float = 10,
+) -> None:
+    """
+    Serves prompts until ``input`` ends.
+
+    Parameters
+    ----------
+    input
+        Defaults to the standard input.
+
+    output
+        Defaults to the standard output.
+
+    diff
+        Send diffs instead of full frames while a prompt is displayed.
+
+    fps
+        How often a prompt displaying a spinner is refreshed per second.
+    """
+    lines = _Input(input or sys.stdin.buffer)
+    output = output or sys.stdout.buffer
+
+    session: Optional[Session[Any]] = None
+    shown: list[Optional[dict[str, Any]]] = []
+    dirty = False
+
+    def send(data: dict[str, Any]) -> None:
+        output.write(_dumps(data).encode())
+
+    def receive() -> Iterator[Optional[bytes]]:
+        # yields None whenever the prompt should be refreshed
+        received = iter(lines)
+        while True:
+            if (
+                session is not None
+                and any(isinstance(x, w.Spinner) for x in session.widgets)
+                and not lines.wait(1 / fps)
+            ):
+                yield None
+                continue
+            line = next(received, None)
+            if line is None:
+                return
+            yield line
+
+    for line in receive():
+        if line is not None and not line.strip():
+            continue
+        try:
+            message: dict[str, Any] = (
+                {"type": "key", "key": keys.REFRESH}
+                if line is None
+                else json.loads(line)
+            )
+            kind = message["type"]
+            if kind == "prompt":
+                if session is not None:
+                    session.close()
+                if message["prompt"] not in PROMPTS:
+                    raise ValueError(f"unknown prompt {message['prompt']!r}")
+                engine = PROMPTS[message["prompt"]]
+                session = Session(
+                    message.get("ask", ""),
+                    engine(*message.get("args", []), **message.get("kwargs", {})),
+                )
+                shown = []
+                dirty = True
+            elif session is None:
+                raise ValueError("no prompt has been started")
+            elif kind == "key":
+                key = (
+                    message["key"] if "key" in message else getattr(k, message["name"])
+                )
+                before = session.widgets
+                if session.send(key):
+                    assert session.result is not None
+                    send(
+                        {
+                            "type": "result",
+                            "value": session.result.value,
+                            "display": session.result.display,
+                        }
+                    )
+                    session = None
+                else:
+                    # refreshing often changes nothing
+                    dirty = dirty or key != keys.REFRESH or session.widgets != before
+            elif kind == "cancel":
+                session.close()
+                session = None
+                send({"type": "cancelled"})
+            else:
+                raise ValueError(f"unknown message type {kind!r}")
+        except Exception as exc:
+            send({"type": "error", "message": f"{type(exc).__name__}: {exc}"})
+
+        if lines.pending():
+            continue
+
+        if session is not None and dirty:
+            widgets = [serialize(widget) for widget in session.widgets]
+            if diff and shown:
+                changes = {
+                    str(i): widget
+                    for i, widget in enumerate(widgets)
+                    if i >= len(shown) or shown[i] != widget
+                }
+                send({"type": "diff", "length": len(widgets), "widgets": changes})
+            else:
+                send({"type": "frame", "widgets": widgets})
+            shown = widgets
+            dirty = False
+        output.flush()
+
+    if session is not None:
+        session.close()
+    output.flush()
+
+
+if __name__ == "__main__":
+    serve()
@@ -0,0 +1,283 @@
+"""
+Serving prompts to many clients at once. Each client gets a
+:class:`Connection` driving its prompts on a single
+:external+python:py:mod:`asyncio` event loop, so idle sessions only cost
+a suspended coroutine.
+
+Clients are expected to send raw key presses, for instance a terminal in
+raw mode connected with ``socat -,raw,echo=0 UNIX-CONNECT:prompt.sock``.
+
+Example:
+
+.. code-block:: python
+
+    import asyncio
+    from aprompt.prompts import confirm, text
+    from aprompt.server import Connection, start_unix_server
+
+    async def onboarding(conn: Connection) -> None:
+        name = await conn.prompt("What is your name?", text())
+        if await conn.prompt(f"Create account {name!r}?", confirm()):
+            ...
+
+    async def main() -> None:
+        server = await start_unix_server(onboarding, "prompt.sock")
+        async with server:
+            await server.serve_forever()
+
+    asyncio.run(main())
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from collections.abc import Awaitable, Callable
+import codecs
+from functools import partial
+import os
+from typing import Any, Optional, TypeVar
+
+from readchar import key as k
+
+from aprompt import PromptEngine, animated, formatters, keys, widgets as w
+from aprompt.events import Callback, Tracker
+from aprompt.exceptions import PromptExit
+from aprompt._session import Session
+from aprompt._utils import KeyDecoder, clear_lines
+from aprompt._width import rows
+
+T = TypeVar("T")
+
+Handler = Callable[["Connection"], Awaitable[None]]
+
+
+class Connection:
+    """
+    A client prompts are displayed to.
+
+    Parameters
+    ----------
+    reader, writer
+        The streams of the client.
+
+    size
+        The terminal size of the client. Defaults to 80 columns and 24
+        lines.
+
+    formatter
+        Defaults to :func:`aprompt.formatters.simple`.
+
+    newline
+        The line separator sent to the client. Sockets do not translate
+        newlines like terminals do, so a carriage return is included by
+        default.
+    """
+
+    def __init__(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+        *,
+        size: Optional[os.terminal_size] = None,
+        formatter: Optional[formatters.Formatter] = None,
+        newline: str = "\r\n",
+    ) -> None:
+        self.reader = reader
+        self.writer = writer
+        self.size = size or os.terminal_size((80, 24))
+        self.formatter = formatter or formatters.simple
+        self.newline = newline
+        self._decode = codecs.getincrementaldecoder("utf-8")(errors="replace").decode
+        self._decoder = KeyDecoder()
+        self._keys: deque[str] = deque()
+
+    async def readkey(self) -> str:
+        """
+        Waits for the next key sent by the client.
+
+        Raises
+        ------
+        ``ConnectionResetError``
+            The client disconnected.
+        """
+        while not self._keys:
+            data = await self.reader.read(4096)
+            if not data:
+                raise ConnectionResetError("client disconnected")
+            self._keys.extend(self._decoder.feed(self._decode(data)))
+        return self._keys.popleft()
+
+    async def write(self, string: str) -> None:
+        """
+        Writes a string to the client and waits until the client is able
+        to receive more data.
+        """
+        self.writer.write(string.replace("\n", self.newline).encode())
+        await self.writer.drain()
+
+    async def prompt(
+        self,
+        ask: str,
+        prompt_fn: PromptEngine[T],
+        *,
+        validate: None
+        | Callable[[T], bool]
+        | Callable[[T], BaseException | None] = None,
+        formatter: Optional[formatters.Formatter] = None,
+        cancelable: bool = False,
+        on_event: Optional[Callback] = None,
+        fps: float = 10,
+    ) -> T:
+        """
+        The asynchronous equivalent of :func:`aprompt.prompt` for this
+        client.
+
+        Frames are only sent when all keys received so far have been
+        handled, so a slow client or a burst of keys does not cause a frame
+        for each key. Spinners and progress bars are redrawn at most
+        ``fps`` times per second.
+
+        Raises
+        ------
+        ``ConnectionAbortedError``
+            The client hit :kbd:`CTRL+C`.
+
+        ``ConnectionResetError``
+            The client disconnected.
+
+        :class:`aprompt.exceptions.PromptExit`
+            The client hit :kbd:`CTRL+D`. This is only raised when
+            ``cancelable`` is set to ``True``.
+        """
+        fmt = partial(formatter or self.formatter, self.size)
+        session = Session(ask, prompt_fn, validate=validate)
+        tracker = Tracker(on_event) if on_event is not None else None
+        if tracker is not None:
+            tracker.update(session.widgets)
+
+        loop = asyncio.get_running_loop()
+        clear = 0
+        frame_at = 0.0
+        try:
+            while True:
+                if not self._keys:
+                    display = "\n".join(fmt(session.widgets))
+                    await self.write(clear_lines(clear) + display)
+                    clear = rows(display, self.size.columns)
+                    frame_at = loop.time()
+
+                if self._keys or not animated(session.widgets):
+                    key = await self.readkey()
+                else:
+                    # wake up for the next frame
+                    wait = max(frame_at + 1 / fps - loop.time(), 0)
+                    try:
+                        key = await asyncio.wait_for(self.readkey(), wait)
+                    except asyncio.TimeoutError:
+                        if not any(isinstance(x, w.Spinner) for x in session.widgets):
+                            continue
+                        # let the engine check on its background work
+                        key = keys.REFRESH
+                if key == k.CTRL_C:
+                    raise ConnectionAbortedError("client hit CTRL+C")
+                elif key == k.CTRL_D and cancelable:
+                    raise PromptExit
+
+                if session.send(key):
+                    display = "\n".join(fmt(session.widgets))
+                    await self.write(clear_lines(clear) + display + "\n")
+                    assert session.result is not None
+                    return session.result.value
+                if tracker is not None:
+                    tracker.update(session.widgets)
+        finally:
+            session.close()
+
+    async def close(self) -> None:
+        self.writer.close()
+        try:
+            await self.writer.wait_closed()
+        except ConnectionError:
+            pass
+
+
+def _client_connected(
+    handler: Handler, kwargs: dict[str, Any]
+) -> Callable[[asyncio.StreamReader, asyncio.StreamWriter], Awaitable[None]]:
+    async def callback(
+        reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        await _handle(handler, Connection(reader, writer, **kwargs))
+
+    return callback
+
+
+async def _handle(handler: Handler, conn: Connection) -> None:
+    try:
+        await handler(conn)
+    except (ConnectionError, PromptExit):
+        pass
+    finally:
+        await conn.close()
+
+
+async def start_server(
+    handler: Handler,
+    host: Optional[str] = None,
+    port: Optional[int] = None,
+    **kwargs: Any,
+) -> asyncio.Server:
+    """
+    Starts a TCP server calling ``handler`` with a :class:`Connection` for
+    each client. The connection is closed when the handler returns.
+
+    Keyword arguments are passed to :class:`Connection`.
+    """
+    return await asyncio.start_server(_client_connected(handler, kwargs), host, port)
+
+
+async def start_unix_server(
+    handler: Handler,
+    path: Optional[str] = None,
+    **kwargs: Any,
+) -> asyncio.Server:
+    """
+    The same as :func:`start_server` but for a Unix socket.
+    """
+    return await asyncio.start_unix_server(_client_connected(handler, kwargs), path)
+
+
+async def serve_fd(handler: Handler, fd: int, **kwargs: Any) -> None:
+    """
+    Runs ``handler`` for a local terminal, e.g. the master or slave side of
+    a pseudo-terminal. The terminal size is read from ``fd`` unless given.
+    The file descriptor is not closed.
+
+    Keyword arguments are passed to :class:`Connection`.
+    """
+    loop = asyncio.get_running_loop()
+
+    reader = asyncio.StreamReader()
+    read_transport, _ = await loop.connect_read_pipe(
+        lambda: asyncio.StreamReaderProtocol(reader),
+        os.fdopen(os.dup(fd), "rb", buffering=0),
+    )
+    transport, protocol = await loop.connect_write_pipe(
+        lambda: asyncio.StreamReaderProtocol(asyncio.StreamReader()),
+        os.fdopen(os.dup(fd), "wb", buffering=0),
+    )
+    writer = asyncio.StreamWriter(transport, protocol, reader, loop)
+
+    if "size" not in kwargs:
+        try:
+            size = os.get_terminal_size(fd)
+        except OSError:
+            pass
+        else:
+            if size.columns:  # pseudo-terminals may not have a size yet
+                kwargs["size"] = size
+    try:
+        await _handle(handler, Connection(reader, writer, **kwargs))
+    finally:
+        read_transport.close()
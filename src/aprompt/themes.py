@@ -0,0 +1,473 @@
+"""
+Themes describe the look of prompts declaratively: colours, indicators
+and prefixes. A theme is compiled into a
+:data:`aprompt.formatters.Formatter` once per terminal colour capability
+with all escape sequences built in advance.
+
+Example:
+
+.. code-block:: python
+
+    from aprompt import prompt
+    from aprompt.prompts import confirm
+    from aprompt.themes import Style, Theme
+
+    theme = Theme(
+        question=Style(fg="#ff8800", bold=True),
+        hover=Style(fg="cyan"),
+        question_prefix="\N{BLACK RIGHT-POINTING TRIANGLE} ",
+    )
+
+    prompt("Continue?", confirm(), formatter=theme.formatter())
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+import enum
+from functools import lru_cache, partial
+import os
+import sys
+import time
+from typing import Any, Optional, TextIO
+
+from attrs import define, field
+
+from aprompt import formatters, widgets as w
+from aprompt import _width
+
+Color = str | int | tuple[int, int, int]
+"""
+A colour name such as ``"red"`` or ``"bright_blue"``, a hexadecimal colour
+such as ``"#ff8800"``, an index of the 256 colour palette or an RGB tuple.
+"""
+
+NAMES = [
+    "black",
+    "red",
+    "green",
+    "yellow",
+    "blue",
+    "magenta",
+    "cyan",
+    "white",
+]
+
+# the usual RGB values of the 16 colour palette (xterm)
+_PALETTE = [
+    (0, 0, 0),
+    (205, 0, 0),
+    (0, 205, 0),
+    (205, 205, 0),
+    (0, 0, 238),
+    (205, 0, 205),
+    (0, 205, 205),
+    (229, 229, 229),
+    (127, 127, 127),
+    (255, 0, 0),
+    (0, 255, 0),
+    (255, 255, 0),
+    (92, 92, 255),
+    (255, 0, 255),
+    (0, 255, 255),
+    (255, 255, 255),
+]
+_CUBE = [0, 95, 135, 175, 215, 255]
+
+
+class ColorLevel(enum.IntEnum):
+    """The colours a terminal is able to display."""
+
+    NONE = 0
+    BASIC = 16
+    EXTENDED = 256
+    TRUECOLOR = 2**24
+
+
+def color_level(file: Optional[TextIO] = None) -> ColorLevel:
+    """
+    Guesses the colours supported by the terminal ``file`` (defaults to
+    the standard output) is connected to. The ``NO_COLOR`` environment
+    variable is respected.
+    """
+    file = file or sys.stdout
+    if "NO_COLOR" in os.environ or not file.isatty():
+        return ColorLevel.NONE
+    term = os.environ.get("TERM", "")
+    if term == "dumb":
+        return ColorLevel.NONE
+    if os.environ.get("COLORTERM") in ("truecolor", "24bit"):
+        return ColorLevel.TRUECOLOR
+    if "256" in term:
+        return ColorLevel.EXTENDED
+    return ColorLevel.BASIC
+
+
+def _rgb(color: Color) -> tuple[int, int, int]:
+    if isinstance(color, tuple):
+        return color
+    if isinstance(color, int):
+        if color < 16:
+            return _PALETTE[color]
+        if color < 232:
+            color -= 16
+            return _CUBE[color // 36], _CUBE[color // 6 % 6], _CUBE[color % 6]
+        gray = 8 + (color - 232) * 10
+        return gray, gray, gray
+    if color.startswith("#"):
+        return int(color[1:3], 16), int(color[3:5], 16), int(color[5:7], 16)
+    return _PALETTE[_index(color)]
+
+
+def _index(name: str) -> int:
+    bright = name.startswith("bright_")
+    try:
+        return NAMES.index(name.removeprefix("bright_")) + 8 * bright
+    except ValueError:
+        raise ValueError(f"unknown colour {name!r}") from None
+
+
+def _nearest(rgb: tuple[int, int, int], candidates: list[tuple[int, int, int]]) -> int:
+    return min(
+        range(len(candidates)),
+        key=lambda i: sum((a - b) ** 2 for a, b in zip(rgb, candidates[i])),
+    )
+
+
+def _color_code(color: Color, level: ColorLevel, background: bool) -> str:
+    base = 40 if background else 30
+    if isinstance(color, str) and not color.startswith("#"):
+        index = _index(color)
+    elif level is ColorLevel.TRUECOLOR and not isinstance(color, int):
+        r, g, b = _rgb(color)
+        return f"{base + 8};2;{r};{g};{b}"
+    elif level >= ColorLevel.EXTENDED:
+        if isinstance(color, int):
+            return f"{base + 8};5;{color}"
+        r, g, b = _rgb(color)
+        cube = 16 + 36 * _nearest((r, 0, 0), [(c, 0, 0) for c in _CUBE])
+        cube += 6 * _nearest((g, 0, 0), [(c, 0, 0) for c in _CUBE])
+        cube += _nearest((b, 0, 0), [(c, 0, 0) for c in _CUBE])
+        return f"{base + 8};5;{cube}"
+    else:
+        index = _nearest(_rgb(color), _PALETTE)
+    return str(base + index % 8 + (60 if index >= 8 else 0))
+
+
+@define(frozen=True)
+class Style:
+    """
+    The style of a piece of text.
+    """
+
+    fg: Optional[Color] = None
+    bg: Optional[Color] = None
+    bold: bool = False
+    dim: bool = False
+    italic: bool = False
+    underline: bool = False
+
+    def codes(self, level: ColorLevel) -> tuple[str, str]:
+        """
+        Returns the escape sequences to put before and after the styled
+        text.
+        """
+        if level is ColorLevel.NONE:
+            return "", ""
+        params = [
+            code
+            for code, enabled in [
+                ("1", self.bold),
+                ("2", self.dim),
+                ("3", self.italic),
+                ("4", self.underline),
+            ]
+            if enabled
+        ]
+        if self.fg is not None:
+            params.append(_color_code(self.fg, level, background=False))
+        if self.bg is not None:
+            params.append(_color_code(self.bg, level, background=True))
+        if not params:
+            return "", ""
+        return f"\x1b[{';'.join(params)}m", "\x1b[0m"
+
+
+@define(frozen=True)
+class Theme:
+    """
+    The look of prompts. Themes are immutable; use
+    :external:py:func:`attrs.evolve` to derive a theme from another one.
+
+    Without colours, the default theme looks like
+    :func:`aprompt.formatters.simple`.
+    """
+
+    question: Style = Style(bold=True)
+    answer: Style = Style(fg="green")
+    error: Style = Style(fg="red")
+    placeholder: Style = Style(dim=True)
+    hover: Style = Style(bold=True)
+    select: Style = Style(fg="cyan")
+    navigation: Style = Style(dim=True)
+    progress: Style = Style(fg="cyan")
+    table_header: Style = Style(underline=True)
+
+    question_prefix: str = "? "
+    answer_prefix: str = "> "
+    error_prefix: str = "! "
+    select_indicator: str = "x"
+    hover_indicator: str = ">"
+    grab_indicator: str = "|"
+    expand_indicator: str = "-"
+    collapse_indicator: str = "+"
+    spinner: str = formatters.SPINNER
+    progress_fill: str = "#"
+    progress_empty: str = "."
+    navigation_title: Optional[str] = "NAVIGATION"
+    navigation_separator: str = ": "
+
+    def formatter(self, file: Optional[TextIO] = None) -> formatters.Formatter:
+        """
+        Returns the formatter for the colour capability of ``file``
+        (defaults to the standard output).
+        """
+        return compile_theme(self, color_level(file))
+
+
+class _Frame:
+    def __init__(self, tsize: os.terminal_size) -> None:
+        self.tsize = tsize
+        self.fill = partial(_width.fill, columns=tsize.columns)
+        self.header: list[str] = []
+        self.body: list[str] = []
+        self.footer: list[str] = []
+
+
+_Renderer = Callable[[_Frame, Any], None]
+
+
+@lru_cache(maxsize=None)
+def compile_theme(theme: Theme, level: ColorLevel) -> formatters.Formatter:
+    """
+    Compiles a theme into a formatter. Formatters are cached for each
+    theme and colour capability.
+
+    Widgets unknown to themes are formatted by
+    :func:`aprompt.formatters.simple`.
+    """
+
+    def styler(style: Style) -> Callable[[str], str]:
+        start, end = style.codes(level)
+        if not start:
+            return lambda text: text
+        # style each line so that wrapped lines do not lose the style
+        return lambda text: "\n".join(start + line + end for line in text.split("\n"))
+
+    question = styler(theme.question)
+    answer = styler(theme.answer)
+    error = styler(theme.error)
+    placeholder = styler(theme.placeholder)
+    hover = styler(theme.hover)
+    select = styler(theme.select)
+    navigation = styler(theme.navigation)
+    progress = styler(theme.progress)
+    table_header = styler(theme.table_header)
+
+    indent = " " * max(
+        _width.width(theme.grab_indicator), _width.width(theme.hover_indicator)
+    )
+    blank_select = " " * _width.width(theme.select_indicator)
+    blank_hover = " " * _width.width(theme.hover_indicator)
+    blank_expand = " " * max(
+        _width.width(theme.expand_indicator), _width.width(theme.collapse_indicator)
+    )
+
+    def render_alert(frame: _Frame, widget: w.Alert) -> None:
+        frame.header.insert(0, "\a")
+
+    def render_question(frame: _Frame, widget: w.Question) -> None:
+        frame.header.insert(
+            0,
+            question(frame.fill(widget.content, initial_indent=theme.question_prefix)),
+        )
+
+    def render_answer(frame: _Frame, widget: w.Answer) -> None:
+        frame.header.append(
+            answer(
+                frame.fill(str(widget.content), initial_indent=theme.answer_prefix)
+                or theme.answer_prefix + "(none)"
+            )
+        )
+
+    def render_error(frame: _Frame, widget: w.Error) -> None:
+        frame.footer.append(
+            error(frame.fill(str(widget.content), initial_indent=theme.error_prefix))
+        )
+
+    def render_navigation(frame: _Frame, widget: w.Navigation) -> None:
+        lines = [
+            "  " + theme.navigation_separator.join(pair)
+            for pair in widget.content.items()
+        ]
+        if theme.navigation_title is not None:
+            lines.insert(0, theme.navigation_title)
+        frame.footer.append(navigation("\n".join(lines)))
+
+    def render_countdown(frame: _Frame, widget: w.Countdown) -> None:
+        frame.footer.append(navigation(frame.fill(f"({widget.content}s left)")))
+
+    def render_text(frame: _Frame, widget: w.Text) -> None:
+        if not widget.content and widget.placeholder is not None:
+            frame.body.append(placeholder(frame.fill(f"(e.g.: {widget.placeholder})")))
+        else:
+            frame.body.append(
+                frame.fill("*" * len(widget.content) if widget.hide else widget.content)
+            )
+
+    def render_table(frame: _Frame, widget: w.Table) -> None:
+        header, rows = formatters._table(widget, frame.tsize.columns)
+        frame.body.append(table_header(blank_hover + " " + header))
+        for i, row in enumerate(rows):
+            if i == widget.hover:
+                frame.body.append(hover(theme.hover_indicator + " " + row))
+            else:
+                frame.body.append(blank_hover + " " + row)
+
+    def render_completion(frame: _Frame, widget: w.Completion) -> None:
+        for i, completion in enumerate(widget.content):
+            if i == widget.hover:
+                line = frame.fill(
+                    completion, initial_indent=theme.hover_indicator + "   "
+                )
+                frame.body.append(hover(line))
+            else:
+                frame.body.append(
+                    frame.fill(completion, initial_indent=blank_hover + "   ")
+                )
+
+    def render_search(frame: _Frame, widget: w.Search) -> None:
+        line = frame.fill(f"search: {widget.content}")
+        if not widget.found:
+            line += placeholder(" (none)")
+        frame.body.append(line)
+
+    def render_confirm(frame: _Frame, widget: w.Confirm) -> None:
+        frame.body.append(frame.fill(f"y/n [{'y' if widget.default else 'n'}]"))
+
+    def render_number(frame: _Frame, widget: w.Integer | w.Number) -> None:
+        if widget.edit is None:
+            frame.body.append(frame.fill(f"+/- {widget.content}"))
+        else:
+            frame.body.append(frame.fill(f"+/- {widget.edit}") + placeholder("_"))
+
+    def render_options(frame: _Frame, widget: w.Options) -> None:
+        tree = any(o.expand is not None for o in widget.content)
+        for o in widget.content:
+            marker = ""
+            if tree:
+                marker = (
+                    blank_expand
+                    if o.expand is None
+                    else theme.expand_indicator
+                    if o.expand
+                    else theme.collapse_indicator
+                ) + " "
+            line = frame.fill(
+                o.content,
+                initial_indent=(theme.select_indicator if o.select else blank_select)
+                + (theme.hover_indicator if o.hover else blank_hover)
+                + " "
+                + "  " * o.depth
+                + marker,
+            )
+            if o.select:
+                line = select(line)
+            if o.hover:
+                line = hover(line)
+            frame.body.append(line)
+
+    def render_sortable_options(frame: _Frame, widget: w.SortableOptions) -> None:
+        for o in widget.content:
+            if o.select:
+                frame.body.append(
+                    select(
+                        frame.fill(o.content, initial_indent=theme.grab_indicator + " ")
+                    )
+                )
+            elif o.hover:
+                frame.body.append(
+                    hover(
+                        frame.fill(
+                            o.content, initial_indent=theme.hover_indicator + " "
+                        )
+                    )
+                )
+            else:
+                frame.body.append(frame.fill(o.content, initial_indent=indent + " "))
+
+    def render_preview(frame: _Frame, widget: w.Preview) -> None:
+        columns = frame.tsize.columns
+        preview = formatters._preview(widget, columns)
+        if widget.content is None:
+            preview = [placeholder(line) for line in preview]
+        beside = formatters._beside(frame.body, preview, columns) if widget.side else None
+        if beside is not None:
+            frame.body[:] = beside
+        else:
+            frame.body.append(navigation("-" * min(columns, 40)))
+            frame.body.extend(preview)
+
+    def render_spinner(frame: _Frame, widget: w.Spinner) -> None:
+        char = theme.spinner[int(time.monotonic() * 10) % len(theme.spinner)]
+        frame.body.append(frame.fill(f"{progress(char)} {widget.content}".rstrip()))
+
+    def render_progress(frame: _Frame, widget: w.Progress) -> None:
+        value = widget.content() if callable(widget.content) else widget.content
+        ratio = min(max(value / widget.total, 0), 1) if widget.total else 1
+        label = f"{widget.label} " if widget.label else ""
+        size = max(min(frame.tsize.columns - _width.width(label) - 7, 40), 1)
+        done = round(ratio * size)
+        bar = progress(theme.progress_fill * done) + theme.progress_empty * (
+            size - done
+        )
+        frame.body.append(f"{label}[{bar}] {round(ratio * 100):>3}%")
+
+    def render_code(frame: _Frame, widget: w.Code) -> None:
+        frame.body.append(
+            " ".join("_" if num is None else str(num) for num in widget.content)
+        )
+
+    renderers: dict[type, _Renderer] = {
+        w.Alert: render_alert,
+        w.Question: render_question,
+        w.Answer: render_answer,
+        w.Error: render_error,
+        w.Navigation: render_navigation,
+        w.Countdown: render_countdown,
+        w.Text: render_text,
+        w.Table: render_table,
+        w.Completion: render_completion,
+        w.Search: render_search,
+        w.Confirm: render_confirm,
+        w.Integer: render_number,
+        w.Number: render_number,
+        w.Options: render_options,
+        w.SortableOptions: render_sortable_options,
+        w.Preview: render_preview,
+        w.Spinner: render_spinner,
+        w.Progress: render_progress,
+        w.Code: render_code,
+    }
+
+    def render_unknown(frame: _Frame, widget: w.Widget) -> None:
+        frame.body.extend(formatters.simple(frame.tsize, [widget])[:-1])
+
+    def themed(tsize: os.terminal_size, widgets: list[Optional[w.Widget]]) -> list[str]:
+        frame = _Frame(tsize)
+        for widget in widgets:
+            if widget is not None:
+                renderers.get(type(widget), render_unknown)(frame, widget)
+        return [*frame.header, *frame.body, *frame.footer, ""]
+
+    return themed
@@ -1,4 +1,6 @@
 from abc import ABC
+from collections.abc import Callable
+from decimal import Decimal
 from typing import Any, Optional
 from attrs import define, field
 
@@ -47,9 +49,16 @@ class Text(Widget):
 
 @define
 class Option(Widget):
+    """
+    An option. Options in a tree have a ``depth`` and, unless they are
+    leaves, are either expanded or collapsed (``expand``).
+    """
+
     content: str
     select: Optional[bool] = field(kw_only=True, default=None)
     hover: Optional[bool] = field(kw_only=True, default=None)
+    depth: int = field(kw_only=True, default=0)
+    expand: Optional[bool] = field(kw_only=True, default=None)
 
 
 @define
@@ -62,6 +71,58 @@ class SortableOptions(Widget):
     content: list[Option]
 
 
+@define
+class Table(Widget):
+    """
+    Rows of a table. Only the rows to display are given, with one cell
+    per column; ``widths`` holds the width of every column. Columns
+    before ``offset`` are scrolled out of view.
+    """
+
+    content: list[list[str]]
+    header: list[str] = field(kw_only=True)
+    widths: list[int] = field(kw_only=True)
+    hover: Optional[int] = field(kw_only=True, default=None)
+    offset: int = field(kw_only=True, default=0)
+    sort: Optional[int] = field(kw_only=True, default=None)
+    descending: bool = field(kw_only=True, default=False)
+
+
+@define
+class Completion(Widget):
+    """
+    Completions for the entered text. ``hover`` is the index of the
+    highlighted completion.
+    """
+
+    content: list[str]
+    hover: int = field(kw_only=True, default=0)
+
+
+@define
+class Preview(Widget):
+    """
+    A preview of the hovered option, ``None`` while it is rendered. It is
+    displayed below the widgets before it or, if ``side`` is ``True``,
+    beside them. At most ``height`` lines are displayed.
+    """
+
+    content: Optional[str]
+    side: bool = field(kw_only=True, default=False)
+    height: int = field(kw_only=True, default=10)
+
+
+@define
+class Search(Widget):
+    """
+    A search through previous answers. ``found`` tells whether an answer
+    matches ``content``.
+    """
+
+    content: str
+    found: bool = field(kw_only=True, default=True)
+
+
 @define
 class Confirm(Widget):
     default: bool
@@ -69,9 +130,58 @@ class Confirm(Widget):
 
 @define
 class Integer(Widget):
+    """
+    An integer. ``edit`` is the number being typed, if any.
+    """
+
     content: int
+    edit: Optional[str] = field(kw_only=True, default=None)
+
+
+@define
+class Number(Widget):
+    """
+    A float or :external+python:py:class:`decimal.Decimal`. ``edit`` is
+    the number being typed, if any.
+    """
+
+    content: int | float | Decimal
+    edit: Optional[str] = field(kw_only=True, default=None)
 
 
 @define
 class Code(Widget):
     content: list[Optional[int]]
+
+
+@define
+class Spinner(Widget):
+    """
+    An animated indicator that something is in progress. While a spinner
+    is displayed, :func:`aprompt.prompt` redraws the prompt periodically.
+    """
+
+    content: str = ""
+
+
+@define
+class Progress(Widget):
+    """
+    A progress bar. ``content`` may be a callable returning the current
+    progress; it is called whenever the prompt is redrawn. While such a
+    progress bar is displayed, :func:`aprompt.prompt` redraws the prompt
+    periodically.
+    """
+
+    content: float | Callable[[], float]
+    total: float = field(kw_only=True, default=1.0)
+    label: str = field(kw_only=True, default="")
+
+
+@define
+class Countdown(Widget):
+    """
+    The seconds left to answer a prompt.
+    """
+
+    content: int
@@ -0,0 +1,150 @@
+"""
+A client asking :mod:`aprompt.daemon` to display a prompt on the terminal
+of the calling process. Only the standard library is imported so the
+client starts quickly; if no daemon is running the prompt is displayed by
+the client itself.
+
+.. code-block:: console
+
+    $ aprompt-client confirm "Continue?"
+    yes
+    $ aprompt-client choice "Which one?" red green blue
+    green
+    $ aprompt-client number "How many?" --minimum=1 --maximum=9
+    3
+
+Arguments and options are passed to the prompt. Their values are read as
+JSON if possible and as strings otherwise.
+
+The terminal is only handed to a daemon run by the same user. Without
+``APROMPT_SOCKET`` or ``XDG_RUNTIME_DIR`` no daemon is used, as a socket
+in a shared directory such as ``/tmp`` could be bound by anyone.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import socket
+import stat
+import struct
+import sys
+from typing import Any, Optional
+
+USAGE = 'usage: aprompt-client PROMPT QUESTION [ARGUMENT ...] [--OPTION[=VALUE] ...]'
+
+
+def socket_path() -> Optional[str]:
+    """
+    Returns the path of the socket the daemon listens on: ``APROMPT_SOCKET``
+    or a socket in the runtime directory of the user. Returns ``None``
+    if neither is set.
+    """
+    path = os.environ.get("APROMPT_SOCKET")
+    if path:
+        return path
+    directory = os.environ.get("XDG_RUNTIME_DIR")
+    if not directory:
+        return None
+    return os.path.join(directory, f"aprompt-{os.getuid()}.sock")
+
+
+def is_private(sock: socket.socket, path: str) -> bool:
+    """
+    Returns whether the process at the other end of a connected socket
+    runs as the current user. Where the credentials of the peer are not
+    available, the socket and its directory have to belong to the user and
+    the directory must not be writable by others.
+    """
+    peercred = getattr(socket, "SO_PEERCRED", None)
+    if peercred is not None:
+        creds = sock.getsockopt(socket.SOL_SOCKET, peercred, struct.calcsize("3i"))
+        _, uid, _ = struct.unpack("3i", creds)
+        return bool(uid == os.getuid())
+    try:
+        info = os.stat(path)
+        parent = os.stat(os.path.dirname(os.path.abspath(path)))
+    except OSError:
+        return False
+    return (
+        stat.S_ISSOCK(info.st_mode)
+        and info.st_uid == parent.st_uid == os.getuid()
+        and not parent.st_mode & (stat.S_IWGRP | stat.S_IWOTH)
+    )
+
+
+def _terminal() -> tuple[int, int, Optional[int]]:
+    # the file descriptors to read keys from and draw to and the one to
+    # close afterwards
+    try:
+        fd = os.open("/dev/tty", os.O_RDWR | os.O_NOCTTY)
+    except OSError:
+        # no controlling terminal; standard output is left for the answer
+        return 0, 2, None
+    return fd, fd, fd
+
+
+def request(argv: list[str]) -> dict[str, Any]:
+    """
+    Displays a prompt on the terminal and returns the response of the
+    daemon.
+    """
+    keys, frames, opened = _terminal()
+    path = socket_path()
+    try:
+        try:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            if path is None:
+                raise FileNotFoundError("no socket")
+            sock.connect(path)
+        except OSError:
+            sock.close()
+            from aprompt.daemon import respond
+
+            with open(keys, "r", closefd=False) as stdin, open(
+                frames, "w", closefd=False
+            ) as file:
+                return respond(argv, stdin, file)
+
+        with sock:
+            if not is_private(sock, path):
+                return {
+                    "error": f"{path} does not belong to a daemon of this user",
+                    "status": 1,
+                }
+            message = json.dumps({"argv": argv, "cwd": os.getcwd()}).encode()
+            socket.send_fds(sock, [message], [keys, frames])
+            chunks = []
+            while chunk := sock.recv(65536):
+                chunks.append(chunk)
+        response: dict[str, Any] = json.loads(b"".join(chunks) or b"{}")
+        return response or {"error": "the daemon has closed the connection", "status": 1}
+    finally:
+        if opened is not None:
+            os.close(opened)
+
+
+def _format(answer: Any) -> str:
+    if isinstance(answer, bool):
+        return "yes" if answer else "no"
+    if isinstance(answer, list):
+        return "\n".join(map(_format, answer))
+    return str(answer)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """The entry point of ``aprompt-client``. Returns the exit status."""
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) < 2 or argv[0] in ("-h", "--help"):
+        print(USAGE, file=sys.stderr)
+        return 2
+    response = request(argv)
+    if "error" in response:
+        print(f"aprompt-client: {response['error']}", file=sys.stderr)
+        return int(response.get("status", 1))
+    print(_format(response["answer"]))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
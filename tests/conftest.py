@@ -0,0 +1,18 @@
+from collections.abc import Callable, Iterator
+import time
+
+import pytest
+
+from aprompt.keys import REFRESH
+
+@pytest.fixture
+def keys() -> Callable[..., Iterator[str]]:
+    """Presses keys, refreshing the prompt before every key."""
+    def press(*pressed: str, refreshes: int = 5) -> Iterator[str]:
+        # give background work some time before every key
+        for key in pressed:
+            for _ in range(refreshes):
+                time.sleep(0.01)
+                yield REFRESH
+            yield key
+    return press
@@ -0,0 +1,65 @@
+from argparse import ArgumentParser
+from decimal import Decimal
+import json
+from pathlib import Path
+
+import pytest
+
+from aprompt import answers, prompt
+from aprompt.exceptions import InvalidAnswerError, MissingAnswerError
+from aprompt.ext.argparse import Namespace, PromptIfAbsent
+from aprompt.prompts import choice, confirm, number, pin, sort, text
+
+def test_values() -> None:
+    given = {
+        "ok": "no",
+        "name": "Alice",
+        "age": "42",
+        "price": 1.5,
+        "color": "green",
+        "colors": ["blue", "red"],
+        "order": ["b", "a"],
+        "pin": "0123",
+    }
+    assert prompt("", confirm(), name="ok", answers=given) is False
+    assert prompt("", text(), name="name", answers=given) == "Alice"
+    assert prompt("", number(maximum=50), name="age", answers=given) == 42
+    assert prompt("", number(type=Decimal), name="price", answers=given) == Decimal("1.5")
+    assert prompt("", choice("red", "green"), name="color", answers=given) == "green"
+    assert prompt("", choice("red", "blue", multiple=True), name="colors", answers=given) == ["red", "blue"]
+    assert prompt("", sort("a", "b"), name="order", answers=given) == ["b", "a"]
+    assert prompt("", pin(4), name="pin", answers=given) == [0, 1, 2, 3]
+
+def test_invalid() -> None:
+    with pytest.raises(InvalidAnswerError):
+        prompt("", number(maximum=10), name="age", answers={"age": 11})
+    with pytest.raises(InvalidAnswerError):
+        prompt("", choice("a", "b"), name="x", answers={"x": "c"})
+    with pytest.raises(InvalidAnswerError):
+        prompt("", sort("a", "b"), name="x", answers={"x": ["a", 1]})
+    with pytest.raises(InvalidAnswerError):
+        prompt("", sort("a", "b"), name="x", answers={"x": ["a", ["b"]]})
+    with pytest.raises(InvalidAnswerError):
+        prompt("", text(), name="x", answers={"x": "bob"}, validate=lambda x: x[0].isupper())
+
+def test_missing() -> None:
+    assert prompt("", confirm(default=False), name="ok", answers={}) is False
+    with pytest.raises(MissingAnswerError):
+        prompt("", choice("a", "b"), name="x", answers={})
+
+def test_load(tmp_path: Path) -> None:
+    (tmp_path / "a.toml").write_text('name = "Bob"\n[account]\ncreate = true\n')
+    (tmp_path / "a.json").write_text(json.dumps({"account": {"create": False}}))
+    assert answers.load(tmp_path / "a.toml") == {"name": "Bob", "account.create": True}
+    assert answers.load(tmp_path / "a.json") == {"account.create": False}
+    env = {"APROMPT_ANSWER_ACCOUNT__CREATE": "yes", "APROMPT_ANSWER_AGE": "3", "HOME": "/"}
+    assert answers.from_env(environ=env) == {"account.create": "yes", "age": 3}
+
+def test_provide() -> None:
+    with answers.provide({"name": "Carol"}):
+        assert prompt("", text(), name="name") == "Carol"
+        parser = ArgumentParser()
+        parser.add_argument("--sure", default=PromptIfAbsent("", confirm()))
+        parser.add_argument("--age", default=PromptIfAbsent("", number()))
+        args = parser.parse_args([], namespace=Namespace(answers={"sure": "y"})).prompt()
+    assert args.sure is True and args.age == 0
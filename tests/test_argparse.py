@@ -0,0 +1,63 @@
+from argparse import ArgumentParser
+
+from aprompt.exceptions import MissingArgumentsError
+from aprompt.ext.argparse import LazyNamespace, Namespace, PromptIfAbsent
+from aprompt.prompts import confirm, number
+
+import pytest
+
+def make_parser() -> ArgumentParser:
+    parser = ArgumentParser()
+    parser.add_argument(
+        "--age",
+        type=int,
+        default=PromptIfAbsent("", number(default=18), test_with=iter("+\n")),
+    )
+    parser.add_argument(
+        "--sure",
+        action="store_true",
+        default=PromptIfAbsent("", confirm(), test_with=iter("n")),
+    )
+    return parser
+
+def test_prompt() -> None:
+    args = make_parser().parse_args([], namespace=Namespace(interactive=True)).prompt()
+    assert args.age == 19
+    assert args.sure is False
+
+def test_prompt_provided() -> None:
+    args = make_parser().parse_args(["--age", "5"], namespace=Namespace(interactive=True))
+    assert args.missing() == ["sure"]
+    assert args.prompt().age == 5
+
+def test_prompt_subset() -> None:
+    args = make_parser().parse_args([], namespace=Namespace(interactive=True))
+    args.prompt("age")
+    assert args.age == 19
+    assert args.missing() == ["sure"]
+
+def test_lazy() -> None:
+    args = make_parser().parse_args([], namespace=LazyNamespace(interactive=True))
+    assert args.missing() == ["age", "sure"]
+    assert args.age == 19
+    assert args.age == 19  # cached, the keys of the prompt are consumed
+    assert args.missing() == ["sure"]
+
+def test_not_interactive() -> None:
+    args = make_parser().parse_args([], namespace=Namespace(interactive=False))
+    with pytest.raises(MissingArgumentsError) as exc_info:
+        args.prompt()
+    assert exc_info.value.names == ["age", "sure"]
+
+    args = make_parser().parse_args([], namespace=LazyNamespace(interactive=False))
+    with pytest.raises(MissingArgumentsError) as exc_info:
+        args.age
+    assert exc_info.value.names == ["age", "sure"]
+
+def test_not_interactive_provided() -> None:
+    # only the arguments to prompt for have to be provided
+    args = make_parser().parse_args(["--age", "5"], namespace=Namespace(interactive=False))
+    assert args.prompt("age").age == 5
+    with pytest.raises(MissingArgumentsError) as exc_info:
+        args.prompt("sure")
+    assert exc_info.value.names == ["sure"]
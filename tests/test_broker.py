@@ -0,0 +1,47 @@
+from concurrent.futures import ThreadPoolExecutor, wait
+import threading
+
+from aprompt.broker import PromptBroker
+from aprompt.exceptions import PromptTimeoutError
+from aprompt.prompts import confirm, number
+
+import pytest
+
+def test_workers() -> None:
+    broker = PromptBroker()
+
+    def work(i: int) -> int:
+        return i * broker.submit("", number(default=i), test_with=iter("+\n")).result()
+
+    with ThreadPoolExecutor(4) as pool:
+        futures = [pool.submit(work, i) for i in range(8)]
+        threading.Thread(target=lambda: (wait(futures), broker.close())).start()
+        broker.serve()
+    assert [f.result() for f in futures] == [i * (i + 1) for i in range(8)]
+
+def test_priority() -> None:
+    broker = PromptBroker()
+    order: list[int] = []
+    for i in range(3):
+        broker.submit("", confirm(), priority=i, test_with=iter("y")).add_done_callback(
+            lambda _, i=i: order.append(i)
+        )
+    broker.close()
+    broker.serve()
+    assert order == [2, 1, 0]
+
+def test_timeout() -> None:
+    broker = PromptBroker()
+    with_default = broker.submit("", confirm(), timeout=0, default=False)
+    without_default = broker.submit("", confirm(), timeout=0)
+    assert with_default.result(timeout=5) is False
+    with pytest.raises(PromptTimeoutError):
+        without_default.result(timeout=5)
+    broker.close()
+    broker.serve()
+
+def test_closed() -> None:
+    broker = PromptBroker()
+    broker.close()
+    with pytest.raises(RuntimeError):
+        broker.submit("", confirm())
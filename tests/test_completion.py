@@ -0,0 +1,53 @@
+import asyncio
+from collections.abc import Callable, Iterator
+import time
+
+from readchar import key as k
+
+from aprompt import prompt
+from aprompt.completion import Completer
+from aprompt.prompts import text
+from aprompt._utils import PrefixIndex
+
+HOSTS = ["db-1", "db-2", "web-1", "web-2"]
+
+def test_index() -> None:
+    index = PrefixIndex(HOSTS)
+    assert index.search("db") == ["db-1", "db-2"]
+    assert index.search("w", limit=1) == ["web-1"]
+    assert index.search("x") == []
+    index.add("db-0")
+    assert index.search("db-") == ["db-0", "db-1", "db-2"]
+
+def test_corpus() -> None:
+    assert prompt("", text(complete=HOSTS), test_with=iter(["w", k.TAB, k.ENTER])) == "web-1"
+    assert prompt("", text(complete=HOSTS), test_with=iter(["w", k.DOWN, k.TAB, k.ENTER])) == "web-2"
+
+def test_provider() -> None:
+    def wait(completer: Completer, prefix: str) -> list[str]:
+        for _ in range(100):
+            found = completer.complete(prefix)
+            if found is not None:
+                return found
+            time.sleep(0.01)
+        raise AssertionError("no completions")
+
+    calls = []
+    def lookup(prefix: str) -> list[str]:
+        calls.append(prefix)
+        return HOSTS
+
+    completer = Completer(lookup, debounce=0)
+    assert wait(completer, "db") == ["db-1", "db-2"]
+    assert wait(completer, "db") == ["db-1", "db-2"]
+    assert calls == ["db"]  # cached
+
+    async def lookup_async(prefix: str) -> list[str]:
+        await asyncio.sleep(0)
+        return HOSTS
+
+    assert wait(Completer(lookup_async, debounce=0), "web") == ["web-1", "web-2"]
+
+def test_refresh(keys: Callable[..., Iterator[str]]) -> None:
+    completer = Completer(lambda _: HOSTS, debounce=0)
+    assert prompt("", text(complete=completer), test_with=keys("d", "b", k.TAB, k.ENTER)) == "db-1"
@@ -0,0 +1,119 @@
+import os
+from pathlib import Path
+import socket
+import subprocess
+import sys
+import threading
+from typing import Any
+
+import pytest
+
+import aprompt
+from aprompt.daemon import Daemon, respond
+from aprompt_client import is_private, socket_path
+
+SRC = str(Path(aprompt.__file__).parent.parent)
+
+def typist(master: int, keys: bytes) -> threading.Thread:
+    # keys typed before the prompt is displayed are discarded
+    def type_keys() -> None:
+        try:
+            os.read(master, 4096)
+            os.write(master, keys)
+            while os.read(master, 4096):
+                pass
+        except OSError:
+            pass
+    thread = threading.Thread(target=type_keys, daemon=True)
+    thread.start()
+    return thread
+
+def client(args: list[str], keys: bytes, socket: str) -> subprocess.CompletedProcess[bytes]:
+    # the client runs without a controlling terminal, so it hands over its
+    # standard input and error which are connected to a pseudo-terminal
+    master, slave = os.openpty()
+    try:
+        typist(master, keys)
+        return subprocess.run(
+            [sys.executable, "-m", "aprompt_client", *args],
+            stdin=slave,
+            stderr=slave,
+            stdout=subprocess.PIPE,
+            env={**os.environ, "APROMPT_SOCKET": socket, "PYTHONPATH": SRC},
+            start_new_session=True,
+            timeout=30,
+        )
+    finally:
+        os.close(master)
+        os.close(slave)
+
+def test_daemon(tmp_path: Path) -> None:
+    path = str(tmp_path / "aprompt.sock")
+    with Daemon(path) as daemon:
+        thread = threading.Thread(target=daemon.serve_forever)
+        thread.start()
+        try:
+            done = client(["confirm", "Go?"], b"n", path)
+            assert done.returncode == 0 and done.stdout == b"no\n"
+            done = client(["choice", "Which?", "a", "b", "c"], b"\x1b[B\r", path)
+            assert done.stdout == b"b\n"
+            done = client(["number", "How many?", "--maximum=5"], b"++\r", path)
+            assert done.stdout == b"2\n"
+            done = client(["confirm", "Go?"], b"\x03", path)
+            assert done.returncode == 130
+            done = client(["nothing", "?"], b"", path)
+            assert done.returncode == 2
+        finally:
+            daemon.shutdown()
+            thread.join()
+    assert not os.path.exists(path)
+
+def test_without_daemon(tmp_path: Path) -> None:
+    done = client(["text", "Name?", "--default=bob"], b"\r", str(tmp_path / "none.sock"))
+    assert done.stdout == b"bob\n"
+
+def answer(argv: list[str], keys: bytes) -> dict[str, Any]:
+    master, slave = os.openpty()
+    try:
+        typist(master, keys)
+        with open(slave, "r", closefd=False) as stdin, open(slave, "w", closefd=False) as file:
+            return respond(argv, stdin, file)
+    finally:
+        os.close(master)
+        os.close(slave)
+
+def test_respond() -> None:
+    assert answer(["text", "Name?"], b"abc\r") == {"answer": "abc"}
+    assert answer(["pin", "PIN?", "4"], b"1234") == {"answer": [1, 2, 3, 4]}
+    assert answer(["pin", "PIN?", "--size=4"], b"")["status"] == 2
+    assert answer(["confirm", "Go?", "--history=x"], b"")["status"] == 2
+    assert answer(["text", "Name?", "--history=x"], b"\x1b[A")["status"] == 2
+
+def test_socket_path(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.delenv("APROMPT_SOCKET", raising=False)
+    monkeypatch.delenv("XDG_RUNTIME_DIR", raising=False)
+    assert socket_path() is None  # no shared directory such as /tmp
+
+def test_existing(tmp_path: Path) -> None:
+    path = tmp_path / "aprompt.sock"
+    path.write_text("")
+    with pytest.raises(FileExistsError):
+        Daemon(str(path))
+    assert path.exists()
+
+    path.unlink()
+    with Daemon(str(path)):
+        with pytest.raises(FileExistsError):
+            Daemon(str(path))  # already listening
+
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale.bind(str(path))
+    stale.close()
+    with Daemon(str(path)):
+        pass
+
+def test_private(tmp_path: Path) -> None:
+    path = str(tmp_path / "aprompt.sock")
+    with Daemon(path), socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(path)
+        assert is_private(sock, path)
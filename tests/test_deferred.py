@@ -0,0 +1,87 @@
+import asyncio
+from collections.abc import Callable
+from concurrent.futures import Future
+import threading
+import time
+from typing import TypeVar
+
+from readchar import key as k
+
+from aprompt import keys, prompt, widgets as w
+from aprompt.prompts import choice, confirm, number, text
+
+T = TypeVar("T")
+
+def slow(value: T, event: threading.Event) -> Callable[[], T]:
+    def get() -> T:
+        event.wait(5)
+        return value
+    return get
+
+def test_concurrent() -> None:
+    started = time.monotonic()
+    engines = [text(default=lambda: time.sleep(0.2) or "x") for _ in range(5)]
+    for engine in engines:
+        next(engine)
+    for engine in engines:
+        assert engine.state.deferred["default"].result() == "x"
+    assert time.monotonic() - started < 5 * 0.2  # less than one after another
+    for engine in engines:
+        engine.send(keys.REFRESH)
+        assert engine.send(k.ENTER).value == "x"
+
+def test_pending() -> None:
+    event = threading.Event()
+    engine = text(default=slow("world", event), placeholder=slow("name", event))
+    view = next(engine)
+    assert any(isinstance(x, w.Spinner) for x in view)
+    event.set()
+    engine.state.deferred["placeholder"].result()
+    engine.state.deferred["default"].result()
+    view = engine.send(keys.REFRESH)
+    assert not any(isinstance(x, w.Spinner) for x in view)
+    assert engine.send(k.ENTER).value == "world"
+
+def test_choices() -> None:
+    event = threading.Event()
+    engine = choice(slow(["a", "b"], event))
+    next(engine)
+    assert engine.send(k.DOWN) and engine.state.alert
+    event.set()
+    engine.state.deferred["choices"].result()
+    engine.send(keys.REFRESH)
+    engine.send(k.DOWN)
+    assert engine.send(k.ENTER).value == "b"
+
+def test_awaitable() -> None:
+    async def get() -> bool:
+        await asyncio.sleep(0.01)
+        return False
+    engine = confirm(default=get())
+    next(engine)
+    engine.state.deferred["default"].result()
+    engine.send(keys.REFRESH)
+    assert engine.send(k.ENTER).value is False
+
+def test_number() -> None:
+    future: Future[int] = Future()
+    engine = number(maximum=10, default=future)
+    next(engine)
+    future.set_result(5)
+    engine.send(keys.REFRESH)
+    assert engine.send(k.ENTER).value == 5
+
+    future = Future()
+    engine = number(maximum=10, default=future)
+    next(engine)
+    engine.send(k.UP)
+    future.set_result(5)
+    engine.send(keys.REFRESH)
+    assert engine.state.default == 5
+    assert engine.send(k.ENTER).value == 1
+
+def test_failed() -> None:
+    def fail() -> str:
+        raise OSError
+    engine = text(default=fail, placeholder="name")
+    assert prompt("", engine, test_with=iter([keys.REFRESH, k.ENTER])) == ""
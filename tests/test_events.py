@@ -0,0 +1,52 @@
+import asyncio
+import subprocess
+import sys
+
+from readchar import key as k
+
+from aprompt import prompt
+from aprompt.events import Event, to_queue
+from aprompt.prompts import choice, sort, text
+
+def test_selection() -> None:
+    events: list[Event] = []
+    prompt(
+        "",
+        choice("a", "b", "c", multiple=True),
+        test_with=iter([k.SPACE, k.DOWN, k.SPACE, k.SPACE, k.ENTER]),
+        on_event=events.append,
+    )
+    assert events == [
+        Event("hover", "a", index=0),
+        Event("select", "a", index=0),
+        Event("hover", "b", index=1),
+        Event("select", "b", index=1),
+        Event("deselect", "b", index=1),
+    ]
+
+def test_text() -> None:
+    events: list[Event] = []
+    prompt("", text(), test_with=iter(["h", "i", k.BACKSPACE, k.ENTER]), on_event=events.append)
+    assert [e.value for e in events] == ["", "h", "hi", "h"]
+
+def test_sort() -> None:
+    events: list[Event] = []
+    prompt("", sort("a", "b"), test_with=iter([k.SPACE, k.DOWN, k.ENTER]), on_event=events.append)
+    assert events == [Event("hover", "a", index=0), Event("hover", "a", index=1)]
+
+def test_queue() -> None:
+    async def main() -> list[Event]:
+        events: asyncio.Queue[Event] = asyncio.Queue()
+        await asyncio.to_thread(
+            prompt, "", choice("a", "b"), test_with=iter([k.DOWN, k.ENTER]), on_event=to_queue(events)
+        )
+        await asyncio.sleep(0)
+        return [events.get_nowait() for _ in range(events.qsize())]
+
+    assert [e.value for e in asyncio.run(main())] == ["a", "b"]
+
+def test_lazy_imports() -> None:
+    # importing asyncio, history or answers would slow down importing aprompt
+    code = "import sys, aprompt; print(sorted({'asyncio', 'aprompt.history', 'aprompt.answers'} & set(sys.modules)))"
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert output.stdout == "[]\n"
@@ -0,0 +1,67 @@
+from pathlib import Path
+
+from readchar import key as k
+
+from aprompt import prompt
+from aprompt.history import History
+from aprompt.prompts import choice, confirm, number, text
+
+def test_store(tmp_path: Path) -> None:
+    history = History("hosts", directory=tmp_path)
+    assert history.last() is None
+    for host in ["db-1", "web-1", "db-1", "db-2"]:
+        history.append(host)
+    assert list(history) == ["db-2", "db-1", "web-1"]
+
+    history = History("hosts", directory=tmp_path)  # lazily loaded
+    assert history.last() == "db-2"
+    assert history.startswith("db") == ["db-2", "db-1"]
+    assert list(history.search("1")) == ["db-1", "web-1"]
+
+def test_compact(tmp_path: Path) -> None:
+    history = History("numbers", directory=tmp_path, size=3)
+    for i in range(7):
+        history.append(i)
+    assert list(history) == [6, 5, 4]
+    assert len(history.path.read_text().splitlines()) <= 6
+    assert list(History("numbers", directory=tmp_path, size=3)) == [6, 5, 4]
+
+    # appending does not read the history
+    history = History("numbers", directory=tmp_path, size=3)
+    history.append(7)
+    assert history._entries is None
+    for i in range(8, 20):
+        history.append(i)
+    assert len(history.path.read_text().splitlines()) <= 6
+    assert list(history)[:3] == [19, 18, 17]
+
+def test_text(tmp_path: Path) -> None:
+    history = History("hosts", directory=tmp_path)
+    for host in ["db-1", "web-1", "db-2"]:
+        prompt("", text(), history=history, test_with=iter([*host, k.ENTER]))
+
+    def ask(*keys: str) -> str:
+        return prompt("", text(history=history), test_with=iter([*keys, k.ENTER]))
+
+    assert ask(k.UP) == "db-2"
+    assert ask(k.UP, k.UP, k.UP) == "db-1"
+    assert ask(k.UP, k.DOWN, "x") == "x"
+    assert ask("d", k.UP, k.UP) == "db-1"
+    assert ask(k.CTRL_R, "w", k.ENTER) == "web-1"
+    assert ask(k.CTRL_R, "d", "b", k.CTRL_R, k.ENTER, "!") == "db-1!"
+
+def test_defaults(tmp_path: Path) -> None:
+    history = History("deploy", directory=tmp_path)
+    history.append(False)
+    assert prompt("", confirm(history=history), test_with=iter([k.ENTER])) is False
+
+    history = History("port", directory=tmp_path)
+    history.append(8443)
+    assert prompt("", number(history=history), test_with=iter([k.ENTER])) == 8443
+    assert prompt("", number(maximum=100, history=history), test_with=iter([k.ENTER])) == 0
+
+    history = History("env", directory=tmp_path)
+    history.append("prod")
+    assert prompt("", choice("dev", "prod", history=history), test_with=iter([k.ENTER])) == "prod"
+    history.append(["dev"])
+    assert prompt("", choice("dev", "prod", multiple=True, history=history), test_with=iter([k.ENTER])) == ["dev"]
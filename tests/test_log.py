@@ -0,0 +1,38 @@
+from io import StringIO
+import logging
+
+from aprompt.log import Outlet, PromptHandler, StdoutProxy, OUTLET
+
+def test_outlet() -> None:
+    outlet = Outlet()
+    file = StringIO()
+    wakes: list[None] = []
+
+    outlet.write("direct\n", file)
+    assert file.getvalue() == "direct\n"
+
+    with outlet.attach(lambda: wakes.append(None), file):
+        outlet.write("a\nb", file)
+        outlet.write("c\n", file)
+        outlet.write("d", file)
+        assert len(wakes) == 1  # only the first write of a batch wakes up
+        assert outlet.pending
+        assert outlet.take() == "a\nbc\n"
+        assert not outlet.pending
+        assert file.getvalue() == "direct\n"
+    assert file.getvalue() == "direct\nd"
+
+def test_handler() -> None:
+    stream = StringIO()
+    logger = logging.getLogger("aprompt.tests")
+    logger.addHandler(PromptHandler(stream))
+    logger.propagate = False
+    with OUTLET.attach(lambda: None, stream):
+        logger.warning("careful")
+        assert stream.getvalue() == ""
+        assert OUTLET.take() == "careful\n"
+
+def test_proxy() -> None:
+    file = StringIO()
+    print("hi", file=StdoutProxy(file))  # type: ignore
+    assert file.getvalue() == "hi\n"
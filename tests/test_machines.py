@@ -0,0 +1,46 @@
+from decimal import Decimal
+
+from readchar import key as k
+
+from aprompt import prompt
+from aprompt.machines import ChoiceState, Engine, NumberState, TextState, dumps, loads
+from aprompt.prompts import choice, confirm, number, pin, sort, text
+
+def test_step() -> None:
+    state = ChoiceState(["a", "b"])
+    after, view = state.step(k.DOWN)
+    assert state.hover == 0 and after.hover == 1
+    assert after.step(k.ENTER)[1].value == "b"  # type: ignore
+
+def test_dumps() -> None:
+    engine = choice("a", "b", "c", multiple=True)
+    next(engine)
+    engine.send(k.SPACE)
+    engine.send(k.DOWN)
+    saved = dumps(engine.state)
+    assert saved == '{"machine":"choice","choices":["a","b","c"],"multiple":true,"hover":1,"selected":[0]}'
+    assert prompt("", Engine(loads(saved)), test_with=iter([k.SPACE, k.ENTER])) == ["a", "b"]
+
+def test_resume() -> None:
+    for engine, keys in [
+        (confirm(), ["n"]),
+        (text(), [*"hello", k.BACKSPACE, k.ENTER]),
+        (number(type=Decimal, step=Decimal("0.5")), [k.UP, "1", k.UP, k.ENTER]),
+        (sort("a", "b", "c"), [k.SPACE, k.DOWN, k.SPACE, k.ENTER]),
+        (pin(3), ["1", "2", "3"]),
+    ]:
+        state = engine.state
+        expected = prompt("", engine, test_with=iter(keys))
+        # restore the state after every key
+        while keys:
+            state = loads(dumps(state))
+            state, out = state.step(keys.pop(0))
+        assert out.value == expected  # type: ignore
+
+def test_transient() -> None:
+    state = loads(dumps(TextState(validate=str.isdigit)), validate=str.isdigit)
+    assert prompt("", Engine(state), test_with=iter([*"1a2", k.ENTER])) == "12"
+
+def test_invalid_result() -> None:
+    # the last digit is taken back
+    assert prompt("", pin(2), validate=lambda digits: digits != [1, 2], test_with=iter("123")) == [1, 3]
@@ -1,3 +1,7 @@
+from decimal import Decimal
+
+from readchar import key as k
+
 from aprompt import prompt
 from aprompt.prompts import number
 
@@ -20,3 +24,33 @@ def test_invalid_default() -> None:
 
 def test_no_span() -> None:
     assert prompt("", number(default=-50), test_with=iter("++\n")) == -48
+
+def test_type() -> None:
+    assert prompt("", number(), test_with=iter("8443\n")) == 8443
+    assert prompt("", number(), test_with=iter("84\x7f-3\n")) == -83
+    assert prompt("", number(maximum=100), test_with=iter("1000\n")) == 100
+    assert prompt("", number(minimum=10), test_with=iter(["5", "\n", "0", "\n"])) == 50
+    assert prompt("", number(), test_with=iter(["4", k.UP, "\n"])) == 5
+
+def test_step() -> None:
+    assert prompt("", number(step=5), test_with=iter([k.UP, k.UP, k.DOWN, "\n"])) == 5
+    assert prompt("", number(page=100, maximum=150), test_with=iter([k.PAGE_UP, k.PAGE_UP, "\n"])) == 150
+    assert prompt("", number(accelerate=True), test_with=iter([*[k.UP] * 12, "\n"])) == 30
+
+def test_float() -> None:
+    assert prompt("", number(type=float, step=0.1), test_with=iter([k.UP] * 3 + ["\n"])) == 0.3
+    assert prompt("", number(type=float), test_with=iter("2.5\n")) == 2.5
+    assert prompt("", number(type=Decimal, step=Decimal("0.01")), test_with=iter([k.UP, "\n"])) == Decimal("0.01")
+    assert prompt("", number(type=Decimal), test_with=iter("1.25\n")) == Decimal("1.25")
+
+def test_fraction_of_int() -> None:
+    with pytest.raises(ValueError, match="default .* is not a valid int"):
+        number(default=1.5)
+    with pytest.raises(ValueError, match="step .* is not a valid int"):
+        number(step=0.5)
+
+def test_negative_range() -> None:
+    for typed in ["30", "30-", "3-0", "-30"]:
+        assert prompt("", number(minimum=-100, maximum=-5), test_with=iter([*typed, "\n"])) == -30
+    assert prompt("", number(minimum=-100, maximum=5), test_with=iter("30-\n")) == -30
+    assert prompt("", number(minimum=-100, maximum=-5), test_with=iter("300\n")) == -30
@@ -0,0 +1,20 @@
+from collections.abc import Callable, Iterator
+from pathlib import Path
+
+from readchar import key as k
+
+from aprompt import prompt
+from aprompt.prompts import path
+
+def test_path(tmp_path: Path, keys: Callable[..., Iterator[str]]) -> None:
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "main.py").touch()
+    (tmp_path / "README.md").touch()
+    (tmp_path / ".git").mkdir()
+
+    assert prompt("", path(tmp_path), test_with=keys(k.ENTER)) == tmp_path
+    assert prompt("", path(tmp_path, select="file"), test_with=keys(k.DOWN, k.DOWN, k.ENTER)) == tmp_path / "README.md"
+    assert prompt("", path(tmp_path, select="file"), test_with=keys(k.DOWN, k.ENTER, k.DOWN, k.ENTER)) == tmp_path / "src" / "main.py"
+    assert prompt("", path(tmp_path, select="directory"), test_with=keys(k.DOWN, k.DOWN, k.ENTER)) == tmp_path / "src"
+    assert prompt("", path(tmp_path / "src"), test_with=keys(k.LEFT, "r", "e", "a", k.ENTER)) == tmp_path / "README.md"
+    assert prompt("", path(tmp_path, hidden=True), test_with=keys("g", "i", k.RIGHT, k.ENTER)) == tmp_path / ".git"
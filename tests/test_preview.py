@@ -0,0 +1,62 @@
+import os
+import threading
+import time
+
+from readchar import key as k
+
+from aprompt import formatters, prompt, widgets as w
+from aprompt.preview import Previewer
+from aprompt.prompts import choice
+
+def wait(previewer: Previewer, option: str, adjacent: list[str] = []) -> str:
+    for _ in range(500):
+        text = previewer.preview(option, adjacent)
+        if text is not None:
+            return text
+        time.sleep(0.01)
+    raise TimeoutError
+
+def test_previewer() -> None:
+    calls: list[str] = []
+    previewer = Previewer(lambda o: calls.append(o) or o.upper(), debounce=0.05)
+    assert previewer.preview("a", ["b"]) is None
+    assert wait(previewer, "a", ["b"]) == "A"
+    # the adjacent option is prefetched
+    time.sleep(0.05)
+    assert wait(previewer, "b") == "B"
+    assert wait(previewer, "a") == "A"  # cached
+    assert calls == ["a", "b"]
+
+def test_debounce() -> None:
+    calls: list[str] = []
+    previewer = Previewer(lambda o: calls.append(o) or o, debounce=0.1, prefetch=0)
+    for option in "abcde":
+        assert previewer.preview(option) is None
+    assert wait(previewer, "e") == "e"
+    assert calls == ["e"]
+
+def test_slow() -> None:
+    release = threading.Event()
+    previewer = Previewer(lambda o: release.wait(5) and o, debounce=0)
+    engine = choice("a", "b", "c", preview=previewer)
+    started = time.monotonic()
+    next(engine)
+    for _ in range(20):
+        engine.send(k.DOWN)
+    assert time.monotonic() - started < 0.5  # the key loop is not blocked
+    release.set()
+    previewer.close()
+
+def test_prompt() -> None:
+    previewer = Previewer(lambda o: f"about {o}", debounce=0)
+    wait(previewer, "a")
+    engine = choice("a", "b", preview=previewer)
+    assert w.Preview("about a") in next(engine)
+    assert prompt("", choice("a", "b", preview=previewer), test_with=iter([k.DOWN, k.ENTER])) == "b"
+
+def test_render() -> None:
+    size = os.terminal_size((40, 24))
+    widgets = [w.Options([w.Option("a", hover=True), w.Option("b")]), w.Preview("one\ntwo\nthree", side=True, height=2)]
+    assert formatters.simple(size, widgets) == [" > a | one", "   b | two", ""]
+    widgets[1] = w.Preview("one\x1b[1m\ttwo", height=2)
+    assert formatters.simple(size, widgets)[2:] == ["-" * 40, "one two", ""]
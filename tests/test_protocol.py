@@ -0,0 +1,107 @@
+from io import BytesIO
+import json
+import os
+from pathlib import Path
+import threading
+import time
+from typing import Any
+from unittest.mock import patch
+
+from aprompt.prompts import choice
+from aprompt.protocol import PROMPTS, serve
+
+class Messages(BytesIO):
+    """Input delivering one message per read like a client awaiting frames."""
+
+    def __init__(self, *messages: dict[str, Any]) -> None:
+        super().__init__("".join(json.dumps(m) + "\n" for m in messages).encode())
+
+    def read1(self, size: int = -1) -> bytes:
+        return self.readline()
+
+def run(*messages: dict[str, Any], diff: bool = False) -> list[dict[str, Any]]:
+    output = BytesIO()
+    serve(Messages(*messages), output, diff=diff)
+    return [json.loads(line) for line in output.getvalue().splitlines()]
+
+def test_burst() -> None:
+    output = BytesIO()
+    serve(
+        BytesIO(b'{"type": "prompt", "prompt": "confirm"}\n{"type": "key", "key": "+"}\n'),
+        output,
+    )
+    assert output.getvalue().count(b"\n") == 1
+
+def test_choice() -> None:
+    out = run(
+        {"type": "prompt", "prompt": "choice", "ask": "?", "args": ["a", "b"]},
+        {"type": "key", "name": "DOWN"},
+        {"type": "key", "key": "\n"},
+    )
+    assert [m["type"] for m in out] == ["frame", "frame", "result"]
+    assert out[0]["widgets"][0] == {"widget": "Question", "content": "?"}
+    assert out[1]["widgets"][2]["content"][1]["hover"] is True
+    assert out[2] == {"type": "result", "value": "b", "display": "b"}
+
+def test_diff() -> None:
+    out = run(
+        {"type": "prompt", "prompt": "number", "ask": "?"},
+        {"type": "key", "key": "+"},
+        {"type": "key", "key": "\n"},
+        diff=True,
+    )
+    assert out[1] == {
+        "type": "diff",
+        "length": 4,
+        "widgets": {"2": {"widget": "Integer", "content": 1, "edit": None}},
+    }
+    assert out[2]["value"] == 1
+
+def test_several_prompts() -> None:
+    out = run(
+        {"type": "prompt", "prompt": "confirm"},
+        {"type": "key", "key": "y"},
+        {"type": "prompt", "prompt": "pin", "args": [2]},
+        {"type": "cancel"},
+    )
+    assert [m["type"] for m in out] == ["frame", "result", "frame", "cancelled"]
+
+def test_errors() -> None:
+    out = run(
+        {"type": "key", "key": "y"},
+        {"type": "prompt", "prompt": "_utils"},
+        {"type": "prompt", "prompt": "History", "args": ["/tmp/history"]},
+        {"type": "prompt", "prompt": "pin", "args": [0]},
+    )
+    assert [m["type"] for m in out] == ["error"] * 4
+    assert "unknown prompt" in out[2]["message"]
+
+def test_file(tmp_path: Path) -> None:
+    # regular files cannot be polled
+    path = tmp_path / "messages.jsonl"
+    path.write_bytes(b'{"type": "prompt", "prompt": "confirm"}\n{"type": "key", "key": "y"}\n')
+    output = BytesIO()
+    with path.open("rb") as file:
+        serve(file, output)
+    assert [json.loads(line)["type"] for line in output.getvalue().splitlines()] == ["result"]
+
+def test_refresh() -> None:
+    # deferred options are sent without a key being pressed
+    def fruits() -> list[str]:
+        time.sleep(0.1)
+        return ["apple", "banana"]
+
+    read, write = os.pipe()
+    output = BytesIO()
+    with patch.dict(PROMPTS, {"fruits": lambda: choice(fruits)}):
+        thread = threading.Thread(target=serve, args=(os.fdopen(read, "rb"), output))
+        thread.start()
+        with os.fdopen(write, "wb") as input:
+            input.write(b'{"type": "prompt", "prompt": "fruits"}\n')
+            input.flush()
+            time.sleep(0.5)
+        thread.join()
+    frames = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert len(frames) == 2
+    options = next(x for x in frames[1]["widgets"] if x and x["widget"] == "Options")
+    assert [o["content"] for o in options["content"]] == ["apple", "banana"]
@@ -0,0 +1,62 @@
+import math
+import random
+
+from readchar import key as k
+
+from aprompt import PromptEngine, animated, prompt, widgets as w
+from aprompt.machines import dumps, loads
+from aprompt.prompts import rank
+
+def run(engine: PromptEngine[list[str]], truth: list[str]) -> tuple[list[str], int]:
+    # answers like a user who prefers the options in the order of `truth`
+    view = next(engine)
+    assert isinstance(view, list)
+    questions = 0
+    while True:
+        options = next(x for x in view if isinstance(x, w.Options)).content
+        a, b = (o.content for o in options)
+        questions += 1
+        out = engine.send("1" if truth.index(a) < truth.index(b) else "2")
+        if not isinstance(out, list):
+            return out.value, questions
+        view = out
+
+def test_rank() -> None:
+    truth = [f"item {i}" for i in range(40)]
+    shuffled = random.Random(1).sample(truth, len(truth))
+    result, questions = run(rank(*shuffled), truth)
+    assert result == truth
+    assert questions <= math.ceil(math.log2(math.factorial(40))) + 20
+
+def test_still() -> None:
+    # the progress only changes with answers, so it is not redrawn periodically
+    view = next(rank("a", "b", "c"))
+    assert isinstance(view, list)
+    assert any(isinstance(x, w.Progress) for x in view)
+    assert not animated(view)
+    assert animated([w.Progress(lambda: 0.5)])
+
+def test_top() -> None:
+    truth = [f"item {i}" for i in range(40)]
+    shuffled = random.Random(2).sample(truth, len(truth))
+    result, questions = run(rank(*shuffled, top=3), truth)
+    assert result == truth[:3]
+    assert questions < run(rank(*shuffled), truth)[1]
+
+def test_known() -> None:
+    result, questions = run(rank("c", "a", "d", "b", known=[["a", "b", "c"]]), ["a", "b", "c", "d"])
+    assert result == ["a", "b", "c", "d"]
+    assert questions == 1
+
+def test_keys() -> None:
+    # "b" is asked first; "b" is better, taken back, then "a" is better
+    keys = [k.ENTER, k.BACKSPACE, k.DOWN, k.ENTER, "2"]
+    assert prompt("", rank("a", "b", "c"), test_with=iter(keys)) == ["a", "b", "c"]
+
+def test_resume() -> None:
+    engine = rank("a", "b", "c", "d")
+    next(engine)
+    engine.send("2")
+    state = loads(dumps(engine.state))
+    assert state.answers == engine.state.answers
+    assert next(x for x in state.view() if isinstance(x, w.Progress)).content > 0
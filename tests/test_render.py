@@ -0,0 +1,75 @@
+from io import StringIO
+import os
+import sys
+
+from aprompt import formatters, prompt, widgets as w
+from aprompt.prompts import number
+from aprompt._terminal import KeyReader, Screen
+
+import pytest
+
+SIZE = os.terminal_size((30, 24))
+
+def test_progress() -> None:
+    assert formatters.simple(SIZE, [w.Progress(0.5, label="copy")]) == [
+        "copy [#########.........]  50%",
+        "",
+    ]
+    assert formatters.simple(SIZE, [w.Progress(lambda: 20, total=10)]) == [
+        "[#######################] 100%",
+        "",
+    ]
+
+def test_spinner() -> None:
+    line, _ = formatters.simple(SIZE, [w.Spinner("loading")])
+    assert line[0] in formatters.SPINNER
+    assert line[1:] == " loading"
+
+def test_key_reader() -> None:
+    read, write = os.pipe()
+    with os.fdopen(read) as file, KeyReader(file) as reader:
+        assert reader.read(0) is None
+        os.write(write, b"a\x1b[Bb")
+        assert reader.read(1) == "a"
+        assert reader.pending
+        assert reader.read() == "\x1b[B"
+        assert reader.read() == "b"
+        os.write(write, b"\x1b")
+        assert reader.read(1) == "\x1b"  # escape sequence timed out
+        os.close(write)
+        with pytest.raises(EOFError):
+            reader.read()
+
+def test_screen() -> None:
+    class File:
+        def __init__(self) -> None:
+            self.writes: list[str] = []
+
+        def write(self, string: str) -> None:
+            self.writes.append(string)
+
+        def flush(self) -> None:
+            pass
+
+    file = File()
+    screen = Screen(file)  # type: ignore
+    screen.draw("a\n")
+    screen.draw("a\n")  # unchanged frames are not drawn
+    screen.draw("b\n")
+    screen.finish("c\n")
+    assert file.writes == ["a\n", "\x1b[1A\x1b[2K\rb\n", "\x1b[1A\x1b[2K\rc\n\n"]
+
+    file.writes.clear()
+    screen.draw("\ab\n")
+    screen.draw("\ab\n")  # the bell rings again
+    assert file.writes == ["\ab\n", "\a"]
+
+def test_plain(monkeypatch: pytest.MonkeyPatch) -> None:
+    read, write = os.pipe()
+    os.write(write, b"++\n")
+    os.close(write)
+    with os.fdopen(read) as stdin:
+        monkeypatch.setattr(sys, "stdin", stdin)
+        file = StringIO()
+        assert prompt("Port?", number(default=1), file=file) == 3
+    assert file.getvalue() == "? Port?\n> 3\n\n"
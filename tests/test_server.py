@@ -0,0 +1,107 @@
+import asyncio
+import os
+from pathlib import Path
+import time
+
+from aprompt.prompts import choice, confirm, number
+from aprompt.server import Connection, serve_fd, start_unix_server
+from aprompt._utils import KeyDecoder
+
+def test_key_decoder() -> None:
+    decoder = KeyDecoder()
+    assert decoder.feed("ab\x1b[") == ["a", "b"]
+    assert decoder.pending == "\x1b["
+    assert decoder.feed("A\r\nx\r") == ["\x1b[A", "\n", "x", "\n"]
+    assert decoder.feed("\x1b") == []
+    assert decoder.flush() == ["\x1b"]
+
+def test_sessions(tmp_path: Path) -> None:
+    path = str(tmp_path / "prompt.sock")
+    answers: list[object] = []
+
+    async def handler(conn: Connection) -> None:
+        if await conn.prompt("Go?", confirm()):
+            answers.append(await conn.prompt("How many?", number()))
+
+    async def client(keys: bytes) -> bytes:
+        reader, writer = await asyncio.open_unix_connection(path)
+        writer.write(keys)
+        output = await reader.read()
+        writer.close()
+        return output
+
+    async def main() -> list[bytes]:
+        server = await start_unix_server(handler, path)
+        async with server:
+            return await asyncio.gather(
+                client(b"y++\r"), client(b"y\x1b[B\r"), client(b"n")
+            )
+
+    outputs = asyncio.run(main())
+    assert sorted(answers) == [-1, 2]  # type: ignore
+    assert b"> yes" in outputs[0] and b"> no" in outputs[2]
+
+def test_disconnect(tmp_path: Path) -> None:
+    path = str(tmp_path / "prompt.sock")
+    finished = []
+
+    async def handler(conn: Connection) -> None:
+        try:
+            await conn.prompt("", confirm())
+        finally:
+            finished.append(True)
+
+    async def main() -> None:
+        server = await start_unix_server(handler, path)
+        async with server:
+            _, writer = await asyncio.open_unix_connection(path)
+            writer.write(b"x")
+            writer.close()
+            while not finished:
+                await asyncio.sleep(0.01)
+
+    asyncio.run(main())
+
+def test_pty() -> None:
+    master, slave = os.openpty()
+    answers: list[bool] = []
+
+    async def handler(conn: Connection) -> None:
+        answers.append(await conn.prompt("", confirm()))
+
+    async def main() -> None:
+        os.write(slave, b"n")
+        await serve_fd(handler, master)
+
+    try:
+        asyncio.run(main())
+    finally:
+        os.close(master)
+        os.close(slave)
+    assert answers == [False]
+
+def test_refresh(tmp_path: Path) -> None:
+    # deferred options show up without a key being pressed
+    path = str(tmp_path / "prompt.sock")
+    answers: list[object] = []
+
+    def fruits() -> list[str]:
+        time.sleep(0.1)
+        return ["apple", "banana"]
+
+    async def handler(conn: Connection) -> None:
+        answers.append(await conn.prompt("Which?", choice(fruits)))
+
+    async def main() -> None:
+        server = await start_unix_server(handler, path)
+        async with server:
+            reader, writer = await asyncio.open_unix_connection(path)
+            output = b""
+            while b"banana" not in output:
+                output += await asyncio.wait_for(reader.read(4096), 5)
+            writer.write(b"\x1b[B\r")
+            await reader.read()
+            writer.close()
+
+    asyncio.run(main())
+    assert answers == ["banana"]
@@ -0,0 +1,57 @@
+from collections.abc import Callable, Iterator
+import os
+
+from readchar import key as k
+
+from aprompt import prompt, formatters, widgets as w
+from aprompt.prompts import table
+
+HOSTS = {
+    "host": ["db-1", "web-2", "web-1", "db-2"],
+    "region": ["eu-west", "us-east", "eu-west", "us-east"],
+    "load": [0.4, 0.9, 0.1, 0.5],
+}
+
+def test_select() -> None:
+    assert prompt("", table(HOSTS), test_with=iter([k.DOWN, k.DOWN, k.ENTER])) == 2
+    assert prompt("", table(HOSTS), test_with=iter([k.END, k.UP, k.ENTER])) == 2
+
+def test_sort(keys: Callable[..., Iterator[str]]) -> None:
+    assert prompt("", table(HOSTS), test_with=keys(k.END, "s", k.HOME, k.ENTER)) == 0
+    assert prompt("", table(HOSTS), test_with=keys("s", "s", k.HOME, k.ENTER)) == 1
+    assert prompt("", table(HOSTS), test_with=keys(k.RIGHT, k.RIGHT, "s", k.HOME, k.ENTER)) == 2
+    assert prompt("", table(HOSTS), test_with=keys("s", "s", "s", k.HOME, k.ENTER)) == 0
+    # the hovered row stays hovered
+    assert prompt("", table(HOSTS), test_with=keys(k.DOWN, "s", k.UP, k.ENTER)) == 2
+
+def test_large() -> None:
+    n = 10**6
+    rows = table({"id": range(n, 0, -1), "name": [f"row {i}" for i in range(n)]})
+    assert prompt("", rows, test_with=iter([k.END, k.ENTER])) == n - 1
+
+def test_mixed(keys: Callable[..., Iterator[str]]) -> None:
+    # chunks of different types are only compared when they are merged
+    column = [1] * 65536 + ["a"] * 10
+    rows = table({"value": column})
+    assert prompt("", rows, test_with=keys("s", k.END, k.ENTER)) == len(column) - 1
+
+def test_format() -> None:
+    widget = w.Table([["db-1", "eu-west"], ["web-10", "us-east"]], header=["host", "region"], widths=[6, 7], hover=1)
+    assert formatters.simple(os.terminal_size((80, 24)), [widget]) == [
+        "  host    region",
+        "  db-1    eu-west",
+        "> web-10  us-east",
+        "",
+    ]
+    # columns that do not fit are cut off
+    assert formatters.simple(os.terminal_size((12, 24)), [widget])[0] == "  host"
+    assert formatters.simple(os.terminal_size((12, 24)), [w.Table([["db-1", "eu-west"]], header=["host", "region"], widths=[6, 7], offset=1)]) == ["  region", "  eu-west", ""]
+
+def test_navigation() -> None:
+    def label(view: object) -> str:
+        assert isinstance(view, list)
+        return next(x for x in view if isinstance(x, w.Navigation)).content["S"]
+
+    engine = table(HOSTS)
+    assert label(next(engine)) == "sort by host"
+    assert label(engine.send(k.RIGHT)) == "sort by region"
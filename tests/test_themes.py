@@ -0,0 +1,42 @@
+import os
+
+from aprompt import formatters, widgets as w
+from aprompt.themes import ColorLevel, Style, Theme, compile_theme
+
+import pytest
+
+SIZE = os.terminal_size((40, 24))
+
+WIDGETS: list[list[w.Widget | None]] = [
+    [w.Question("Pick one"), w.Alert(), None, w.Options([w.Option("a", hover=True), w.Option("b", select=True)])],
+    [w.Question("Sort"), w.SortableOptions([w.Option("a", hover=True), w.Option("b"), w.Option("c", select=True)])],
+    [w.Question("Name"), w.Text("", placeholder="bob", hide=False), w.Navigation({"ENTER": "done"})],
+    [w.Question("Sure?"), w.Confirm(True), w.Error(ValueError("nope")), w.Countdown(3)],
+    [w.Question("Age"), w.Integer(5), w.Code([1, None]), w.Progress(0.25)],
+    [w.Question("Done"), w.Answer("yes")],
+]
+
+@pytest.mark.parametrize("widgets", WIDGETS)
+def test_plain_default(widgets: list[w.Widget | None]) -> None:
+    assert compile_theme(Theme(), ColorLevel.NONE)(SIZE, widgets) == formatters.simple(
+        SIZE, widgets
+    )
+
+def test_cached() -> None:
+    theme = Theme(question_prefix="» ")
+    assert compile_theme(theme, ColorLevel.BASIC) is compile_theme(Theme(question_prefix="» "), ColorLevel.BASIC)
+    assert compile_theme(theme, ColorLevel.BASIC) is not compile_theme(theme, ColorLevel.EXTENDED)
+
+def test_colors() -> None:
+    style = Style(fg="#ff0000", bg="bright_blue", bold=True)
+    assert style.codes(ColorLevel.TRUECOLOR) == ("\x1b[1;38;2;255;0;0;104m", "\x1b[0m")
+    assert style.codes(ColorLevel.EXTENDED) == ("\x1b[1;38;5;196;104m", "\x1b[0m")
+    assert style.codes(ColorLevel.BASIC) == ("\x1b[1;91;104m", "\x1b[0m")
+    assert style.codes(ColorLevel.NONE) == ("", "")
+    with pytest.raises(ValueError):
+        Style(fg="rainbow").codes(ColorLevel.BASIC)
+
+def test_styled() -> None:
+    theme = Theme(question=Style(fg="red"), question_prefix="# ")
+    lines = compile_theme(theme, ColorLevel.BASIC)(SIZE, [w.Question("Hi")])
+    assert lines == ["\x1b[31m# Hi\x1b[0m", ""]
@@ -0,0 +1,50 @@
+import os
+import threading
+import time
+
+from aprompt import prompt
+from aprompt.exceptions import PromptTimeoutError
+from aprompt.keys import TIMEOUT
+from aprompt.prompts import choice, confirm, number, text
+
+import pytest
+
+def test_default() -> None:
+    assert prompt("", confirm(default=False), test_with=iter([TIMEOUT])) is False
+    assert prompt("", text(default="localhost"), test_with=iter(["x", TIMEOUT])) == "localhost"
+    assert prompt("", number(default=8443), test_with=iter(["+", TIMEOUT])) == 8443
+
+def test_no_default() -> None:
+    with pytest.raises(PromptTimeoutError):
+        prompt("", choice("a", "b"), test_with=iter([TIMEOUT]))
+
+def test_invalid_default() -> None:
+    with pytest.raises(PromptTimeoutError):
+        prompt("", text(), validate=bool, test_with=iter([TIMEOUT]))
+
+def test_terminal() -> None:
+    # the keys are read by KeyReader from a pseudo-terminal
+    master, slave = os.openpty()
+
+    def type_key() -> None:
+        try:
+            os.read(master, 4096)  # the first frame
+            os.write(master, b"x")
+            while os.read(master, 4096):
+                pass
+        except OSError:
+            pass
+
+    try:
+        with open(slave, "r", closefd=False) as stdin, open(slave, "w", closefd=False) as file:
+            started = time.monotonic()
+            assert prompt("", confirm(default=False), file=file, stdin=stdin, timeout=0.2) is False
+            assert 0.2 <= time.monotonic() - started < 2
+
+            threading.Thread(target=type_key, daemon=True).start()
+            started = time.monotonic()
+            assert prompt("", text(default="localhost"), file=file, stdin=stdin, idle_timeout=0.3) == "localhost"
+            assert 0.3 <= time.monotonic() - started < 2
+    finally:
+        os.close(master)
+        os.close(slave)
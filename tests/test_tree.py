@@ -0,0 +1,57 @@
+from collections.abc import Callable, Iterator
+import threading
+
+from readchar import key as k
+
+from aprompt import prompt
+from aprompt.prompts import tree
+
+TREE = {
+    "default": ["api", "web"],
+    "api": ["api-0", "api-1"],
+    "web": ["web-0"],
+    "kube-system": ["dns"],
+}
+
+fetched = []
+
+def children(node: str) -> list[str]:
+    fetched.append(node)
+    return TREE.get(node, [])
+
+def test_single(keys: Callable[..., Iterator[str]]) -> None:
+    fetched.clear()
+    assert prompt("", tree("default", "kube-system", children=children), test_with=keys(k.RIGHT, k.RIGHT, k.RIGHT, k.RIGHT, k.DOWN, k.ENTER)) == "api-1"
+    assert fetched == ["default", "api"]
+    assert prompt("", tree("default", "kube-system", children=children), test_with=keys(k.RIGHT, k.DOWN, k.RIGHT, k.LEFT, k.LEFT, k.LEFT, k.DOWN, k.ENTER)) == "kube-system"
+
+def test_multiple(keys: Callable[..., Iterator[str]]) -> None:
+    assert prompt(
+        "",
+        tree("default", "kube-system", children=children, multiple=True),
+        test_with=keys(k.DOWN, k.RIGHT, k.DOWN, k.SPACE, k.UP, k.LEFT, k.UP, k.RIGHT, k.DOWN, k.SPACE, k.ENTER),
+    ) == ["api", "dns"]
+
+def test_concurrent(keys: Callable[..., Iterator[str]]) -> None:
+    barrier = threading.Barrier(2, timeout=1)
+
+    def slow(node: str) -> list[str]:
+        barrier.wait()  # both fetches have to run at the same time
+        return TREE[node]
+
+    assert prompt("", tree("default", "kube-system", children=slow), test_with=keys(k.DOWN, k.RIGHT, k.UP, k.RIGHT, k.DOWN, k.ENTER)) == "api"
+
+def test_expand_while_loading(keys: Callable[..., Iterator[str]]) -> None:
+    release = threading.Event()
+
+    def slow(node: str) -> list[str]:
+        release.wait(1)
+        return TREE.get(node, [])
+
+    def pressed() -> Iterator[str]:
+        yield k.RIGHT
+        yield k.RIGHT  # still loading
+        release.set()
+        yield from keys(k.RIGHT, k.ENTER)
+
+    assert prompt("", tree("default", children=slow), test_with=pressed()) == "api"
@@ -0,0 +1,40 @@
+from readchar import key as k
+
+from aprompt import prompt
+from aprompt.prompts import choice, sort
+from aprompt._utils import TypeAhead
+
+REGIONS = ["us-east", "eu-west", "eu-central", "ap-south", "us-west"]
+
+def test_type_ahead() -> None:
+    type_ahead = TypeAhead(REGIONS)
+    assert type_ahead.search("e") == 1  # the first in display order
+    assert type_ahead.search("eu") == 1
+    assert type_ahead.search("eu-c") == 2
+    assert type_ahead.search("EU-W") == 1
+    assert type_ahead.search("eux") is None
+
+def test_cycle() -> None:
+    type_ahead = TypeAhead(REGIONS)
+    assert [type_ahead.search("u" * n) for n in range(1, 4)] == [0, 4, 0]
+    assert [type_ahead.search("e" * n) for n in range(1, 3)] == [1, 2]
+
+def test_many() -> None:
+    strings = [f"{c}{i}" for i in range(1000) for c in "ba"]
+    type_ahead = TypeAhead(strings)
+    assert type_ahead.search("a") == 1
+    assert type_ahead.search("a99") == 199
+    assert type_ahead.search("b5") == 10
+    assert type_ahead.search("aaa") == 5
+    assert type_ahead.search("c") is None
+
+def test_choice() -> None:
+    assert prompt("", choice(*REGIONS), test_with=iter(["a", k.ENTER])) == "ap-south"
+    assert prompt("", choice(*REGIONS), test_with=iter(["e", k.ENTER])) == "eu-west"
+    assert prompt("", choice(*REGIONS), test_with=iter([*"eu-c", k.ENTER])) == "eu-central"
+    assert prompt("", choice(*REGIONS, multiple=True), test_with=iter(["a", k.SPACE, k.ENTER])) == ["ap-south"]
+
+def test_sort() -> None:
+    assert prompt("", sort(*REGIONS), test_with=iter(["a", k.SPACE, k.UP, k.UP, k.ENTER])) == ["us-east", "ap-south", "eu-west", "eu-central", "us-west"]
+    # searches the options in the order they are displayed in
+    assert prompt("", sort(*REGIONS), test_with=iter([k.SPACE, k.DOWN, k.DOWN, k.DOWN, k.DOWN, k.SPACE, "u", "u", k.SPACE, k.UP, k.ENTER])) == ["eu-west", "eu-central", "ap-south", "us-east", "us-west"]
@@ -0,0 +1,42 @@
+import os
+import textwrap
+
+from aprompt import formatters, widgets as w
+from aprompt._width import rows, truncate, width, wrap
+
+def test_width() -> None:
+    assert width("abc") == 3
+    assert width("日本語") == 6
+    assert width("é") == 1  # combining acute accent
+    assert width("\N{THUMBS UP SIGN}") == 2
+    assert width("\x1b[1mbold\x1b[0m") == 4
+
+def test_wrap_ascii() -> None:
+    text = "the quick brown fox jumps over the lazy dog " * 3
+    assert wrap(text, 17, initial_indent="? ") == textwrap.wrap(
+        text, 17, initial_indent="? ", replace_whitespace=False
+    )
+
+def test_wrap_wide() -> None:
+    lines = wrap("日本語 テキスト を 折り返す", 8, initial_indent="? ")
+    assert lines == ["? 日本語", "テキスト", "を", "折り返す"]
+    assert all(width(line) <= 8 for line in lines)
+    assert wrap("日本語のテキスト", 5) == ["日本", "語の", "テキ", "スト"]
+
+def test_wrap_full_line() -> None:
+    lines = wrap("日本語のテキストです 日本語のテキストです", 10)
+    assert lines == ["日本語のテ", "キストです", "日本語のテ", "キストです"]
+    assert wrap("ab 日本語のテキストです", 10) == ["ab 日本語", "のテキスト", "です"]
+    assert wrap("日本語", 1) == ["日", "本", "語"]
+
+def test_truncate() -> None:
+    assert truncate("日本語のテキスト", 7) == "日本語…"
+    assert truncate("short", 7) == "short"
+
+def test_rows() -> None:
+    assert rows("日本語のテ\nabc\n", 4) == 4
+    assert rows("\n\n", 4) == 2
+
+def test_formatter() -> None:
+    lines = formatters.simple(os.terminal_size((10, 24)), [w.Question("日本語のテキスト")])
+    assert lines == ["? 日本語の\nテキスト", ""]